@@ -0,0 +1,384 @@
+"""
+benchmark.py
+------------
+Conjunto de benchmarks headless (backend Agg, sementes fixas) dos trechos
+críticos de cálculo e desenho de cada visualização:
+- Geração da superfície de erro Binomial vs Poisson para vários tamanhos de grade
+- Avaliação da KDE do kde-simulator para vários n (observações) e m (pontos de x)
+- Custo por quadro (atualização + desenho) de cada animação e do painel da MGF
+- Tempo de inicialização até o primeiro desenho do main.py
+
+Os resultados são gravados em JSON e podem ser comparados com um baseline salvo:
+
+    python benchmarks/benchmark.py --saida resultados.json
+    python benchmarks/benchmark.py --salvar-baseline benchmarks/baseline.json
+    python benchmarks/benchmark.py --baseline benchmarks/baseline.json --limiar 0.2
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import runpy
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime, timezone
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import scipy
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIR_MGF = os.path.join(RAIZ, 'moment-gerenating-function')
+DIR_KDE = os.path.join(RAIZ, 'gaussian-kde')
+DIR_PIT = os.path.join(RAIZ, 'probability-integral-transformation')
+
+sys.path.append(RAIZ)  # Pacote comum do repositório
+from comum.estilo import VARIAVEL_LATEX
+
+SEMENTE = 0
+REPETICOES = 7           # Repetições de cada medida (a mediana é a estatística comparada)
+REPETICOES_RAPIDO = 3
+LIMIAR_REGRESSAO = 0.20  # Fração de aumento da mediana considerada regressão
+
+TAMANHOS_GRADE = [(25, 25), (50, 50), (100, 50), (100, 100)]  # (n_max, número de valores de p)
+TAMANHOS_KDE = [(5, 10), (50, 10), (50, 200), (200, 200)]     # (n observações, m pontos de x)
+TAMANHOS_KDE_TRUNCADA = [(100_000, 0.02), (100_000, 0.3)]     # (n observações, largura de banda), com 500 pontos de x
+QUADROS_KDE_ANIMACAO = [9, 49, 99]
+QUADROS_PIT = 50
+ESTADOS_SLIDERS_MGF = [(10, 0.5), (30, 0.1), (49, 0.99)]
+
+
+# ==============================
+# INFRAESTRUTURA
+# ==============================
+
+def medir(funcao, repeticoes: int, preparar=None) -> dict:
+    """
+    Mede o tempo de execução de uma função várias vezes.
+
+    Parâmetros:
+    - funcao (callable): Função sem argumentos a ser medida
+    - repeticoes (int): Número de medidas
+    - preparar (callable): Função executada antes de cada medida, fora do tempo medido
+
+    Retorna:
+    - dict: Mediana, mínimo, média e desvio dos tempos, em milissegundos
+    """
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar is not None:
+            preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return {
+        'mediana_ms': statistics.median(tempos),
+        'min_ms': min(tempos),
+        'media_ms': statistics.fmean(tempos),
+        'desvio_ms': statistics.stdev(tempos) if len(tempos) > 1 else 0.0,
+        'repeticoes': repeticoes,
+    }
+
+
+def latex_disponivel() -> bool:
+    """Indica se há uma instalação de LaTeX para os scripts que usam text.usetex."""
+    return shutil.which('latex') is not None
+
+
+def desativar_latex_ausente():
+    """
+    Sem LaTeX instalado, pede aos scripts do PIT e da MGF que não ativem o
+    `text.usetex` (VIZ_LATEX=0, ver comum/estilo.py), a menos que VIZ_LATEX já
+    esteja definida.
+    """
+    if not latex_disponivel():
+        os.environ.setdefault(VARIAVEL_LATEX, '0')
+
+
+def preparar_ambiente():
+    """Silencia avisos de fontes ausentes e de backend não interativo."""
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+    warnings.filterwarnings('ignore', category=UserWarning, module='matplotlib')
+
+
+def carregar_script(caminho: str) -> dict:
+    """
+    Executa um script de visualização no backend Agg e retorna suas variáveis globais.
+
+    O diretório do script é usado como diretório atual e entra no sys.path,
+    como quando ele é executado diretamente. O bloco `if __name__ == "__main__"`
+    não é executado.
+
+    Parâmetros:
+    - caminho (str): Caminho do script
+
+    Retorna:
+    - dict: Variáveis globais do script
+    """
+    diretorio = os.path.dirname(caminho)
+    diretorio_atual = os.getcwd()
+    sys.path.insert(0, diretorio)
+    os.chdir(diretorio)
+    try:
+        desativar_latex_ausente()
+        np.random.seed(SEMENTE)
+        return runpy.run_path(caminho, run_name='benchmark')
+    finally:
+        os.chdir(diretorio_atual)
+        sys.path.remove(diretorio)
+
+
+# ==============================
+# BENCHMARKS
+# ==============================
+
+def benchmark_superficie(repeticoes: int) -> dict:
+    """Geração da superfície de erro (calcular_diferenca_pmfs_matriz) para vários tamanhos de grade."""
+    sys.path.insert(0, DIR_MGF)
+    try:
+        from funcoes import calcular_diferenca_pmfs_matriz
+        from config import PROBABILIDADE_MIN, PROBABILIDADE_MAX
+    finally:
+        sys.path.remove(DIR_MGF)
+
+    resultados = {}
+    for n_max, num_p in TAMANHOS_GRADE:
+        N, P = np.meshgrid(np.arange(1, n_max), np.linspace(PROBABILIDADE_MIN, PROBABILIDADE_MAX, num_p))
+        resultados[f'superficie/n{n_max}_p{num_p}'] = medir(lambda: calcular_diferenca_pmfs_matriz(N, P), repeticoes)
+    return resultados
+
+
+def benchmark_kde_simulador(repeticoes: int) -> dict:
+    """Atualização da KDE do kde-simulator (cálculo e artistas) e desenho, para vários n e m."""
+    g = carregar_script(os.path.join(DIR_KDE, 'kde-simulator.py'))
+    fig, update = g['fig'], g['update']
+    sliders = (g['slider_n'], g['slider_x_range'])
+
+    resultados = {}
+    for n, m in TAMANHOS_KDE:
+        for slider in sliders:
+            slider.eventson = False
+        # Os sliders limitam n a 50: o valor é atribuído diretamente para cobrir grades maiores
+        g['slider_n'].val = n
+        g['slider_x_range'].val = m
+        for slider in sliders:
+            slider.eventson = True
+        resultados[f'kde_simulador/update_n{n}_m{m}'] = medir(lambda: update(None), repeticoes)
+        resultados[f'kde_simulador/quadro_n{n}_m{m}'] = medir(lambda: (update(None), fig.canvas.draw()), repeticoes)
+    plt.close(fig)
+    return resultados
+
+
+def benchmark_kde_truncada(repeticoes: int) -> dict:
+    """KDE direta vs. truncada em k larguras de banda (truncated_kde.py), para n grande."""
+    sys.path.insert(0, DIR_KDE)
+    try:
+        from truncated_kde import kde_direct, kde_truncated
+    finally:
+        sys.path.remove(DIR_KDE)
+
+    rng = np.random.default_rng(SEMENTE)
+    resultados = {}
+    for n, largura in TAMANHOS_KDE_TRUNCADA:
+        x = rng.normal(3, 1, n)
+        grade = np.linspace(x.min() - 1, x.max() + 1, 500)
+        resultados[f'kde_truncada/direta_n{n}_h{largura}'] = medir(lambda: kde_direct(x, grade, largura), repeticoes)
+        # A ordenação é feita uma vez e reaproveitada entre avaliações, por isso fica fora do tempo medido
+        x_ordenado = np.sort(x)
+        resultados[f'kde_truncada/truncada_n{n}_h{largura}'] = medir(
+            lambda: kde_truncated(x_ordenado, grade, largura), repeticoes)
+    return resultados
+
+
+def benchmark_kde_animacao(repeticoes: int) -> dict:
+    """Custo por quadro (update + desenho) do kde-animation."""
+    g = carregar_script(os.path.join(DIR_KDE, 'kde-animation.py'))
+    fig, update = g['fig'], g['update']
+    fig.canvas.draw()  # O primeiro desenho inicia a animação e chama update(0)
+
+    resultados = {}
+    for quadro in QUADROS_KDE_ANIMACAO:
+        resultados[f'kde_animacao/quadro_{quadro + 1}'] = medir(
+            lambda: (update(quadro), fig.canvas.draw()), repeticoes)
+    plt.close(fig)
+    return resultados
+
+
+def benchmark_pit(repeticoes: int) -> dict:
+    """Custo por quadro (update + desenho) da animação da transformação integral de probabilidade."""
+    resultados_quadro = []
+    for _ in range(repeticoes):
+        g = carregar_script(os.path.join(DIR_PIT, 'probability_integral_transformation.py'))
+        fig, init, update = g['fig'], g['init'], g['update']
+        fig.canvas.draw()
+        init()
+        # Os pontos se acumulam a cada quadro: mede-se a média de uma sequência de quadros
+        medida = medir(lambda: [(update(q), fig.canvas.draw()) for q in range(QUADROS_PIT)], 1)
+        resultados_quadro.append(medida['mediana_ms'] / QUADROS_PIT)
+        plt.close(fig)
+    return {'pit/quadro_medio': {
+        'mediana_ms': statistics.median(resultados_quadro),
+        'min_ms': min(resultados_quadro),
+        'media_ms': statistics.fmean(resultados_quadro),
+        'desvio_ms': statistics.stdev(resultados_quadro) if repeticoes > 1 else 0.0,
+        'repeticoes': repeticoes,
+    }}
+
+
+def benchmark_sliders_mgf(repeticoes: int) -> dict:
+    """Custo de uma mudança de slider (atualizar_graficos + desenho) no painel da MGF."""
+    g = carregar_script(os.path.join(DIR_MGF, 'main.py'))
+    fig, slider_n, slider_p = g['criar_interface']()
+
+    resultados = {}
+    for n, p in ESTADOS_SLIDERS_MGF:
+        slider_n.eventson = False
+        slider_n.set_val(n)
+        slider_n.eventson = True
+        # set_val dispara atualizar_graficos, que recria os painéis 2D e move o ponto 3D
+        resultados[f'mgf/slider_n{n}_p{p}'] = medir(
+            lambda: (slider_p.set_val(p), fig.canvas.draw()), repeticoes,
+            preparar=lambda: slider_p.set_val(p / 2))
+    plt.close(fig)
+    return resultados
+
+
+def primeiro_desenho(caminho: str):
+    """Executado no processo filho: carrega o main.py, cria e desenha a figura e imprime o tempo decorrido."""
+    inicio = time.perf_counter()
+    preparar_ambiente()
+    g = carregar_script(caminho)
+    fig, _, _ = g['criar_interface']()
+    fig.canvas.draw()
+    print(json.dumps({'interno_ms': (time.perf_counter() - inicio) * 1000}))
+
+
+def benchmark_inicializacao(repeticoes: int) -> dict:
+    """Tempo do lançamento do processo até o primeiro desenho do main.py."""
+    ambiente = dict(os.environ, MPLBACKEND='Agg')
+    totais, internos = [], []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        saida = subprocess.run([sys.executable, os.path.abspath(__file__), '--primeiro-desenho',
+                                os.path.join(DIR_MGF, 'main.py')],
+                               env=ambiente, capture_output=True, text=True, check=True)
+        totais.append((time.perf_counter() - inicio) * 1000)
+        internos.append(json.loads(saida.stdout.strip().splitlines()[-1])['interno_ms'])
+    return {
+        'inicializacao/main_total': {'mediana_ms': statistics.median(totais), 'min_ms': min(totais),
+                                     'media_ms': statistics.fmean(totais), 'repeticoes': repeticoes},
+        'inicializacao/main_sem_interpretador': {'mediana_ms': statistics.median(internos),
+                                                 'min_ms': min(internos),
+                                                 'media_ms': statistics.fmean(internos),
+                                                 'repeticoes': repeticoes},
+    }
+
+
+BENCHMARKS = {
+    'superficie': benchmark_superficie,
+    'kde_simulador': benchmark_kde_simulador,
+    'kde_truncada': benchmark_kde_truncada,
+    'kde_animacao': benchmark_kde_animacao,
+    'pit': benchmark_pit,
+    'mgf': benchmark_sliders_mgf,
+    'inicializacao': benchmark_inicializacao,
+}
+
+
+# ==============================
+# RESULTADOS E COMPARAÇÃO
+# ==============================
+
+def metadados() -> dict:
+    """Versões e máquina em que os benchmarks foram executados."""
+    return {
+        'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'matplotlib': matplotlib.__version__,
+        'plataforma': platform.platform(),
+        'processador': platform.processor() or platform.machine(),
+        'latex': latex_disponivel(),
+        'semente': SEMENTE,
+    }
+
+
+def comparar(resultados: dict, baseline: dict, limiar: float) -> list:
+    """
+    Compara as medianas com as de um baseline.
+
+    Parâmetros:
+    - resultados (dict): Resultados da execução atual
+    - baseline (dict): Resultados salvos anteriormente
+    - limiar (float): Aumento relativo da mediana considerado regressão (ex.: 0.2 = 20%)
+
+    Retorna:
+    - list: Tuplas (nome, mediana do baseline, mediana atual, variação) das regressões
+    """
+    regressoes = []
+    for nome, medida in resultados.items():
+        referencia = baseline.get(nome)
+        if referencia is None:
+            continue
+        variacao = medida['mediana_ms'] / referencia['mediana_ms'] - 1
+        marcador = 'REGRESSÃO' if variacao > limiar else ''
+        print(f"{nome:<45} {referencia['mediana_ms']:>10.2f} -> {medida['mediana_ms']:>10.2f} ms "
+              f"({variacao:+.1%}) {marcador}")
+        if variacao > limiar:
+            regressoes.append((nome, referencia['mediana_ms'], medida['mediana_ms'], variacao))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--saida', help='Arquivo JSON onde os resultados são gravados')
+    parser.add_argument('--baseline', help='Arquivo JSON de baseline para comparação')
+    parser.add_argument('--salvar-baseline', metavar='ARQUIVO', help='Grava os resultados como novo baseline')
+    parser.add_argument('--limiar', type=float, default=LIMIAR_REGRESSAO,
+                        help='Aumento relativo da mediana considerado regressão (padrão: %(default)s)')
+    parser.add_argument('--apenas', nargs='+', choices=sorted(BENCHMARKS), help='Executa apenas estes grupos')
+    parser.add_argument('--rapido', action='store_true', help=f'Usa {REPETICOES_RAPIDO} repetições por medida')
+    parser.add_argument('--primeiro-desenho', metavar='SCRIPT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.primeiro_desenho:
+        primeiro_desenho(os.path.abspath(args.primeiro_desenho))
+        return
+
+    preparar_ambiente()
+    repeticoes = REPETICOES_RAPIDO if args.rapido else REPETICOES
+    resultados = {}
+    for grupo in args.apenas or BENCHMARKS:
+        inicio = time.perf_counter()
+        resultados.update(BENCHMARKS[grupo](repeticoes))
+        print(f"[{grupo}] {time.perf_counter() - inicio:.1f} s", file=sys.stderr)
+
+    for nome, medida in resultados.items():
+        print(f"{nome:<45} {medida['mediana_ms']:>10.2f} ms (mín. {medida['min_ms']:.2f})")
+
+    documento = {'metadados': metadados(), 'resultados': resultados}
+    for arquivo in filter(None, (args.saida, args.salvar_baseline)):
+        with open(arquivo, 'w', encoding='utf-8') as f:
+            json.dump(documento, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['resultados']
+        print(f"\nComparação com {args.baseline} (limiar {args.limiar:.0%}):")
+        regressoes = comparar(resultados, baseline, args.limiar)
+        if regressoes:
+            print(f"\n{len(regressoes)} regressão(ões) acima do limiar.", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+precisao.py
+-----------
+Relatório de exatidão do modo float32 (VIZ_PRECISAO=float32) em relação ao float64.
+
+Cada pipeline afetado pela configuração de precisão é executado nas duas
+precisões, com as mesmas sementes, e o maior erro absoluto é comparado com a
+resolução da tela: a faixa dos dados dividida por PIXELS_REFERENCIA. Um erro
+abaixo dessa resolução não muda nenhum pixel do gráfico.
+
+    python benchmarks/precisao.py
+    python benchmarks/precisao.py --saida precisao.json
+
+Termina com código de saída 1 se algum erro ficar acima da resolução.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from benchmark import RAIZ, DIR_MGF, DIR_KDE, DIR_PIT, SEMENTE, carregar_script, preparar_ambiente
+
+sys.path.append(RAIZ)
+from comum.precisao import definir_precisao, tipo_float
+
+PIXELS_REFERENCIA = 4000  # Maior que qualquer eixo das figuras, mesmo numa tela 4K
+QUADROS_PIT = 200
+ESTADO_KDE = (50, 200, 0.5)  # (observações, pontos de x, largura de banda) do kde-simulator
+
+
+def _nas_duas_precisoes(executar) -> dict:
+    """Executa a função em float64 e em float32 e retorna os dois resultados."""
+    resultados = {}
+    try:
+        for precisao in ('float64', 'float32'):
+            definir_precisao(precisao)
+            resultados[precisao] = executar()
+    finally:
+        definir_precisao(None)
+    return resultados
+
+
+def comparar_arrays(nome: str, referencia: np.ndarray, reduzido: np.ndarray) -> dict:
+    """
+    Compara o resultado em float32 com o de float64.
+
+    Parâmetros:
+    - nome (str): Nome do array no relatório
+    - referencia (np.ndarray): Resultado em float64
+    - reduzido (np.ndarray): Resultado em float32
+
+    Retorna:
+    - dict: Erro máximo, resolução da tela, razão entre os dois e tipos dos arrays
+    """
+    referencia = np.asarray(referencia)
+    faixa = float(np.ptp(referencia)) or float(np.max(np.abs(referencia))) or 1.0
+    erro = float(np.max(np.abs(np.asarray(reduzido, dtype=np.float64) - referencia)))
+    resolucao = faixa / PIXELS_REFERENCIA
+    return {'nome': nome, 'erro_max': erro, 'resolucao': resolucao, 'pixels': erro / resolucao,
+            'tipos': f"{referencia.dtype}/{np.asarray(reduzido).dtype}"}
+
+
+def relatorio_superficie() -> list:
+    """Malhas P/Z da superfície de erro (gerar_matriz_parametros; N continua inteira)."""
+    sys.path.insert(0, DIR_MGF)
+    try:
+        from funcoes import gerar_matriz_parametros
+        from config import NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX
+    finally:
+        sys.path.remove(DIR_MGF)
+    malhas = _nas_duas_precisoes(lambda: gerar_matriz_parametros(NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX))
+    return [comparar_arrays(f'superficie/{nome}', a, b)
+            for nome, a, b in zip('PZ', malhas['float64'][1:], malhas['float32'][1:])]
+
+
+def relatorio_kde() -> list:
+    """Valores dos kernels e estimativa do kde-simulator e KDE truncada com n grande."""
+    caminho = os.path.join(DIR_KDE, 'kde-simulator.py')
+    estados = _nas_duas_precisoes(lambda: carregar_script(caminho)['compute_kde'](*ESTADO_KDE))
+    linhas = [comparar_arrays(f'kde_simulador/{chave}', estados['float64'][chave], estados['float32'][chave])
+              for chave in ('kernel_values', 'pdf_estimate')]
+
+    sys.path.insert(0, DIR_KDE)
+    try:
+        from truncated_kde import kde_truncated
+    finally:
+        sys.path.remove(DIR_KDE)
+    x = np.sort(np.random.default_rng(SEMENTE).normal(3, 1, 1_000_000))
+    grade = np.linspace(x.min() - 1, x.max() + 1, 1000)
+    estimativas = _nas_duas_precisoes(lambda: kde_truncated(x, grade, 0.05, dtype=tipo_float()))
+    linhas.append(comparar_arrays('kde_truncada/n1000000_h0.05', estimativas['float64'], estimativas['float32']))
+    return linhas
+
+
+def relatorio_pit() -> list:
+    """Pontos acumulados pela animação da transformação integral de probabilidade."""
+    caminho = os.path.join(DIR_PIT, 'probability_integral_transformation.py')
+
+    def executar():
+        g = carregar_script(caminho)
+        g['init']()
+        for quadro in range(QUADROS_PIT):
+            g['update'](quadro)
+        # run_path retorna uma cópia das variáveis globais; o estado atual está em update.__globals__
+        estado = g['update'].__globals__
+        return estado['pontos'][:estado['num_pontos']]
+
+    pontos = _nas_duas_precisoes(executar)
+    return [comparar_arrays(f'pit/{nome}', pontos['float64'][:, coluna], pontos['float32'][:, coluna])
+            for coluna, nome in enumerate(('X', 'F(X)', 'f(X)'))]
+
+
+RELATORIOS = {'superficie': relatorio_superficie, 'kde': relatorio_kde, 'pit': relatorio_pit}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--saida', help='Arquivo JSON onde o relatório é gravado')
+    parser.add_argument('--apenas', nargs='+', choices=sorted(RELATORIOS), help='Executa apenas estes grupos')
+    args = parser.parse_args()
+
+    preparar_ambiente()
+    linhas = []
+    for grupo in args.apenas or RELATORIOS:
+        linhas.extend(RELATORIOS[grupo]())
+
+    print(f"{'array':<32} {'tipos':<16} {'erro máx.':>10} {'resolução':>10} {'pixels':>8}")
+    for linha in linhas:
+        marcador = '' if linha['pixels'] < 1 else 'ACIMA DA RESOLUÇÃO'
+        print(f"{linha['nome']:<32} {linha['tipos']:<16} {linha['erro_max']:>10.2e} {linha['resolucao']:>10.2e} "
+              f"{linha['pixels']:>8.4f} {marcador}")
+
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            json.dump({'pixels_referencia': PIXELS_REFERENCIA, 'arrays': linhas}, f, indent=2, ensure_ascii=False)
+
+    acima = [linha['nome'] for linha in linhas if linha['pixels'] >= 1]
+    if acima:
+        print(f"\n{len(acima)} array(s) com erro acima da resolução da tela.", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+"""
+comum
+-----
+Pacote com a infraestrutura compartilhada pelas visualizações do repositório.
+"""
@@ -0,0 +1,25 @@
+"""
+estilo.py
+---------
+Opções de estilo compartilhadas pelas visualizações.
+
+Os painéis da MGF e a animação do PIT desenham os textos com LaTeX
+(text.usetex). Com a variável de ambiente VIZ_LATEX=0, os scripts deixam de
+ativá-lo e os textos são desenhados pelo mathtext do matplotlib, o que permite
+executá-los onde não há LaTeX instalado (ex.: benchmarks/benchmark.py).
+"""
+
+import os
+
+VARIAVEL_LATEX = 'VIZ_LATEX'
+VALORES_DESATIVADO = ('0', 'false', 'nao', 'não')
+
+
+def usar_latex() -> bool:
+    """
+    Indica se os textos devem ser desenhados com LaTeX (text.usetex).
+
+    Retorna:
+    - bool: False se VIZ_LATEX for '0', 'false' ou 'nao'; True caso contrário (padrão)
+    """
+    return os.environ.get(VARIAVEL_LATEX, '1').strip().lower() not in VALORES_DESATIVADO
@@ -0,0 +1,218 @@
+"""
+perfil.py
+---------
+Instrumentação opcional das figuras interativas, para descobrir se a lentidão
+de um slider ou de uma animação vem dos cálculos, da recriação dos artistas
+ou do desenho do canvas. Inclui:
+- Medida do tempo de cada callback de atualização (cálculo + recriação dos artistas)
+- Com comum.trabalhador, medida separada do cálculo em segundo plano (na thread ou
+  no processo do trabalhador) e da aplicação do resultado aos artistas
+- Medida do tempo de desenho da figura e do número de artistas, via draw_event
+- HUD na própria figura com p50/p95 das últimas medidas
+- Gravação da sessão no formato Trace Event, legível pelo chrome://tracing (ou Perfetto)
+
+A instrumentação é ativada pela variável de ambiente VIZ_PERFIL=1. O arquivo do
+trace pode ser escolhido com VIZ_PERFIL_TRACE (padrão: perfil-<pid>.json) e é
+gravado quando a janela é fechada.
+
+Observação: em animações com blit, os quadros que só redesenham os artistas
+animados não passam por Figure.draw e, portanto, não entram na medida de desenho.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+VARIAVEL_ATIVACAO = 'VIZ_PERFIL'
+VARIAVEL_TRACE = 'VIZ_PERFIL_TRACE'
+JANELA_ESTATISTICAS = 100  # Número de eventos recentes usados no p50/p95 do HUD
+
+
+def perfil_ativo() -> bool:
+    """Indica se a instrumentação foi ativada pela variável de ambiente VIZ_PERFIL."""
+    return os.environ.get(VARIAVEL_ATIVACAO, '').lower() not in ('', '0', 'false', 'nao', 'não')
+
+
+class Perfilador:
+    """
+    Registra os tempos de cálculo e de desenho de uma figura e os exibe num HUD.
+
+    Parâmetros:
+    - fig (Figure): Figura instrumentada
+    - hud (bool): Se True, exibe p50/p95 no canto superior direito da figura
+    - arquivo_trace (str): Arquivo onde o trace é gravado ao fechar a figura (None não grava)
+    - janela (int): Número de eventos recentes usados nas estatísticas do HUD
+    """
+
+    def __init__(self, fig, hud: bool = True, arquivo_trace: str = None, janela: int = JANELA_ESTATISTICAS):
+        self.fig = fig
+        self.arquivo_trace = arquivo_trace
+        self.tempos_calculo = deque(maxlen=janela)
+        self.tempos_aplicacao = deque(maxlen=janela)
+        self.tempos_desenho = deque(maxlen=janela)
+        self.num_artistas = 0
+        self.eventos_trace = []
+        self._origem = time.perf_counter()
+        self._inicio_desenho = None
+        self._trace_salvo = False
+
+        self.hud = fig.text(0.995, 0.995, '', ha='right', va='top', fontsize=8, family='monospace',
+                            usetex=False, bbox=dict(facecolor='white', alpha=0.7, edgecolor='none'),
+                            zorder=1000) if hud else None
+
+        # Figure.draw é envolvido para marcar o início do desenho; o draw_event marca o fim
+        self._desenhar_original = fig.draw
+        fig.draw = self._desenhar
+        fig.canvas.mpl_connect('draw_event', self._ao_desenhar)
+        if arquivo_trace is not None:
+            fig.canvas.mpl_connect('close_event', lambda evento: self.salvar_trace())
+            atexit.register(self.salvar_trace)
+
+    def _agora_us(self) -> float:
+        """Tempo desde a criação do perfilador, em microssegundos."""
+        return (time.perf_counter() - self._origem) * 1e6
+
+    def _registrar(self, nome: str, categoria: str, inicio_us: float, duracao_us: float,
+                   pid: int = None, tid: int = None, **args):
+        """Adiciona um evento completo ('X') ao trace e a sua duração às estatísticas do HUD."""
+        tempos = {'calculo': self.tempos_calculo, 'aplicacao': self.tempos_aplicacao}.get(categoria)
+        if tempos is not None:
+            tempos.append(duracao_us / 1000)
+        self.eventos_trace.append({
+            'name': nome, 'cat': categoria, 'ph': 'X',
+            'ts': inicio_us, 'dur': duracao_us,
+            'pid': pid or os.getpid(), 'tid': tid or threading.get_ident(), 'args': args,
+        })
+
+    def registrar_evento(self, nome: str, categoria: str, inicio: float, duracao: float,
+                         pid: int = None, tid: int = None, **args):
+        """
+        Registra uma medida feita fora do perfilador (ex.: o cálculo numa thread ou
+        num processo do trabalhador).
+
+        Parâmetros:
+        - nome (str): Nome do evento no trace
+        - categoria (str): 'calculo' e 'aplicacao' entram no HUD; as demais só no trace
+        - inicio (float): Instante de início, em time.perf_counter()
+        - duracao (float): Duração, em segundos
+        - pid, tid (int): Processo e thread onde a medida foi feita (padrão: os atuais)
+        - **args: Informações extras do evento no trace
+        """
+        self._registrar(nome, categoria, (inicio - self._origem) * 1e6, duracao * 1e6, pid, tid, **args)
+
+    def envolver(self, funcao, nome: str = None, categoria: str = 'calculo'):
+        """
+        Envolve um callback de atualização para medir o tempo de cada chamada.
+
+        Parâmetros:
+        - funcao (callable): Callback (ex.: atualizar_graficos, update)
+        - nome (str): Nome do evento no trace. Se None, usa o nome da função
+        - categoria (str): 'calculo' (padrão) ou 'aplicacao' entram no HUD; outras
+          (ex.: 'callback', quando o cálculo é feito por um trabalhador) só no trace
+
+        Retorna:
+        - callable: Callback instrumentado, com a mesma assinatura
+        """
+        nome = nome or getattr(funcao, '__name__', 'callback')
+
+        @functools.wraps(funcao)
+        def funcao_instrumentada(*args, **kwargs):
+            inicio = self._agora_us()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                self._registrar(nome, categoria, inicio, self._agora_us() - inicio)
+
+        return funcao_instrumentada
+
+    def _desenhar(self, renderer):
+        """Substitui Figure.draw: atualiza o HUD e marca o início do desenho."""
+        if self.hud is not None:
+            self.hud.set_text(self.resumo())
+        self._inicio_desenho = self._agora_us()
+        return self._desenhar_original(renderer)
+
+    def _ao_desenhar(self, evento):
+        """Callback do draw_event: registra a duração do desenho e conta os artistas."""
+        if self._inicio_desenho is None:
+            return
+        duracao = self._agora_us() - self._inicio_desenho
+        self.tempos_desenho.append(duracao / 1000)
+        # A contagem fica fora do tempo medido: percorrer a árvore de artistas também custa
+        self.num_artistas = sum(1 for _ in self.fig.findobj())
+        self._registrar('draw', 'desenho', self._inicio_desenho, duracao, artistas=self.num_artistas)
+        self._inicio_desenho = None
+
+    @staticmethod
+    def _percentis(tempos) -> str:
+        """Formata p50/p95 de uma sequência de tempos em milissegundos."""
+        if not tempos:
+            return '    -/    - ms'
+        p50, p95 = np.percentile(tempos, [50, 95])
+        return f'{p50:5.1f}/{p95:5.1f} ms'
+
+    def resumo(self) -> str:
+        """Texto do HUD com p50/p95 de cálculo, aplicação e desenho e o número de artistas."""
+        aplicacao = f'aplicar  p50/p95 {self._percentis(self.tempos_aplicacao)}\n' if self.tempos_aplicacao else ''
+        return (f'cálculo  p50/p95 {self._percentis(self.tempos_calculo)}\n'
+                f'{aplicacao}'
+                f'desenho  p50/p95 {self._percentis(self.tempos_desenho)}\n'
+                f'artistas {self.num_artistas:>6d}')
+
+    def salvar_trace(self, caminho: str = None):
+        """
+        Grava os eventos da sessão no formato Trace Event (JSON).
+
+        Parâmetros:
+        - caminho (str): Arquivo de destino. Se None, usa o arquivo definido na criação
+        """
+        caminho = caminho or self.arquivo_trace
+        if caminho is None or (self._trace_salvo and caminho == self.arquivo_trace):
+            return
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': self.eventos_trace, 'displayTimeUnit': 'ms'}, f)
+        self._trace_salvo = caminho == self.arquivo_trace
+        print(f'Trace de perfil gravado em {os.path.abspath(caminho)}')
+
+
+def obter_perfilador(fig):
+    """
+    Retorna o perfilador da figura, criando-o na primeira chamada, ou None se a
+    instrumentação não estiver ativa.
+
+    Parâmetros:
+    - fig (Figure): Figura instrumentada
+
+    Retorna:
+    - Perfilador ou None
+    """
+    if not perfil_ativo():
+        return None
+    if not hasattr(fig, '_perfilador'):
+        arquivo = os.environ.get(VARIAVEL_TRACE, f'perfil-{os.getpid()}.json')
+        fig._perfilador = Perfilador(fig, arquivo_trace=arquivo)
+    return fig._perfilador
+
+
+def instrumentar(fig, funcao, nome: str = None, categoria: str = 'calculo'):
+    """
+    Envolve um callback de atualização com o perfilador da figura, se VIZ_PERFIL
+    estiver ativo; caso contrário, retorna o próprio callback.
+
+    Parâmetros:
+    - fig (Figure): Figura atualizada pelo callback
+    - funcao (callable): Callback de atualização
+    - nome (str): Nome do evento no trace
+    - categoria (str): Categoria da medida (ver `Perfilador.envolver`)
+
+    Retorna:
+    - callable: Callback (instrumentado ou não)
+    """
+    perfilador = obter_perfilador(fig)
+    return funcao if perfilador is None else perfilador.envolver(funcao, nome, categoria)
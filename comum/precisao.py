@@ -0,0 +1,66 @@
+"""
+precisao.py
+-----------
+Precisão de ponto flutuante compartilhada pelas visualizações.
+
+As malhas P/Z da superfície de erro, os buffers das KDEs (amostra, grade,
+matrizes de kernels) e o estado das animações podem ser guardados em float32,
+o que reduz pela metade a memória e o tráfego desses arrays em grades e amostras
+grandes. Somas e funções especiais sensíveis continuam sendo calculadas em
+float64 pelos módulos que usam esta configuração; apenas o armazenamento (e os
+kernels elementares) passam a usar a precisão escolhida.
+
+A precisão é escolhida pela variável de ambiente VIZ_PRECISAO ('float32' ou
+'float64', padrão) ou, no código, por `definir_precisao`. O relatório
+benchmarks/precisao.py compara as duas precisões com a resolução da tela.
+"""
+
+import os
+
+import numpy as np
+
+VARIAVEL_PRECISAO = 'VIZ_PRECISAO'
+PRECISOES = {'float32': np.float32, '32': np.float32, 'float64': np.float64, '64': np.float64}
+
+_precisao_definida = None
+
+
+def definir_precisao(precisao: str = None):
+    """
+    Define a precisão no código, com prioridade sobre VIZ_PRECISAO.
+
+    Parâmetros:
+    - precisao (str): 'float32' ou 'float64' (None volta a usar a variável de ambiente)
+    """
+    global _precisao_definida
+    if precisao is not None and precisao not in PRECISOES:
+        raise ValueError(f"Precisão desconhecida: {precisao!r} (use 'float32' ou 'float64')")
+    _precisao_definida = precisao
+
+
+def tipo_float() -> np.dtype:
+    """
+    Tipo de ponto flutuante configurado.
+
+    Retorna:
+    - np.dtype: float32 ou float64
+    """
+    precisao = _precisao_definida or os.environ.get(VARIAVEL_PRECISAO, '').strip().lower() or 'float64'
+    if precisao not in PRECISOES:
+        raise ValueError(f"{VARIAVEL_PRECISAO}={precisao!r} inválida (use 'float32' ou 'float64')")
+    return np.dtype(PRECISOES[precisao])
+
+
+def na_precisao(*arrays):
+    """
+    Converte arrays para a precisão configurada (sem cópia se já estiverem nela).
+
+    Parâmetros:
+    - *arrays (np.ndarray): Arrays a converter
+
+    Retorna:
+    - np.ndarray ou tuple: O array convertido, ou uma tupla se houver mais de um
+    """
+    tipo = tipo_float()
+    convertidos = tuple(np.asarray(array, dtype=tipo) for array in arrays)
+    return convertidos[0] if len(convertidos) == 1 else convertidos
@@ -0,0 +1,229 @@
+"""
+quase_aleatorio.py
+------------------
+Fontes de números uniformes para as transformações pela inversa da CDF.
+
+Com sorteios pseudoaleatórios, os histogramas empíricos levam muitos quadros
+para se parecer com a distribuição alvo: a distância KS cai como 1/sqrt(N).
+Sequências de baixa discrepância (Sobol e Halton embaralhados, de
+`scipy.stats.qmc`) cobrem (0, 1)^d de forma muito mais uniforme, e a distância
+cai quase como 1/N. O módulo inclui:
+- `FonteUniforme`: fonte selecionável ('pseudo', 'sobol' ou 'halton'), gerada em lotes
+- `distancia_ks` e `curva_ks`: distância de Kolmogorov-Smirnov em função de N
+- `comparar_convergencia` e `amostras_necessarias`: N necessário em cada método
+- `plot_convergencia_ks`: curvas de convergência lado a lado
+"""
+
+import warnings
+
+import numpy as np
+from scipy.stats import qmc
+
+METODOS = ('pseudo', 'sobol', 'halton')
+TAMANHO_LOTE = 1024  # Pontos gerados por vez (potência de 2, que preserva o equilíbrio do Sobol)
+
+# Os pontos são mantidos no intervalo aberto (0, 1), onde a inversa da CDF é finita
+_U_MIN = np.nextafter(0.0, 1.0)
+_U_MAX = np.nextafter(1.0, 0.0)
+
+
+def criar_amostrador_qmc(metodo: str, dimensao: int, semente=None, embaralhar: bool = True):
+    """
+    Cria o amostrador de baixa discrepância de `scipy.stats.qmc`.
+
+    Parâmetros:
+    - metodo (str): 'sobol' ou 'halton'
+    - dimensao (int): Dimensão de cada ponto
+    - semente: Semente (ou SeedSequence) do embaralhamento
+    - embaralhar (bool): Usa o embaralhamento aleatório (Owen para Sobol, permutações para Halton)
+
+    Retorna:
+    - qmc.QMCEngine: Amostrador pronto para gerar pontos
+    """
+    classes = {'sobol': qmc.Sobol, 'halton': qmc.Halton}
+    if metodo not in classes:
+        raise ValueError(f"Método de baixa discrepância desconhecido: {metodo!r} (use {sorted(classes)})")
+    gerador = np.random.default_rng(semente)
+    try:
+        return classes[metodo](d=dimensao, scramble=embaralhar, rng=gerador)
+    except TypeError:  # SciPy < 1.15 chama o argumento de `seed`
+        return classes[metodo](d=dimensao, scramble=embaralhar, seed=gerador)
+
+
+class FonteUniforme:
+    """
+    Fonte de pontos uniformes em (0, 1)^d, pseudoaleatória ou de baixa discrepância.
+
+    Os pontos são gerados em lotes de `tamanho_lote` e entregues um a um por
+    `proximo` (animações) ou em blocos por `amostrar` (cálculos vetorizados).
+    No método 'pseudo' sem semente, os números vêm de `np.random`, de modo que
+    `np.random.seed` continua reproduzindo as animações como antes.
+
+    Parâmetros:
+    - metodo (str): 'pseudo', 'sobol' ou 'halton'
+    - dimensao (int): Dimensão de cada ponto
+    - semente: Semente (ou SeedSequence) do gerador ou do embaralhamento
+    - embaralhar (bool): Embaralha as sequências de baixa discrepância
+    - tamanho_lote (int): Pontos gerados por vez
+    - deslocamento (int): Pontos iniciais da sequência a pular (para dividir uma
+      mesma sequência entre processos)
+    """
+
+    def __init__(self, metodo: str = 'pseudo', dimensao: int = 1, semente=None, embaralhar: bool = True,
+                 tamanho_lote: int = TAMANHO_LOTE, deslocamento: int = 0):
+        if metodo not in METODOS:
+            raise ValueError(f"Método de amostragem desconhecido: {metodo!r} (use {list(METODOS)})")
+        self.metodo = metodo
+        self.dimensao = dimensao
+        self.tamanho_lote = tamanho_lote
+        if metodo == 'pseudo':
+            self._amostrador = None
+            gerador = np.random if semente is None else np.random.default_rng(semente)
+            self._gerar = lambda k: gerador.random((k, dimensao))
+        else:
+            self._amostrador = criar_amostrador_qmc(metodo, dimensao, semente, embaralhar)
+            if deslocamento:
+                self._amostrador.fast_forward(deslocamento)
+            self._gerar = self._gerar_qmc
+        self._lote = np.empty((0, dimensao))
+        self._posicao = 0
+
+    def _gerar_qmc(self, k: int) -> np.ndarray:
+        with warnings.catch_warnings():
+            # Lotes que não são potências de 2 ainda têm baixa discrepância; o aviso do Sobol é dispensável
+            warnings.simplefilter('ignore', UserWarning)
+            return self._amostrador.random(k)
+
+    def amostrar(self, k: int) -> np.ndarray:
+        """
+        Próximos k pontos da sequência.
+
+        Parâmetros:
+        - k (int): Número de pontos
+
+        Retorna:
+        - np.ndarray: Pontos (k, dimensao) no intervalo aberto (0, 1)
+        """
+        restantes = self._lote[self._posicao:]
+        self._lote, self._posicao = np.empty((0, self.dimensao)), 0
+        if k <= len(restantes):
+            self._lote, self._posicao = restantes, k
+            return restantes[:k]
+        novos = np.clip(self._gerar(k - len(restantes)), _U_MIN, _U_MAX)
+        return np.concatenate((restantes, novos))
+
+    def proximo(self):
+        """
+        Próximo ponto da sequência, tirado do lote atual (um novo lote é gerado quando ele acaba).
+
+        Retorna:
+        - float ou np.ndarray: O ponto (um float se dimensao == 1)
+        """
+        if self._posicao == len(self._lote):
+            self._lote = np.clip(self._gerar(self.tamanho_lote), _U_MIN, _U_MAX)
+            self._posicao = 0
+        ponto = self._lote[self._posicao]
+        self._posicao += 1
+        return float(ponto[0]) if self.dimensao == 1 else ponto
+
+
+def distancia_ks(amostras, cdf) -> float:
+    """
+    Distância de Kolmogorov-Smirnov entre a CDF empírica das amostras e a CDF alvo.
+
+    Parâmetros:
+    - amostras (np.ndarray): Valores amostrados
+    - cdf (callable): CDF da distribuição alvo
+
+    Retorna:
+    - float: sup |F_N(x) - F(x)|
+    """
+    F = cdf(np.sort(np.asarray(amostras, dtype=np.float64)))
+    N = F.size
+    return float(max(np.max(np.arange(1, N + 1) / N - F), np.max(F - np.arange(N) / N)))
+
+
+def curva_ks(amostras, cdf, tamanhos) -> np.ndarray:
+    """
+    Distância KS dos prefixos amostras[:N], para cada N em `tamanhos`.
+
+    Parâmetros:
+    - amostras (np.ndarray): Valores na ordem em que foram sorteados
+    - cdf (callable): CDF da distribuição alvo
+    - tamanhos (sequência de int): Números de amostras avaliados
+
+    Retorna:
+    - np.ndarray: Distância KS em cada tamanho
+    """
+    return np.array([distancia_ks(amostras[:N], cdf) for N in tamanhos])
+
+
+def comparar_convergencia(transformar, cdf, tamanhos, metodos=METODOS, dimensao: int = 1,
+                          semente=0) -> dict:
+    """
+    Curvas de distância KS em função do número de amostras para cada método.
+
+    Parâmetros:
+    - transformar (callable): Recebe pontos uniformes (N, dimensao) e devolve N amostras
+      (ex.: a inversa da CDF)
+    - cdf (callable): CDF da distribuição alvo
+    - tamanhos (sequência de int): Números de amostras avaliados
+    - metodos (sequência de str): Métodos comparados (ver METODOS)
+    - dimensao (int): Dimensão dos pontos uniformes usados por amostra
+    - semente: Semente de cada fonte
+
+    Retorna:
+    - dict: Método -> np.ndarray com a distância KS em cada tamanho
+    """
+    tamanhos = np.asarray(tamanhos)
+    curvas = {}
+    for metodo in metodos:
+        fonte = FonteUniforme(metodo, dimensao=dimensao, semente=semente)
+        amostras = transformar(fonte.amostrar(int(tamanhos.max())))
+        curvas[metodo] = curva_ks(amostras, cdf, tamanhos)
+    return curvas
+
+
+def amostras_necessarias(tamanhos, distancias, alvo: float):
+    """
+    Menor número de amostras a partir do qual a distância KS fica abaixo do alvo.
+
+    Parâmetros:
+    - tamanhos (sequência de int): Números de amostras avaliados, em ordem crescente
+    - distancias (np.ndarray): Distância KS em cada tamanho (ver `curva_ks`)
+    - alvo (float): Distância KS desejada
+
+    Retorna:
+    - int ou None: O tamanho, ou None se o alvo não for atingido até o último
+    """
+    acima = np.nonzero(np.asarray(distancias) > alvo)[0]
+    if acima.size == 0:
+        return int(tamanhos[0])
+    if acima[-1] + 1 == len(tamanhos):
+        return None
+    return int(tamanhos[acima[-1] + 1])
+
+
+def plot_convergencia_ks(ax, tamanhos, curvas: dict, alvo: float = None):
+    """
+    Desenha as curvas de distância KS em função do número de amostras, em escala log-log.
+
+    Parâmetros:
+    - ax (Axes): Eixo onde desenhar
+    - tamanhos (sequência de int): Números de amostras avaliados
+    - curvas (dict): Método -> distâncias KS (ver `comparar_convergencia`)
+    - alvo (float): Distância KS de referência; a legenda mostra quantas amostras
+      cada método precisa para atingi-la (opcional)
+    """
+    for metodo, distancias in curvas.items():
+        rotulo = metodo
+        if alvo is not None:
+            necessarias = amostras_necessarias(tamanhos, distancias, alvo)
+            rotulo += f" (N = {necessarias:,})" if necessarias is not None else f" (N > {int(tamanhos[-1]):,})"
+        ax.loglog(tamanhos, distancias, marker='o', ms=3, label=rotulo)
+    if alvo is not None:
+        ax.axhline(alvo, c='k', ls='--', alpha=0.5, lw=1)
+    ax.set_xlabel('Amostras sorteadas (N)')
+    ax.set_ylabel('Distância KS')
+    ax.grid(alpha=0.3, which='both')
+    ax.legend()
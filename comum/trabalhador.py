@@ -0,0 +1,159 @@
+"""
+trabalhador.py
+--------------
+Execução dos cálculos das figuras interativas fora da thread da interface.
+
+O callback de um slider apenas submete os novos parâmetros; o cálculo numérico
+roda numa thread (ou num processo) em segundo plano, e o resultado é devolvido à
+thread da interface por um timer do próprio canvas, onde só os artistas são
+atualizados. Enquanto um cálculo está em andamento, novos valores do slider
+substituem o pedido pendente (no máximo um cálculo em andamento e um pendente),
+e resultados de parâmetros já superados são descartados.
+
+Observações:
+- Um cálculo já iniciado não é interrompido: o seu resultado é apenas descartado.
+- Em backends sem laço de eventos (ex.: Agg), o timer do canvas não dispara; nesse
+  caso, e com modo=None, o cálculo é feito de forma síncrona no próprio callback.
+- No modo 'processo', a função de cálculo e os seus argumentos precisam ser
+  serializáveis (pickle), isto é, definidos num módulo importável.
+- Com VIZ_PERFIL=1 (ver comum.perfil), o cálculo é cronometrado no próprio
+  trabalhador e a aplicação na thread da interface; as duas medidas entram no
+  HUD e no trace da figura, inclusive as de resultados descartados.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+from matplotlib.backend_bases import TimerBase
+
+from comum.perfil import obter_perfilador
+
+MODOS = {'thread': ThreadPoolExecutor, 'processo': ProcessPoolExecutor}
+INTERVALO_VERIFICACAO_MS = 15  # Intervalo com que a thread da interface procura resultados prontos
+
+
+def _cronometrar(calcular, *args):
+    """
+    Executa o cálculo e mede o seu tempo onde ele roda (thread ou processo do trabalhador).
+
+    O início é dado por time.perf_counter(), que usa o relógio monotônico do sistema
+    e pode ser comparado entre processos.
+
+    Retorna:
+    - tuple: Resultado de `calcular` e a medida (início, duração em segundos, pid, tid)
+    """
+    inicio = time.perf_counter()
+    resultado = calcular(*args)
+    return resultado, (inicio, time.perf_counter() - inicio, os.getpid(), threading.get_ident())
+
+
+class TrabalhadorCalculo:
+    """
+    Executa `calcular` em segundo plano e entrega o resultado mais recente a `aplicar`
+    na thread da interface.
+
+    Parâmetros:
+    - fig (Figure): Figura cujo canvas fornece o timer da interface
+    - calcular (callable): Parte numérica; recebe os argumentos de `submeter` e não
+      deve tocar em artistas
+    - aplicar (callable): Recebe o resultado de `calcular` e atualiza os artistas
+    - modo (str): 'thread', 'processo' ou None (cálculo síncrono)
+    - intervalo_ms (int): Intervalo de verificação dos resultados, em milissegundos
+    """
+
+    def __init__(self, fig, calcular, aplicar, modo: str = 'thread', intervalo_ms: int = INTERVALO_VERIFICACAO_MS):
+        if modo is not None and modo not in MODOS:
+            raise ValueError(f"Modo de execução desconhecido: {modo!r} (use {sorted(MODOS)} ou None)")
+        self.calcular = calcular
+        self._perfilador = obter_perfilador(fig)
+        self._nome_calculo = getattr(calcular, '__name__', 'calcular')
+        if self._perfilador is not None:
+            nome = getattr(aplicar, '__name__', '<lambda>')
+            aplicar = self._perfilador.envolver(aplicar, 'aplicar' if nome == '<lambda>' else nome, 'aplicacao')
+        self.aplicar = aplicar
+        self.geracao = 0      # Incrementada a cada pedido; identifica o resultado mais recente
+        self.descartados = 0  # Resultados calculados mas já superados por parâmetros mais novos
+        self._futuro = None
+        self._geracao_futuro = None
+        self._pendente = None
+        self._timer_ativo = False
+
+        self._timer = fig.canvas.new_timer(interval=intervalo_ms)
+        self.sincrono = modo is None or type(self._timer) is TimerBase
+        self._executor = None
+        if not self.sincrono:
+            self._timer.add_callback(self._verificar)
+            self._executor = MODOS[modo](max_workers=1)
+            fig.canvas.mpl_connect('close_event', lambda evento: self.encerrar())
+
+    def submeter(self, *args):
+        """
+        Pede o cálculo para os novos parâmetros, substituindo qualquer pedido ainda
+        não iniciado.
+
+        Parâmetros:
+        - *args: Argumentos repassados a `calcular`
+        """
+        self.geracao += 1
+        if self.sincrono:
+            resultado, medida = _cronometrar(self.calcular, *args)
+            self._registrar_calculo(medida, descartado=False)
+            self.aplicar(resultado)
+            return
+        self._pendente = (self.geracao, args)
+        if self._futuro is None:
+            self._iniciar_pendente()
+        if not self._timer_ativo:
+            self._timer.start()
+            self._timer_ativo = True
+
+    def cancelar(self):
+        """Descarta o pedido pendente e o resultado do cálculo em andamento."""
+        self.geracao += 1
+        self._pendente = None
+
+    def ocupado(self) -> bool:
+        """Indica se há um cálculo em andamento ou pendente."""
+        return self._futuro is not None or self._pendente is not None
+
+    def _iniciar_pendente(self):
+        """Envia o pedido pendente ao executor."""
+        self._geracao_futuro, args = self._pendente
+        self._pendente = None
+        self._futuro = self._executor.submit(_cronometrar, self.calcular, *args)
+
+    def _registrar_calculo(self, medida: tuple, descartado: bool):
+        """Envia a medida de um cálculo ao perfilador da figura, se a instrumentação estiver ativa."""
+        if self._perfilador is not None:
+            inicio, duracao, pid, tid = medida
+            self._perfilador.registrar_evento(self._nome_calculo, 'calculo', inicio, duracao, pid, tid,
+                                              descartado=descartado)
+
+    def _verificar(self):
+        """Callback do timer: aplica o resultado pronto, se ele ainda for o mais recente."""
+        if self._futuro is None or not self._futuro.done():
+            return
+        futuro, geracao = self._futuro, self._geracao_futuro
+        self._futuro = None
+        if self._pendente is not None:
+            self._iniciar_pendente()
+        else:
+            self._timer.stop()
+            self._timer_ativo = False
+
+        resultado, medida = futuro.result()  # Exceções do cálculo são relançadas na thread da interface
+        self._registrar_calculo(medida, descartado=geracao != self.geracao)
+        if geracao == self.geracao:
+            self.aplicar(resultado)
+        else:
+            self.descartados += 1
+
+    def encerrar(self):
+        """Para o timer e encerra o executor, sem esperar o cálculo em andamento."""
+        self._pendente = None
+        self._timer.stop()
+        self._timer_ativo = False
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,171 @@
+"""
+simulador_encontros.py
+----------------------
+Simulador de Monte Carlo para o problema do encontro entre A e B.
+
+Cada pessoa chega ao local num instante com distribuição normal própria. As
+duas se encontram se a diferença entre os instantes de chegada não passa do
+tempo de espera (tolerância) w que cada uma aceita aguardar.
+
+O módulo inclui:
+- Sorteio vetorizado dos pares de chegada em lotes de tamanho fixo (memória limitada)
+- Avaliação de uma grade inteira de tolerâncias numa única passada ordenada
+- Tabelas de probabilidade para vários cenários (média, desvio, w), opcionalmente
+  distribuídos num pool de processos
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+
+TAMANHO_LOTE_PADRAO = 1_000_000  # Pares sorteados por lote (~16 MB em float64)
+
+
+class Cenario(NamedTuple):
+    """Parâmetros das distribuições normais dos instantes de chegada de A e B."""
+    media_A: float
+    desvio_A: float
+    media_B: float
+    desvio_B: float
+
+
+def contar_encontros_lote(diferencas: np.ndarray, tolerancias: np.ndarray) -> np.ndarray:
+    """
+    Conta, para cada tolerância, quantos pares do lote se encontram.
+
+    As diferenças absolutas são ordenadas uma única vez e a grade de tolerâncias
+    inteira é localizada com `searchsorted`, em vez de uma comparação por tolerância.
+
+    Parâmetros:
+    - diferencas (np.ndarray): Diferenças absolutas |A - B| do lote
+    - tolerancias (np.ndarray): Grade de tempos de espera w
+
+    Retorna:
+    - np.ndarray: Número de pares com |A - B| <= w, para cada w
+    """
+    diferencas_ordenadas = np.sort(diferencas)
+    return np.searchsorted(diferencas_ordenadas, tolerancias, side='right')
+
+
+def simular_cenario(cenario: Cenario, tolerancias: np.ndarray, num_pares: int,
+                    tamanho_lote: int = TAMANHO_LOTE_PADRAO, semente=None) -> np.ndarray:
+    """
+    Estima a probabilidade de encontro de um cenário para toda a grade de tolerâncias.
+
+    Os pares de chegada são sorteados em lotes de no máximo `tamanho_lote`
+    elementos, de modo que a memória usada não depende de `num_pares`.
+
+    Parâmetros:
+    - cenario (Cenario): Médias e desvios dos instantes de chegada de A e B
+    - tolerancias (np.ndarray): Grade de tempos de espera w (em minutos)
+    - num_pares (int): Número total de pares (A, B) sorteados
+    - tamanho_lote (int): Número máximo de pares sorteados por vez
+    - semente: Semente (ou SeedSequence) do gerador aleatório
+
+    Retorna:
+    - np.ndarray: Probabilidade estimada de encontro para cada tolerância
+    """
+    media_A, desvio_A, media_B, desvio_B = cenario
+    tolerancias = np.asarray(tolerancias, dtype=float)
+    gerador = np.random.default_rng(semente)
+
+    encontros = np.zeros(tolerancias.shape, dtype=np.int64)
+    restantes = num_pares
+    while restantes > 0:
+        tamanho = min(tamanho_lote, restantes)
+        chegadas_A = gerador.normal(media_A, desvio_A, tamanho)
+        chegadas_B = gerador.normal(media_B, desvio_B, tamanho)
+        # Reaproveita o buffer de A para guardar |A - B|
+        diferencas = np.abs(np.subtract(chegadas_A, chegadas_B, out=chegadas_A), out=chegadas_A)
+        encontros += contar_encontros_lote(diferencas, tolerancias)
+        restantes -= tamanho
+
+    return encontros / num_pares
+
+
+def _simular_cenario_args(args):
+    """Desempacota os argumentos de `simular_cenario` para uso com `Executor.map`."""
+    return simular_cenario(*args)
+
+
+def tabela_probabilidades(cenarios, tolerancias, num_pares: int = 1_000_000,
+                          tamanho_lote: int = TAMANHO_LOTE_PADRAO, semente=None,
+                          num_processos: int = None) -> np.ndarray:
+    """
+    Monta a tabela de probabilidades de encontro para vários cenários.
+
+    Cada cenário recebe um fluxo aleatório independente derivado de `semente`,
+    de modo que o resultado é o mesmo com ou sem o pool de processos.
+
+    Parâmetros:
+    - cenarios (iterável): Cenários (media_A, desvio_A, media_B, desvio_B)
+    - tolerancias (np.ndarray): Grade de tempos de espera w (em minutos)
+    - num_pares (int): Número de pares (A, B) sorteados por cenário
+    - tamanho_lote (int): Número máximo de pares sorteados por vez
+    - semente: Semente do gerador aleatório
+    - num_processos (int): Número de processos do pool. Se None, os cenários
+      são simulados sequencialmente no processo atual
+
+    Retorna:
+    - np.ndarray: Matriz (cenários x tolerâncias) com as probabilidades de encontro
+    """
+    cenarios = [Cenario(*cenario) for cenario in cenarios]
+    tolerancias = np.asarray(tolerancias, dtype=float)
+    sementes = np.random.SeedSequence(semente).spawn(len(cenarios))
+    argumentos = [(cenario, tolerancias, num_pares, tamanho_lote, semente_cenario)
+                  for cenario, semente_cenario in zip(cenarios, sementes)]
+
+    if num_processos is None:
+        linhas = [_simular_cenario_args(args) for args in argumentos]
+    else:
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            linhas = list(executor.map(_simular_cenario_args, argumentos))
+
+    return np.vstack(linhas) if linhas else np.empty((0, tolerancias.size))
+
+
+def erro_padrao(probabilidades: np.ndarray, num_pares: int) -> np.ndarray:
+    """
+    Calcula o erro padrão de Monte Carlo das probabilidades estimadas.
+
+    Parâmetros:
+    - probabilidades (np.ndarray): Probabilidades estimadas
+    - num_pares (int): Número de pares usados em cada estimativa
+
+    Retorna:
+    - np.ndarray: Erro padrão de cada probabilidade
+    """
+    return np.sqrt(probabilidades * (1 - probabilidades) / num_pares)
+
+
+def formatar_tabela(cenarios, tolerancias, probabilidades: np.ndarray, casas: int = 4) -> str:
+    """
+    Formata a tabela de probabilidades como texto, um cenário por linha.
+
+    Parâmetros:
+    - cenarios (iterável): Cenários usados na simulação
+    - tolerancias (np.ndarray): Grade de tempos de espera w
+    - probabilidades (np.ndarray): Matriz retornada por `tabela_probabilidades`
+    - casas (int): Casas decimais exibidas
+
+    Retorna:
+    - str: Tabela pronta para impressão
+    """
+    largura = casas + 3
+    cabecalho = f"{'μA':>6} {'σA':>6} {'μB':>6} {'σB':>6} | " + " ".join(
+        f"{'w=' + format(w, 'g'):>{largura}}" for w in tolerancias)
+    linhas = [cabecalho, "-" * len(cabecalho)]
+    for cenario, linha in zip(cenarios, probabilidades):
+        parametros = " ".join(f"{valor:>6g}" for valor in Cenario(*cenario))
+        valores = " ".join(f"{prob:>{largura}.{casas}f}" for prob in linha)
+        linhas.append(f"{parametros} | {valores}")
+    return "\n".join(linhas)
+
+
+if __name__ == "__main__":
+    cenarios_exemplo = [(15, 5, 15, 2), (15, 5, 20, 2), (10, 3, 20, 8)]
+    tolerancias_exemplo = np.array([1, 2, 5, 10, 15])
+    tabela = tabela_probabilidades(cenarios_exemplo, tolerancias_exemplo,
+                                   num_pares=2_000_000, semente=0, num_processos=2)
+    print(formatar_tabela(cenarios_exemplo, tolerancias_exemplo, tabela))
@@ -1,8 +1,17 @@
+import argparse
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.stats import norm
 import matplotlib.animation as animation
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Shared repo package
+from comum.perfil import instrumentar
+from comum.precisao import tipo_float
+from sample_source import add_sample_arguments, load_external_sample
+from truncated_kde import gaussian_pdf
+
 # Set plot styles
 plt.rcParams.update({'font.family': 'Latin Modern Math'})
 plt.rcParams.update({'xtick.direction': 'in', 'ytick.direction': 'in'})
@@ -20,10 +29,22 @@ n_total = 100  # Maximum number of observations for animation
 x_range_points = 10  # Number of points for KDE evaluation
 bandwidth = 0.5  # Fixed bandwidth
 
+# Command-line options, e.g. --data samples.npy (read only when run directly)
+parser = add_sample_arguments(argparse.ArgumentParser(description="Animated Gaussian KDE"))
+args = parser.parse_args(sys.argv[1:] if __name__ == "__main__" else [])
+
+dtype = tipo_float()  # Storage and kernel precision (VIZ_PRECISAO=float32 halves the buffers)
+
 # Sample data
-x_obs = np.random.normal(3, 1, 1000)  # Larger sample for consistent distribution
+if args.data is None:
+    x_obs = np.random.normal(3, 1, 1000)  # Larger sample for consistent distribution
+    reference_pdf, reference_label = (lambda x: norm.pdf(x, loc=3, scale=1)), "Population"
+else:
+    # Reservoir subsample of an external sample, which stays on disk
+    x_obs, reference_pdf, reference_label = load_external_sample(args, 1000)
+x_obs = x_obs.astype(dtype, copy=False)
 x_range_static = np.linspace(min(x_obs) - 1, max(x_obs) + 1, x_range_points)
-true_distribution = norm.pdf(np.sort(x_obs), loc=3, scale=1)  # True distribution
+true_distribution = reference_pdf(np.sort(x_obs)) if reference_pdf is not None else None  # True distribution
 
 # Create figure and axes
 fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 8), width_ratios=[2, 1], gridspec_kw={'wspace': 0.05})
@@ -37,7 +58,7 @@ def update(frame):
     
     n = frame + 1  # Increment observations gradually
     x_obs_subset = x_obs[:n]
-    x_range = np.linspace(min(x_obs_subset) - 1, max(x_obs_subset) + 1, x_range_points)
+    x_range = np.linspace(min(x_obs_subset) - 1, max(x_obs_subset) + 1, x_range_points, dtype=dtype)
     
     pdfs_sum = np.zeros_like(x_range)
     offset = 1
@@ -48,7 +69,7 @@ def update(frame):
         ax1.scatter(x, offset, color="violet", edgecolor='blueviolet', s=5, alpha=0.6)      
         
         # Normais centradas nas observações
-        pdf_kernel = norm.pdf(x_range, loc=x, scale=bandwidth)
+        pdf_kernel = gaussian_pdf((x_range - x) / bandwidth) / bandwidth
         ax1.plot(x_range, pdf_kernel + offset, color="blueviolet", alpha=0.3, lw=1)         
         
         # Adiciona contribuição do Kernel na observação na KDE
@@ -67,24 +88,28 @@ def update(frame):
     
     # Plot da KDE e da curva da população
     ax_est.plot(x_range, pdf_estimate, label="KDE", color="blueviolet")
-    ax_est.plot(np.sort(x_obs), true_distribution, label="Population", lw=2, color="darkorange")
+    if true_distribution is not None:
+        ax_est.plot(np.sort(x_obs), true_distribution, label=reference_label, lw=2, color="darkorange")
     ax_est.legend(loc='upper left', fancybox=False, edgecolor='k')
     ax_est.set_yticklabels([])
     ax_est.set_ylim(0,.5)
     ax_est.set_xlim(x_range.min(), x_range.max())  # Ensure KDE plot aligns
 
-    # Compute error
-    kde_values = np.interp(x_obs_subset, x_range, pdf_estimate)
-    true_values = norm.pdf(x_obs_subset, loc=3, scale=1)
-    error = true_values - kde_values
-    
-    # Compute MSE and RSE
-    mse = np.mean(error ** 2)
-    rse = np.sqrt(mse)
-    text_str = f"MSE: {mse:.3f}\nRSE: {rse:.3f}"
+    # Compute error (only against a reference density)
+    if reference_pdf is not None:
+        kde_values = np.interp(x_obs_subset, x_range, pdf_estimate)
+        true_values = reference_pdf(x_obs_subset)
+        error = true_values - kde_values
+        
+        # Compute MSE and RSE
+        mse = np.mean(error ** 2)
+        rse = np.sqrt(mse)
+        text_str = f"MSE: {mse:.3f}\nRSE: {rse:.3f}"
+        ax2.scatter(x_obs_subset, error, edgecolor="blueviolet", color='None', s=50, alpha=0.5)
+    else:
+        text_str = "No reference density"
     ax2.text(0.05, 0.95, text_str, transform=ax2.transAxes, fontsize=16, verticalalignment='top')
     
-    ax2.scatter(x_obs_subset, error, edgecolor="blueviolet", color='None', s=50, alpha=0.5)
     ax2.axhline(0, color='black', linestyle='dotted')
     ax2.yaxis.set_label_position("right")
     ax2.set_xticklabels([])
@@ -95,8 +120,8 @@ def update(frame):
     ax2.grid(alpha=0.2, which='major')  
 
 
-# Create animation
-ani = animation.FuncAnimation(fig, update, frames=n_total, interval=50, repeat=False)
+# Create animation (profiled when VIZ_PERFIL=1)
+ani = animation.FuncAnimation(fig, instrumentar(fig, update), frames=n_total, interval=50, repeat=False)
 # ani.save("animation.gif", writer="pillow", fps=10)
 
 plt.show()
\ No newline at end of file
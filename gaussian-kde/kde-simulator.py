@@ -1,8 +1,18 @@
+import argparse
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.stats import norm
 from matplotlib.widgets import Slider
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Shared repo package
+from comum.perfil import instrumentar
+from comum.precisao import tipo_float
+from comum.trabalhador import TrabalhadorCalculo
+from truncated_kde import kernel_windows, truncation_error_bound, gaussian_pdf
+from sample_source import add_sample_arguments, load_external_sample
+
 # plt.rcParams['text.usetex'] = True
 plt.rcParams.update({'font.family': 'Latin Modern Math'})
 plt.rcParams.update({'xtick.direction': 'in', 'ytick.direction': 'in'})
@@ -22,20 +32,75 @@ n_total = 1000  # Total number of observations
 n_init = 5  # Start with a small subset
 x_range_init = 10  # Number of points for KDE evaluation
 bandwidth_init = 0.5  # Bandwidth
+compute_mode = 'thread'  # Where the KDE is computed: 'thread' or None (inside the slider callback)
+kde_mode = 'truncated'  # 'direct' (every kernel at every point) or 'truncated' (observations within truncation_k bandwidths)
+truncation_k = 5  # Window half-width, in bandwidths, of the truncated mode
+
+# Command-line options, e.g. --data samples.npy (read only when run directly)
+parser = add_sample_arguments(argparse.ArgumentParser(description="Interactive Gaussian KDE simulator"))
+args = parser.parse_args(sys.argv[1:] if __name__ == "__main__" else [])
+
+dtype = tipo_float()  # Storage and kernel precision (VIZ_PRECISAO=float32 halves the buffers)
 
 # Sample initial data (fixed for updates)
-x_obs = np.random.normal(3, 1, n_total)
+if args.data is None:
+    x_obs = np.random.normal(3, 1, n_total)
+    reference_pdf, reference_label = (lambda x: norm.pdf(x, loc=3, scale=1)), "Population"
+else:
+    # Reservoir subsample of an external sample, which stays on disk
+    x_obs, reference_pdf, reference_label = load_external_sample(args, n_total)
+x_obs = x_obs.astype(dtype, copy=False)
 x_range_static = np.linspace(min(x_obs) - 1, max(x_obs) + 1, x_range_init)  # Static range for true distribution
-true_distribution = norm.pdf(np.sort(x_obs), loc=3, scale=1)  # Static true distribution
+true_distribution = reference_pdf(np.sort(x_obs)) if reference_pdf is not None else None  # Static true distribution
 
 # Create figure and axes
 fig, (ax2, ax3) = plt.subplots(1,2,figsize=(15, 8), width_ratios=[2,1],gridspec_kw={'wspace': 0.05})
 plt.subplots_adjust(bottom=0.25)
 ax_est = ax2.twinx()  # Create secondary axis for estimated PDF
 
-# Define the update function
-def update(val):
-        
+# Numeric part of the update: runs off the GUI thread and must not touch artists
+def compute_kde(n, x_range_points, bandwidth):
+    # Use a subset of the initial sample points
+    x_obs_subset = x_obs[:n]
+    x_range = np.linspace(min(x_obs_subset) - 1, max(x_obs_subset) + 1, x_range_points, dtype=dtype)
+
+    if kde_mode == 'truncated':
+        # Each kernel only on the points within truncation_k bandwidths (no n x m matrix);
+        # the same values, summed per point, give the estimate
+        lo, counts, index, kernel_values = kernel_windows(x_obs_subset, x_range, bandwidth, truncation_k, dtype=dtype)
+        pdf_estimate = (np.bincount(index, weights=kernel_values, minlength=x_range.size) / n).astype(dtype)
+        kernels = [(x_range[start:start + size], values)
+                   for start, size, values in zip(lo, counts, np.split(kernel_values, np.cumsum(counts)[:-1]))]
+        error_bound = truncation_error_bound(bandwidth, truncation_k)
+    else:
+        # One kernel per row, evaluated in a single call (drawn individually)
+        pdf_kernels = gaussian_pdf((x_range - x_obs_subset[:, None]) / bandwidth) / bandwidth
+        pdf_estimate = pdf_kernels.sum(axis=0) / n
+        kernel_values = pdf_kernels.ravel()
+        kernels = [(x_range, pdf_kernel) for pdf_kernel in pdf_kernels]
+        error_bound = 0.0
+
+    # Compute error (only against a reference density)
+    error = mse = rse = None
+    if reference_pdf is not None:
+        kde_values = np.interp(x_obs_subset, x_range, pdf_estimate)
+        true_values = reference_pdf(x_obs_subset)
+        error = true_values - kde_values
+
+        # Compute MSE and RSE
+        mse = np.mean(error ** 2)
+        rse = np.sqrt(mse)
+
+    return {'x_obs_subset': x_obs_subset, 'x_range': x_range, 'kernels': kernels,
+            'kernel_values': kernel_values,
+            'pdf_estimate': pdf_estimate, 'error': error, 'mse': mse, 'rse': rse, 'error_bound': error_bound}
+
+
+# Artist part of the update: runs on the GUI thread with the arrays from compute_kde
+def draw_kde(result):
+    x_obs_subset, x_range = result['x_obs_subset'], result['x_range']
+    pdf_estimate, error = result['pdf_estimate'], result['error']
+
     # Temporarily disable event listeners
     slider_n.eventson = False
     slider_x_range.eventson = False
@@ -44,50 +109,27 @@ def update(val):
     ax2.clear()
     ax3.clear()
     ax_est.clear()
-    
-    # Get slider values
-    n = int(slider_n.val)  # Number of observations to use
-    x_range_points = int(slider_x_range.val)
-    bandwidth = slider_bandwidth.val
-    
-    # Use a subset of the initial sample points
-    x_obs_subset = x_obs[:n]
-    x_range = np.linspace(min(x_obs_subset) - 1, max(x_obs_subset) + 1, x_range_points)
-    
-    pdfs_sum = np.zeros_like(x_range)
-    offset = 1
-    color = 'tab:blue'
-    
-    for x in x_obs_subset:
-        ax2.scatter(x, offset, color="violet", edgecolor='blueviolet',s=5,alpha=0.6)
-                
-        pdf_kernel = norm.pdf(x_range, loc=x, scale=bandwidth)
-        pdfs_sum += pdf_kernel
-        pdf_estimate = pdfs_sum / n
-        
-        ax2.plot(x_range, pdf_kernel + offset, color="blueviolet", alpha=0.3, lw=1)
-        offset += 1
+
+    offsets = np.arange(1, x_obs_subset.size + 1)
+    ax2.scatter(x_obs_subset, offsets, color="violet", edgecolor='blueviolet',s=5,alpha=0.6)
+    for (x_kernel, pdf_kernel), offset in zip(result['kernels'], offsets):
+        ax2.plot(x_kernel, pdf_kernel + offset, color="blueviolet", alpha=0.3, lw=1)
     
     ax_est.plot(x_range, pdf_estimate, color="blueviolet", label="KDE")
-    ax_est.plot(np.sort(x_obs), true_distribution, label="Population", lw=2, color="darkorange")
+    if true_distribution is not None:
+        ax_est.plot(np.sort(x_obs), true_distribution, label=reference_label, lw=2, color="darkorange")
     ax_est.legend(loc='upper left',fancybox=False,edgecolor='k')
-    
-    # Compute error
-    kde_values = np.interp(x_obs_subset, x_range, pdf_estimate)
-    true_values = norm.pdf(x_obs_subset, loc=3, scale=1)
-    error = true_values - kde_values
-    
-    # Compute MSE and RSE
-    mse = np.mean(error ** 2)
-    rse = np.sqrt(mse)
 
     # Display text in the upper-left corner of ax3
-    text_str = f"MSE: {mse:.3f}\nRSE: {rse:.3f}"
+    text_str = f"MSE: {result['mse']:.3f}\nRSE: {result['rse']:.3f}" if error is not None else "No reference density"
+    if kde_mode == 'truncated':
+        text_str += f"\nTruncation: < {result['error_bound']:.0e}"
     ax3.text(0.05, 0.95, text_str, transform=ax3.transAxes, fontsize=16,
             verticalalignment='top')
 
 
-    ax3.scatter(x_obs_subset, error, edgecolor="blueviolet", color='None',s=50, alpha=0.5)
+    if error is not None:
+        ax3.scatter(x_obs_subset, error, edgecolor="blueviolet", color='None',s=50, alpha=0.5)
     ax3.axhline(0, color='black', linestyle='dotted')
     ax3.yaxis.set_label_position("right")
     ax3.set_xticklabels([])
@@ -109,6 +151,19 @@ def update(val):
     slider_bandwidth.eventson = True
 
 
+# Background computation: results superseded by newer slider values are discarded
+worker = TrabalhadorCalculo(fig, compute_kde, draw_kde, modo=compute_mode)
+
+# Define the update function
+def update(val):
+    # Get slider values
+    n = int(slider_n.val)  # Number of observations to use
+    x_range_points = int(slider_x_range.val)
+    bandwidth = float(slider_bandwidth.val)  # Python float keeps float32 buffers in float32
+
+    worker.submeter(n, x_range_points, bandwidth)
+
+
 # Create sliders
 axcolor = 'lightgoldenrodyellow'
 ax_n = plt.axes([0.15, 0.1, 0.65, 0.03], facecolor=axcolor)
@@ -119,6 +174,10 @@ slider_n = Slider(ax_n, 'Observations', valmin=n_init, valmax=50, valinit=n_init
 slider_x_range = Slider(ax_x_range, 'X-Range Points', valmin=x_range_init, valmax=200, valinit=x_range_init, valstep=1)
 slider_bandwidth = Slider(ax_bandwidth, 'Bandwidth', valmin=0.1, valmax=2.0, valinit=bandwidth_init, valstep=0.05)
 
+# Profile updates and draws when VIZ_PERFIL=1 (the KDE is timed inside the worker;
+# the callback, which only submits the job, shows up in the trace only)
+update = instrumentar(fig, update, categoria='callback')
+
 slider_n.on_changed(update)
 slider_x_range.on_changed(update)
 slider_bandwidth.on_changed(update)
@@ -0,0 +1,167 @@
+"""
+sample_source.py
+----------------
+External samples for the KDE scripts, read from disk without loading them into RAM.
+
+A sample is a 1-D array stored as `.npy` (opened with `np.load(mmap_mode='r')`)
+or as raw binary (opened with `np.memmap`, given its dtype and header offset).
+Every pass over it is done in chunks of CHUNK_SIZE values:
+- `sample_summary`: size, range, mean and standard deviation
+- `reservoir_sample`: uniform subsample of fixed size for the observation scatter
+- `FullSampleDensity`: KDE of the whole sample, from a chunked histogram, used as
+  the reference curve when the true density is unknown
+"""
+
+import os
+
+import numpy as np
+from scipy.stats import norm
+
+from truncated_kde import kde_truncated
+
+CHUNK_SIZE = 1_000_000  # Values read from disk at a time
+REFERENCE_BINS = 8192   # Histogram bins behind the full-sample KDE
+
+
+def open_sample(path: str, dtype: str = 'float64', offset: int = 0) -> np.ndarray:
+    """
+    Opens a sample as a read-only memory map.
+
+    Parameters:
+    - path (str): `.npy` file, or raw binary file of `dtype` values
+    - dtype (str): Value type of raw files (ignored for `.npy`, which stores it)
+    - offset (int): Bytes to skip at the start of raw files
+
+    Returns:
+    - np.memmap: 1-D view of the sample on disk
+    """
+    if os.path.splitext(path)[1].lower() == '.npy':
+        sample = np.load(path, mmap_mode='r')
+    else:
+        sample = np.memmap(path, dtype=np.dtype(dtype), mode='r', offset=offset)
+    if sample.ndim != 1:
+        raise ValueError(f"Expected a 1-D sample, got shape {sample.shape} in {path}")
+    if sample.size == 0:
+        raise ValueError(f"Empty sample: {path}")
+    return sample
+
+
+def iter_chunks(sample, chunk_size: int = CHUNK_SIZE):
+    """Yields consecutive chunks of the sample as in-memory float64 arrays."""
+    for start in range(0, sample.size, chunk_size):
+        yield np.asarray(sample[start:start + chunk_size], dtype=np.float64)
+
+
+def sample_summary(sample, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Size, minimum, maximum, mean and standard deviation of the sample, in one pass.
+
+    Chunk means and sums of squared deviations are merged pairwise (Chan et al.),
+    which avoids the cancellation of the naive E[x^2] - E[x]^2 on large samples.
+    """
+    count, mean, m2 = 0, 0.0, 0.0
+    lo, hi = np.inf, -np.inf
+    for chunk in iter_chunks(sample, chunk_size):
+        chunk_mean = chunk.mean()
+        chunk_m2 = np.sum((chunk - chunk_mean) ** 2)
+        total = count + chunk.size
+        delta = chunk_mean - mean
+        mean += delta * chunk.size / total
+        m2 += chunk_m2 + delta ** 2 * count * chunk.size / total
+        count = total
+        lo, hi = min(lo, chunk.min()), max(hi, chunk.max())
+    return {'n': count, 'min': lo, 'max': hi, 'mean': mean, 'std': np.sqrt(m2 / count)}
+
+
+def reservoir_sample(sample, k: int, rng=None, chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Uniform random subsample of k values (without replacement), in one chunked pass.
+
+    Algorithm R: the value at position i >= k replaces a random slot with
+    probability k / (i + 1). Within a chunk the replacements are drawn at once and,
+    when several hit the same slot, the last one wins, as in the sequential version.
+
+    Parameters:
+    - sample (np.ndarray): Sample (possibly memory-mapped)
+    - k (int): Size of the subsample (the whole sample if it is smaller)
+    - rng (np.random.Generator): Random generator (a new one if None)
+    - chunk_size (int): Values read from disk at a time
+
+    Returns:
+    - np.ndarray: Subsample, shuffled so that any prefix x[:n] is also a uniform subsample
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    k = min(k, sample.size)
+    reservoir = np.asarray(sample[:k], dtype=np.float64).copy()
+    for start in range(k, sample.size, chunk_size):
+        chunk = np.asarray(sample[start:start + chunk_size], dtype=np.float64)
+        slots = rng.integers(0, np.arange(start, start + chunk.size) + 1)
+        hits = np.nonzero(slots < k)[0]
+        # Last hit of each slot (np.unique returns the first index, hence the reversal)
+        hit_slots, last = np.unique(slots[hits][::-1], return_index=True)
+        reservoir[hit_slots] = chunk[hits[::-1][last]]
+    return rng.permutation(reservoir)
+
+
+class FullSampleDensity:
+    """
+    KDE of the whole sample, used as the reference density when the true one is unknown.
+
+    The sample is binned once, in chunks, into REFERENCE_BINS bins; the density is
+    then a KDE over the bin centers weighted by their counts, with Silverman's
+    bandwidth for the whole sample (never below two bin widths).
+
+    Parameters:
+    - sample (np.ndarray): Sample (possibly memory-mapped)
+    - summary (dict): Output of `sample_summary` (computed if None)
+    - bins (int): Number of histogram bins
+    """
+
+    def __init__(self, sample, summary: dict = None, bins: int = REFERENCE_BINS, chunk_size: int = CHUNK_SIZE):
+        summary = sample_summary(sample, chunk_size) if summary is None else summary
+        edges = np.linspace(summary['min'], summary['max'], bins + 1)
+        self.counts = np.zeros(bins)
+        for chunk in iter_chunks(sample, chunk_size):
+            self.counts += np.histogram(chunk, bins=edges)[0]
+        self.centers = (edges[:-1] + edges[1:]) / 2
+        silverman = 1.06 * summary['std'] * summary['n'] ** (-1 / 5)
+        self.bandwidth = max(silverman, 2 * (edges[1] - edges[0]))
+
+    def __call__(self, x) -> np.ndarray:
+        return kde_truncated(self.centers, np.atleast_1d(x), self.bandwidth, weights=self.counts)
+
+
+def add_sample_arguments(parser):
+    """Adds the external sample options shared by the KDE scripts to an argparse parser."""
+    parser.add_argument('--data', help="Sample file: .npy or raw binary (default: generated N(3, 1) sample)")
+    parser.add_argument('--dtype', default='float64', help="Value type of raw binary files (default: float64)")
+    parser.add_argument('--offset', type=int, default=0, help="Header bytes to skip in raw binary files")
+    parser.add_argument('--population', type=float, nargs=2, metavar=('LOC', 'SCALE'),
+                        help="Normal population of an external sample, if known (default: use the full-sample KDE)")
+    parser.add_argument('--no-reference', action='store_true',
+                        help="Plot an external sample without any reference curve or error panel")
+    return parser
+
+
+def load_external_sample(args, size: int, rng=None):
+    """
+    Opens the sample given on the command line and returns what the KDE scripts plot.
+
+    Parameters:
+    - args (argparse.Namespace): Parsed options from `add_sample_arguments`
+    - size (int): Number of observations to draw for the scatter and kernels
+    - rng (np.random.Generator): Random generator of the reservoir sample
+
+    Returns:
+    - x_obs (np.ndarray): Reservoir subsample of the file
+    - reference_pdf (callable): Density the KDE is compared against (None with --no-reference)
+    - reference_label (str): Legend of the reference curve
+    """
+    sample = open_sample(args.data, args.dtype, args.offset)
+    x_obs = reservoir_sample(sample, size, rng)
+    if args.no_reference:
+        return x_obs, None, None
+    if args.population is not None:
+        loc, scale = args.population
+        return x_obs, (lambda x: norm.pdf(x, loc=loc, scale=scale)), "Population"
+    return x_obs, FullSampleDensity(sample), f"Full sample (n={sample.size:,})"
@@ -0,0 +1,47 @@
+"""
+lancador
+--------
+Lançador único das visualizações do repositório.
+
+Cada visualização é um subcomando, importado só quando é executado:
+
+    python -m lancador listar
+    python -m lancador mgf
+    python -m lancador kde-simulador --data amostra.npy
+
+Com o servidor quente (`python -m lancador servidor iniciar`), numpy, scipy e
+matplotlib ficam carregados num processo em segundo plano, acessado por um
+socket local; cada comando é executado num processo filho criado por fork, sem
+pagar de novo as importações e o carregamento do cache de fontes. O tempo de
+inicialização de cada comando é informado na saída de erro.
+"""
+
+import os
+from typing import NamedTuple
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Visualizacao(NamedTuple):
+    """Script de uma visualização, relativo à raiz do repositório."""
+    diretorio: str
+    script: str
+    descricao: str
+
+    @property
+    def caminho(self) -> str:
+        return os.path.join(RAIZ, self.diretorio, self.script)
+
+
+VISUALIZACOES = {
+    'mgf': Visualizacao('moment-gerenating-function', 'main.py',
+                        'Painel da MGF e superfície de erro Binomial vs Poisson'),
+    'kde-animacao': Visualizacao('gaussian-kde', 'kde-animation.py',
+                                 'Animação da KDE conforme o número de observações cresce'),
+    'kde-simulador': Visualizacao('gaussian-kde', 'kde-simulator.py',
+                                  'KDE interativa com sliders de n, pontos de x e largura de banda'),
+    'pit': Visualizacao('probability-integral-transformation', 'probability_integral_transformation.py',
+                        'Animação da transformação integral de probabilidade (grava o GIF)'),
+    'pit-convergencia': Visualizacao('probability-integral-transformation', 'convergencia_qmc.py',
+                                     'Convergência KS com valores pseudoaleatórios e de baixa discrepância'),
+}
@@ -0,0 +1,102 @@
+"""
+__main__.py
+-----------
+Linha de comando do lançador:
+
+    python -m lancador listar
+    python -m lancador [--frio] [--tempos ARQUIVO] <visualização> [argumentos do script...]
+    python -m lancador servidor {iniciar,executar,status,parar}
+
+Se o servidor quente estiver em execução, a visualização roda num filho dele;
+caso contrário (ou com --frio), roda no próprio processo do lançador.
+"""
+
+import time
+
+INICIO = time.time()  # Antes de qualquer outra importação: origem da medida de inicialização
+
+import argparse
+import sys
+
+from lancador import VISUALIZACOES
+from lancador import servidor
+
+ACOES_SERVIDOR = ('iniciar', 'executar', 'status', 'parar')
+
+
+def listar():
+    """Lista as visualizações disponíveis."""
+    largura = max(map(len, VISUALIZACOES))
+    for nome, visualizacao in VISUALIZACOES.items():
+        print(f"{nome:<{largura}}  {visualizacao.descricao}")
+
+
+def comando_servidor(acao: str) -> int:
+    """Executa uma ação de gerenciamento do servidor quente."""
+    if not servidor.servidor_suportado():
+        print("[lancador] O servidor quente requer os.fork e sockets Unix (Linux ou macOS)", file=sys.stderr)
+        return 1
+    try:
+        return _comando_servidor(acao)
+    except PermissionError as erro:
+        print(f"[lancador] {erro}", file=sys.stderr)
+        return 1
+
+
+def _comando_servidor(acao: str) -> int:
+    if acao == 'executar':
+        servidor.ServidorQuente().servir()
+        return 0
+    if acao == 'iniciar':
+        status = servidor.iniciar_em_segundo_plano()
+        print(f"[lancador] Servidor quente em {status['socket']} (pid {status['pid']}; importações "
+              f"{status['importacoes_s']:.2f} s, fontes {status['fontes_s']:.2f} s)")
+        return 0
+    resposta = servidor.consultar(acao)
+    if resposta is None:
+        print(f"[lancador] Nenhum servidor em execução em {servidor.caminho_socket()}")
+        return 1 if acao == 'status' else 0
+    if acao == 'status':
+        print(f"[lancador] Servidor em {resposta['socket']} (pid {resposta['pid']}), ativo há "
+              f"{time.time() - resposta['desde']:.0f} s, {resposta['filhos']} comando(s) em execução")
+    else:
+        print("[lancador] Servidor parado")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog='python -m lancador', description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frio', action='store_true',
+                        help='Executa no processo atual mesmo com o servidor quente em execução')
+    parser.add_argument('--tempos', metavar='ARQUIVO',
+                        help='Acrescenta a medida de inicialização a um arquivo JSON Lines')
+    parser.add_argument('comando', choices=['listar', 'servidor', *VISUALIZACOES])
+    parser.add_argument('argumentos', nargs=argparse.REMAINDER,
+                        help='Argumentos do script (ou a ação do servidor)')
+    args = parser.parse_args()
+
+    if args.comando == 'listar':
+        listar()
+        return 0
+    if args.comando == 'servidor':
+        if len(args.argumentos) != 1 or args.argumentos[0] not in ACOES_SERVIDOR:
+            parser.error(f"use: servidor {{{','.join(ACOES_SERVIDOR)}}}")
+        return comando_servidor(args.argumentos[0])
+
+    conexao = None
+    if not args.frio:
+        try:
+            conexao = servidor.conectar()
+        except PermissionError as erro:
+            print(f"[lancador] {erro}; executando no processo atual", file=sys.stderr)
+    if conexao is not None:
+        return servidor.executar_no_servidor(conexao, args.comando, args.argumentos, INICIO, args.tempos)
+
+    from lancador.execucao import importar_bibliotecas, executar_visualizacao
+    importacoes = importar_bibliotecas()
+    return executar_visualizacao(args.comando, args.argumentos, INICIO, importacoes, arquivo_tempos=args.tempos)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
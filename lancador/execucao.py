@@ -0,0 +1,158 @@
+"""
+execucao.py
+-----------
+Execução de uma visualização no processo atual e medida da sua inicialização.
+
+A inicialização de um comando vai do lançamento (o início do cliente, no modo
+quente) até o primeiro desenho de uma figura, e é dividida em importação das
+bibliotecas e execução do script até o desenho. No processo quente as
+bibliotecas já estão carregadas e o cache de fontes já foi lido, de modo que
+só resta a parte do script.
+"""
+
+import functools
+import importlib
+import json
+import os
+import runpy
+import sys
+import time
+
+from lancador import VISUALIZACOES
+
+BIBLIOTECAS = ('numpy', 'scipy.stats', 'scipy.special', 'matplotlib', 'matplotlib.pyplot',
+               'matplotlib.animation', 'matplotlib.widgets', 'matplotlib.gridspec', 'mpl_toolkits.mplot3d')
+
+
+def importar_bibliotecas() -> float:
+    """
+    Importa as bibliotecas usadas pelas visualizações.
+
+    Retorna:
+    - float: Tempo gasto, em segundos (quase zero se já estavam carregadas)
+    """
+    inicio = time.perf_counter()
+    for modulo in BIBLIOTECAS:
+        importlib.import_module(modulo)
+    return time.perf_counter() - inicio
+
+
+def aquecer_fontes() -> float:
+    """
+    Carrega o cache de fontes e o mathtext desenhando um texto numa figura Agg
+    fora do pyplot (nenhuma janela é criada, e o processo pode ser copiado por fork).
+
+    Retorna:
+    - float: Tempo gasto, em segundos
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    inicio = time.perf_counter()
+    fig = Figure(figsize=(2, 1))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_title(r'$\mathcal{N}(\mu,\sigma/\sqrt{n})$')
+    ax.plot([0, 1], [0, 1])
+    fig.canvas.draw()
+    return time.perf_counter() - inicio
+
+
+class RelatorioInicializacao:
+    """
+    Informa o tempo de inicialização de um comando no primeiro desenho de uma figura.
+
+    Parâmetros:
+    - nome (str): Subcomando executado
+    - inicio (float): Instante do lançamento (time.time())
+    - importacoes (float): Tempo de importação das bibliotecas, em segundos
+    - quente (bool): Se o comando roda num filho do servidor quente
+    - arquivo (str): Arquivo JSON Lines onde cada medida é acrescentada (opcional)
+    """
+
+    def __init__(self, nome: str, inicio: float, importacoes: float, quente: bool, arquivo: str = None):
+        self.nome = nome
+        self.inicio = inicio
+        self.importacoes = importacoes
+        self.quente = quente
+        self.arquivo = arquivo
+        self.informado = False
+        self._draw_original = None
+
+    def instalar(self):
+        """Passa a observar o primeiro desenho de qualquer figura."""
+        from matplotlib.figure import Figure
+
+        self._draw_original = draw_original = Figure.draw
+        relatorio = self
+
+        @functools.wraps(draw_original)
+        def draw(fig, renderer):
+            resultado = draw_original(fig, renderer)
+            relatorio.registrar(primeiro_desenho=True)
+            return resultado
+
+        Figure.draw = draw
+
+    def registrar(self, primeiro_desenho: bool):
+        """Informa a medida, uma única vez por comando."""
+        if self.informado:
+            return
+        self.informado = True
+        total = time.time() - self.inicio
+        modo = 'servidor quente' if self.quente else 'processo frio'
+        evento = 'até o primeiro desenho' if primeiro_desenho else 'até o fim do script (sem desenho)'
+        print(f"[lancador] {self.nome}: inicialização de {total:.2f} s {evento} "
+              f"(importações {self.importacoes:.2f} s, script {total - self.importacoes:.2f} s; {modo})",
+              file=sys.stderr, flush=True)
+        if self.arquivo:
+            with open(self.arquivo, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'comando': self.nome, 'modo': 'quente' if self.quente else 'frio',
+                                    'primeiro_desenho': primeiro_desenho, 'total_s': total,
+                                    'importacoes_s': self.importacoes}) + '\n')
+
+    def concluir(self):
+        """Informa a medida se nenhuma figura foi desenhada e restaura Figure.draw."""
+        self.registrar(primeiro_desenho=False)
+        if self._draw_original is not None:
+            from matplotlib.figure import Figure
+            Figure.draw = self._draw_original
+
+
+def executar_visualizacao(nome: str, argv, inicio: float, importacoes: float = 0.0,
+                          quente: bool = False, arquivo_tempos: str = None) -> int:
+    """
+    Executa o script de uma visualização como `__main__` no processo atual.
+
+    O diretório do script entra no sys.path, como quando ele é executado
+    diretamente; o diretório atual é mantido, e os arquivos exportados (ex.: o GIF
+    do PIT) são gravados nele.
+
+    Parâmetros:
+    - nome (str): Subcomando (chave de VISUALIZACOES)
+    - argv (list): Argumentos repassados ao script
+    - inicio (float): Instante do lançamento (time.time())
+    - importacoes (float): Tempo de importação das bibliotecas, em segundos
+    - quente (bool): Se o comando roda num filho do servidor quente
+    - arquivo_tempos (str): Arquivo JSON Lines das medidas de inicialização (opcional)
+
+    Retorna:
+    - int: Código de saída do script
+    """
+    visualizacao = VISUALIZACOES[nome]
+    relatorio = RelatorioInicializacao(nome, inicio, importacoes, quente, arquivo_tempos)
+    relatorio.instalar()
+    argv_original = sys.argv
+    sys.argv = [visualizacao.caminho, *argv]
+    sys.path.insert(0, os.path.dirname(visualizacao.caminho))
+    try:
+        runpy.run_path(visualizacao.caminho, run_name='__main__')
+        return 0
+    except SystemExit as saida:
+        if saida.code is None or isinstance(saida.code, int):
+            return saida.code or 0
+        print(saida.code, file=sys.stderr)
+        return 1
+    finally:
+        relatorio.concluir()
+        sys.argv = argv_original
@@ -0,0 +1,364 @@
+"""
+servidor.py
+-----------
+Processo quente do lançador: numpy, scipy e matplotlib carregados uma única vez,
+acessados por um socket Unix local.
+
+Protocolo: o cliente envia uma linha JSON com a ação ('executar', 'status' ou
+'parar'). Em 'executar', o servidor cria um filho por fork, que assume o
+diretório atual e as variáveis de ambiente do cliente, envia a saída do script
+(stdout e stderr juntos) pela conexão e termina com a linha
+MARCADOR_FIM + {"codigo": <código de saída>}. Cada filho parte do estado limpo
+do servidor, então os rcParams e os módulos de um comando não afetam o próximo.
+
+Observações:
+- Requer os.fork e socket AF_UNIX (Linux e macOS); sem eles o lançador executa
+  sempre no processo atual.
+- O servidor não cria janelas nem escolhe o backend: isso só acontece no filho,
+  com o DISPLAY e o MPLBACKEND do cliente.
+- O socket fica em $XDG_RUNTIME_DIR ou num diretório do usuário com permissão
+  0700 dentro do diretório temporário; o arquivo é criado com permissão apenas
+  para o usuário, e só os subcomandos de VISUALIZACOES podem ser executados.
+- O cliente só envia o pedido (com as suas variáveis de ambiente) depois de
+  confirmar que o processo do outro lado é do mesmo usuário (SO_PEERCRED ou,
+  sem ele, o dono do arquivo do socket); o servidor recusa conexões de outros
+  usuários.
+"""
+
+import json
+import os
+import signal
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+from lancador import RAIZ, VISUALIZACOES
+
+VARIAVEL_SOCKET = 'VIZ_LANCADOR_SOCKET'
+MARCADOR_FIM = b'\0lancador:fim '
+TAMANHO_BLOCO = 65536
+INTERVALO_COLETA_S = 1.0  # Intervalo com que o servidor recolhe os filhos encerrados
+ESPERA_INICIO_S = 60.0    # Tempo máximo de espera pelo servidor iniciado em segundo plano
+
+
+def servidor_suportado() -> bool:
+    """Indica se a plataforma tem fork e sockets Unix."""
+    return hasattr(os, 'fork') and hasattr(socket, 'AF_UNIX')
+
+
+def diretorio_privado() -> str:
+    """
+    Diretório do socket e do log: $XDG_RUNTIME_DIR ou, sem ele, um diretório do
+    usuário no diretório temporário, criado com permissão 0700. Se esse diretório
+    já existe mas é de outro usuário, não é um diretório ou é acessível pelo grupo
+    ou por outros, lança PermissionError.
+
+    Retorna:
+    - str: Caminho do diretório
+    """
+    if os.environ.get('XDG_RUNTIME_DIR'):
+        return os.environ['XDG_RUNTIME_DIR']
+    diretorio = os.path.join(tempfile.gettempdir(), f'visualizacoes-lancador-{os.getuid()}')
+    try:
+        os.mkdir(diretorio, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(diretorio)  # lstat: um link simbólico não é aceito
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{diretorio} não é um diretório privado do usuário; remova-o ou defina {VARIAVEL_SOCKET}")
+    return diretorio
+
+
+def caminho_socket() -> str:
+    """Caminho do socket: VIZ_LANCADOR_SOCKET ou um arquivo em `diretorio_privado()`."""
+    return os.environ.get(VARIAVEL_SOCKET) or os.path.join(diretorio_privado(), 'visualizacoes-lancador.sock')
+
+
+def _uid_do_par(conexao):
+    """Usuário do processo do outro lado da conexão (SO_PEERCRED), ou None se a plataforma não informa."""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    formato = '3i'  # struct ucred: pid, uid, gid
+    _, uid, _ = struct.unpack(formato, conexao.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED,
+                                                          struct.calcsize(formato)))
+    return uid
+
+
+def _enviar(conexao, mensagem: dict):
+    conexao.sendall(json.dumps(mensagem).encode('utf-8') + b'\n')
+
+
+def _receber(conexao) -> dict:
+    """Lê uma linha JSON da conexão."""
+    dados = b''
+    while not dados.endswith(b'\n'):
+        bloco = conexao.recv(TAMANHO_BLOCO)
+        if not bloco:
+            raise ConnectionError("Conexão encerrada antes do fim da mensagem")
+        dados += bloco
+    return json.loads(dados)
+
+
+def conectar(caminho: str = None):
+    """
+    Conecta ao servidor quente, verificando que ele é do mesmo usuário (lança
+    PermissionError caso contrário, antes de qualquer envio).
+
+    Parâmetros:
+    - caminho (str): Caminho do socket (padrão: `caminho_socket()`)
+
+    Retorna:
+    - socket.socket ou None: Conexão aberta, ou None se não há servidor em execução
+    """
+    if not servidor_suportado():
+        return None
+    caminho = caminho or caminho_socket()
+    conexao = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conexao.connect(caminho)
+        uid = _uid_do_par(conexao)
+        if uid is None:
+            uid = os.stat(caminho).st_uid
+    except (FileNotFoundError, ConnectionRefusedError):
+        conexao.close()
+        return None
+    if uid != os.getuid():
+        conexao.close()
+        raise PermissionError(f"O socket {caminho} pertence a outro usuário (uid {uid})")
+    return conexao
+
+
+class ServidorQuente:
+    """
+    Servidor que mantém as bibliotecas carregadas e executa cada comando num filho.
+
+    Parâmetros:
+    - caminho (str): Caminho do socket (padrão: `caminho_socket()`)
+    """
+
+    def __init__(self, caminho: str = None):
+        self.caminho = caminho or caminho_socket()
+        self.filhos = set()
+        self.tempos = {}
+        self.desde = None
+        self._socket = None
+
+    def aquecer(self):
+        """Importa as bibliotecas e carrega o cache de fontes."""
+        from lancador.execucao import importar_bibliotecas, aquecer_fontes
+
+        self.tempos = {'importacoes_s': importar_bibliotecas(), 'fontes_s': aquecer_fontes()}
+
+    def _abrir_socket(self):
+        """Cria o socket, removendo o arquivo deixado por um servidor que não está mais em execução."""
+        if os.path.lexists(self.caminho):
+            if os.lstat(self.caminho).st_uid != os.getuid():
+                raise RuntimeError(f"{self.caminho} pertence a outro usuário; defina {VARIAVEL_SOCKET} "
+                                   f"com um caminho num diretório privado")
+            conexao = conectar(self.caminho)
+            if conexao is not None:
+                conexao.close()
+                raise RuntimeError(f"Já há um servidor em execução em {self.caminho}")
+            os.unlink(self.caminho)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        mascara = os.umask(0o077)
+        try:
+            self._socket.bind(self.caminho)
+        finally:
+            os.umask(mascara)
+        self._socket.listen()
+        self._socket.settimeout(INTERVALO_COLETA_S)
+
+    def _coletar_filhos(self):
+        """Recolhe os filhos já encerrados (evita processos zumbis)."""
+        for pid in list(self.filhos):
+            try:
+                encerrado, _ = os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                encerrado = pid
+            if encerrado:
+                self.filhos.discard(pid)
+
+    def servir(self):
+        """Aquece o processo e atende os clientes até receber a ação 'parar' ou SIGTERM."""
+        self.aquecer()
+        self._abrir_socket()
+        self.desde = time.time()
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        print(f"[lancador] Servidor quente em {self.caminho} (pid {os.getpid()}; importações "
+              f"{self.tempos['importacoes_s']:.2f} s, fontes {self.tempos['fontes_s']:.2f} s)", flush=True)
+        try:
+            while True:
+                self._coletar_filhos()
+                try:
+                    conexao, _ = self._socket.accept()
+                except socket.timeout:
+                    continue
+                with conexao:
+                    uid = _uid_do_par(conexao)
+                    if uid is not None and uid != os.getuid():
+                        continue  # Só atende o próprio usuário
+                    conexao.settimeout(None)
+                    if not self._atender(conexao):
+                        break
+        finally:
+            self._socket.close()
+            if os.path.exists(self.caminho):
+                os.unlink(self.caminho)
+
+    def _atender(self, conexao) -> bool:
+        """Atende um pedido; retorna False se o servidor deve parar."""
+        try:
+            pedido = _receber(conexao)
+        except (ConnectionError, ValueError):
+            return True
+        acao = pedido.get('acao')
+        if acao == 'status':
+            _enviar(conexao, {'pid': os.getpid(), 'socket': self.caminho, 'filhos': len(self.filhos),
+                              'desde': self.desde, **self.tempos})
+        elif acao == 'parar':
+            _enviar(conexao, {'parado': True})
+            return False
+        elif acao == 'executar' and pedido.get('comando') in VISUALIZACOES:
+            pid = os.fork()
+            if pid == 0:
+                self._executar_filho(conexao, pedido)  # Não retorna
+            self.filhos.add(pid)
+        else:
+            mensagem = f"Pedido inválido: {pedido!r}\n".encode('utf-8')
+            conexao.sendall(mensagem + MARCADOR_FIM + json.dumps({'codigo': 2}).encode('utf-8') + b'\n')
+        return True
+
+    def _executar_filho(self, conexao, pedido: dict):
+        """Executa o comando no processo filho, com a saída redirecionada à conexão."""
+        codigo = 1
+        try:
+            self._socket.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            os.chdir(pedido['cwd'])
+            os.environ.clear()
+            os.environ.update(pedido['env'])
+
+            descritor = conexao.fileno()
+            nulo = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(nulo, 0)
+            os.dup2(descritor, 1)
+            os.dup2(descritor, 2)
+            os.close(nulo)
+            sys.stdout = open(1, 'w', buffering=1, encoding='utf-8', closefd=False)
+            sys.stderr = open(2, 'w', buffering=1, encoding='utf-8', closefd=False)
+
+            import matplotlib
+            if os.environ.get('MPLBACKEND'):
+                matplotlib.use(os.environ['MPLBACKEND'])
+
+            from lancador.execucao import executar_visualizacao
+            codigo = executar_visualizacao(pedido['comando'], pedido.get('argv', []), pedido['inicio'],
+                                           quente=True, arquivo_tempos=pedido.get('arquivo_tempos'))
+        except BaseException:
+            traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os.write(1, MARCADOR_FIM + json.dumps({'codigo': codigo}).encode('utf-8') + b'\n')
+            finally:
+                os._exit(codigo)
+
+
+def executar_no_servidor(conexao, comando: str, argv, inicio: float, arquivo_tempos: str = None) -> int:
+    """
+    Pede a execução de um comando ao servidor quente e repassa a sua saída.
+
+    Parâmetros:
+    - conexao (socket.socket): Conexão obtida com `conectar`
+    - comando (str): Subcomando (chave de VISUALIZACOES)
+    - argv (list): Argumentos repassados ao script
+    - inicio (float): Instante do lançamento (time.time())
+    - arquivo_tempos (str): Arquivo JSON Lines das medidas de inicialização (opcional)
+
+    Retorna:
+    - int: Código de saída do comando
+    """
+    saida = sys.stdout.buffer
+    with conexao:
+        _enviar(conexao, {'acao': 'executar', 'comando': comando, 'argv': list(argv), 'cwd': os.getcwd(),
+                          'env': dict(os.environ), 'inicio': inicio,
+                          'arquivo_tempos': os.path.abspath(arquivo_tempos) if arquivo_tempos else None})
+        pendente = b''
+        while True:
+            bloco = conexao.recv(TAMANHO_BLOCO)
+            if not bloco:
+                saida.write(pendente)
+                saida.flush()
+                print("[lancador] O processo do comando terminou sem informar o código de saída", file=sys.stderr)
+                return 1
+            pendente += bloco
+            indice = pendente.find(MARCADOR_FIM)
+            if indice < 0:
+                # O fim do bloco pode ser o começo do marcador: ele fica pendente
+                seguro = len(pendente) - (len(MARCADOR_FIM) - 1)
+                if seguro > 0:
+                    saida.write(pendente[:seguro])
+                    pendente = pendente[seguro:]
+            else:
+                saida.write(pendente[:indice])
+                pendente = pendente[indice:]
+                if b'\n' in pendente:
+                    saida.flush()
+                    return json.loads(pendente[len(MARCADOR_FIM):pendente.index(b'\n')])['codigo']
+            saida.flush()
+
+
+def consultar(acao: str, caminho: str = None):
+    """
+    Envia 'status' ou 'parar' ao servidor quente.
+
+    Retorna:
+    - dict ou None: Resposta do servidor, ou None se não há servidor em execução
+    """
+    conexao = conectar(caminho)
+    if conexao is None:
+        return None
+    with conexao:
+        _enviar(conexao, {'acao': acao})
+        return _receber(conexao)
+
+
+def iniciar_em_segundo_plano(caminho: str = None) -> dict:
+    """
+    Inicia o servidor quente num processo separado e espera ele ficar pronto.
+
+    O servidor é iniciado sem MPLBACKEND, para que cada comando use o backend do
+    seu cliente; a sua saída vai para um arquivo de log ao lado do socket, criado
+    com permissão apenas para o usuário.
+
+    Retorna:
+    - dict: Status do servidor (ver `consultar`)
+    """
+    caminho = caminho or caminho_socket()
+    status = consultar('status', caminho)
+    if status is not None:
+        return status
+    ambiente = {chave: valor for chave, valor in os.environ.items() if chave != 'MPLBACKEND'}
+    ambiente[VARIAVEL_SOCKET] = caminho
+    descritor = os.open(caminho + '.log', os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    with open(descritor, 'a', encoding='utf-8') as log:
+        processo = subprocess.Popen([sys.executable, '-m', 'lancador', 'servidor', 'executar'], cwd=RAIZ,
+                                    env=ambiente, stdin=subprocess.DEVNULL, stdout=log, stderr=log,
+                                    start_new_session=True)
+    limite = time.monotonic() + ESPERA_INICIO_S
+    while time.monotonic() < limite:
+        if processo.poll() is not None:
+            raise RuntimeError(f"O servidor terminou ao iniciar (código {processo.returncode}); veja {caminho}.log")
+        status = consultar('status', caminho)
+        if status is not None:
+            return status
+        time.sleep(0.1)
+    raise TimeoutError(f"O servidor não ficou pronto em {ESPERA_INICIO_S:.0f} s; veja {caminho}.log")
@@ -0,0 +1,385 @@
+"""
+atlas.py
+--------
+Atlas de quadros pré-renderizados dos painéis 2D (PMF e MGF).
+
+Os sliders só assumem valores discretos (n de SLIDER_N_MIN a SLIDER_N_MAX e p
+de SLIDER_P_MIN a SLIDER_P_MAX, nos passos definidos em config.py). Cada estado
+(n, p) dos dois painéis 2D pode então ser renderizado com antecedência, em
+paralelo, e gravado como PNG. Durante a execução, a imagem do estado é apenas
+copiada para um eixo sobreposto aos painéis; estados ainda ausentes do cache são
+renderizados normalmente.
+
+Execute este arquivo para pré-renderizar o atlas:
+
+    python atlas.py
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import matplotlib
+import matplotlib.image as mpimg
+import matplotlib.pyplot as plt
+from matplotlib.artist import Artist
+from PIL import Image
+from plotting import plot_pmf_distributions, plot_mgf_distributions, inicializar_figura_eixos
+from config import (
+    NUM_SUCESSOS_INICIAL, PROBABILIDADE_INICIAL,
+    SLIDER_N_MIN, SLIDER_N_MAX, SLIDER_N_STEP,
+    SLIDER_P_MIN, SLIDER_P_MAX, SLIDER_P_STEP,
+    ATLAS_DIRETORIO, ATLAS_NUM_PROCESSOS, ATLAS_CACHE_MB
+)
+
+ATLAS_VERSAO = 2      # Incremente ao mudar a aparência dos painéis, para invalidar o cache
+ATLAS_Y_MIN = 0.12    # Base da região recortada, logo acima dos sliders (ver criar_sliders_controle)
+ATLAS_MARGEM_PT = 2   # Folga, em pontos, à direita do contorno do painel de MGF
+ESTADOS_POR_TAREFA = 50
+
+
+def estados_sliders():
+    """
+    Enumera todos os estados (n, p) alcançáveis pelos sliders.
+
+    Retorna:
+    - list: Pares (n, p), com p arredondado ao passo do slider
+    """
+    n_vals = np.arange(SLIDER_N_MIN, SLIDER_N_MAX + SLIDER_N_STEP / 2, SLIDER_N_STEP).astype(int)
+    p_vals = np.round(np.arange(SLIDER_P_MIN, SLIDER_P_MAX + SLIDER_P_STEP / 2, SLIDER_P_STEP), 2)
+    return [(int(n), float(p)) for n in n_vals for p in p_vals]
+
+
+def diretorio_atlas(fig) -> str:
+    """
+    Diretório do atlas para o tamanho em pixels da figura.
+
+    O nome inclui tudo o que muda a imagem renderizada (tamanho, dpi, LaTeX,
+    versão do matplotlib e do atlas), de modo que caches antigos nunca são usados.
+    O dpi é o da figura criada, sem a escala da tela: em telas HiDPI o canvas
+    multiplica fig.dpi pela razão de pixels do dispositivo, e o atlas (renderizado
+    em Agg, sem essa escala) não seria encontrado.
+
+    Parâmetros:
+    - fig (Figure): Figura do painel
+
+    Retorna:
+    - str: Caminho do diretório
+    """
+    dpi = getattr(fig, '_original_dpi', fig.dpi)
+    largura, altura = (fig.get_size_inches() * dpi).round().astype(int)
+    assinatura = f"{largura}x{altura}-{dpi:g}-{plt.rcParams['text.usetex']}-{matplotlib.__version__}-{ATLAS_VERSAO}"
+    resumo = hashlib.sha1(assinatura.encode()).hexdigest()[:10]
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), ATLAS_DIRETORIO)
+    return os.path.join(base, f"{largura}x{altura}-{resumo}")
+
+
+def caminho_quadro(diretorio: str, n: int, p: float) -> str:
+    """Arquivo PNG do estado (n, p) no atlas."""
+    return os.path.join(diretorio, f"n{n:03d}_p{int(round(p * 100)):03d}.png")
+
+
+def regiao_paineis(fig, ax_mgf) -> tuple:
+    """
+    Região da figura, em frações (x0, y0, x1, y1), que contém os dois painéis 2D
+    com seus títulos e rótulos.
+
+    À direita, a região termina no contorno do painel de MGF (get_tightbbox, com
+    os rótulos dos ticks), para que o eixo opaco do atlas não cubra o gráfico 3D.
+    Esse contorno não depende do estado (n, p): o intervalo de t é fixo e o eixo
+    y não tem rótulos.
+
+    Parâmetros:
+    - fig (Figure): Figura principal, com os painéis já plotados
+    - ax_mgf (Axes): Eixo do gráfico de MGFs (o painel 2D mais à direita)
+
+    Retorna:
+    - tuple: (x0, y0, x1, y1) em frações da figura
+    """
+    contorno = ax_mgf.get_tightbbox()
+    x1 = (contorno.x1 + ATLAS_MARGEM_PT * fig.dpi / 72) / fig.bbox.width
+    return 0.0, ATLAS_Y_MIN, float(min(x1, 1.0)), 1.0
+
+
+def pixels_regiao(largura: int, altura: int, regiao: tuple) -> tuple:
+    """
+    Linhas e colunas de pixels da região (em frações) num canvas de largura x altura.
+
+    Retorna:
+    - tuple: (linhas, colunas) como slices, com a linha 0 no topo
+    """
+    x0, y0, x1, y1 = regiao
+    linhas = slice(int(round((1 - y1) * altura)), int(round((1 - y0) * altura)))
+    colunas = slice(int(round(x0 * largura)), int(round(x1 * largura)))
+    return linhas, colunas
+
+
+def recortar_regiao(fig, regiao: tuple) -> np.ndarray:
+    """
+    Recorta a região (em frações da figura) do último desenho do canvas Agg.
+
+    Parâmetros:
+    - fig (Figure): Figura já desenhada
+    - regiao (tuple): (x0, y0, x1, y1) em frações da figura
+
+    Retorna:
+    - np.ndarray: Pixels RGB da região
+    """
+    pixels = np.asarray(fig.canvas.buffer_rgba())
+    linhas, colunas = pixels_regiao(pixels.shape[1], pixels.shape[0], regiao)
+    return pixels[linhas, colunas, :3].copy()
+
+
+# ==============================
+# PRÉ-RENDERIZAÇÃO (processos do pool)
+# ==============================
+
+_figura_trabalhador = None
+_regiao_trabalhador = None
+
+
+def _inicializar_trabalhador():
+    """Cria, uma vez por processo, a figura usada para renderizar os quadros e a região recortada."""
+    global _figura_trabalhador, _regiao_trabalhador
+    matplotlib.use('Agg', force=True)
+    _figura_trabalhador = fig, ax_pmf, ax_mgf, ax_3d = inicializar_figura_eixos()
+    # O gráfico 3D não faz parte do atlas
+    ax_3d.set_visible(False)
+    # A região é medida no estado inicial, como na interface (ver AtlasQuadros)
+    plot_pmf_distributions(ax_pmf, NUM_SUCESSOS_INICIAL, PROBABILIDADE_INICIAL)
+    plot_mgf_distributions(ax_mgf, NUM_SUCESSOS_INICIAL, PROBABILIDADE_INICIAL)
+    _regiao_trabalhador = regiao_paineis(fig, ax_mgf)
+
+
+def _renderizar_estados(estados, diretorio: str) -> int:
+    """Renderiza e grava os quadros dos estados que ainda não estão no atlas."""
+    fig, ax_pmf, ax_mgf, _ = _figura_trabalhador
+    regiao = _regiao_trabalhador
+    gravados = 0
+    for n, p in estados:
+        caminho = caminho_quadro(diretorio, n, p)
+        if os.path.exists(caminho):
+            continue
+        plot_pmf_distributions(ax_pmf, n, p)
+        plot_mgf_distributions(ax_mgf, n, p)
+        fig.canvas.draw()
+        # Grava num arquivo temporário e renomeia, para nunca deixar PNGs incompletos no cache
+        temporario = f"{caminho}.{os.getpid()}.tmp"
+        mpimg.imsave(temporario, recortar_regiao(fig, regiao), format='png', pil_kwargs={'optimize': True})
+        os.replace(temporario, caminho)
+        gravados += 1
+    return gravados
+
+
+def pre_renderizar_atlas(num_processos: int = ATLAS_NUM_PROCESSOS, progresso=None) -> str:
+    """
+    Renderiza todos os estados dos sliders que ainda não estão no atlas, em paralelo.
+
+    Parâmetros:
+    - num_processos (int): Processos do pool (None usa todos os núcleos)
+    - progresso (callable): Chamado como progresso(concluidos, total) após cada tarefa
+
+    Retorna:
+    - str: Diretório do atlas
+    """
+    fig, _, _, _ = inicializar_figura_eixos()
+    diretorio = diretorio_atlas(fig)
+    plt.close(fig)
+    os.makedirs(diretorio, exist_ok=True)
+
+    estados = [estado for estado in estados_sliders() if not os.path.exists(caminho_quadro(diretorio, *estado))]
+    tarefas = [estados[i:i + ESTADOS_POR_TAREFA] for i in range(0, len(estados), ESTADOS_POR_TAREFA)]
+    with ProcessPoolExecutor(max_workers=num_processos, initializer=_inicializar_trabalhador) as executor:
+        futuros = [executor.submit(_renderizar_estados, tarefa, diretorio) for tarefa in tarefas]
+        for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+            futuro.result()
+            if progresso is not None:
+                progresso(concluidos, len(futuros))
+    return diretorio
+
+
+# ==============================
+# EXIBIÇÃO (processo da interface)
+# ==============================
+
+class QuadroPixels(Artist):
+    """
+    Imagem RGBA uint8 copiada para o canvas em (ox, oy), em pixels a partir do
+    canto inferior esquerdo, sem reamostragem nem normalização (o caminho de
+    AxesImage/FigureImage reamostra a imagem inteira a cada desenho). Como em
+    renderer.draw_image, a primeira linha de `pixels` é a de baixo.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.pixels = None
+        self.ox = self.oy = 0
+
+    def set_data(self, pixels: np.ndarray, ox: int, oy: int):
+        self.pixels, self.ox, self.oy = pixels, ox, oy
+        self.stale = True
+
+    def draw(self, renderer):
+        if not self.get_visible() or self.pixels is None:
+            return
+        gc = renderer.new_gc()
+        renderer.draw_image(gc, self.ox, self.oy, self.pixels)
+        gc.restore()
+        self.stale = False
+
+
+class AtlasQuadros:
+    """
+    Exibe os painéis 2D a partir do atlas, quando o estado (n, p) está no cache.
+
+    Deve ser criado com os painéis já plotados no estado inicial, do qual é
+    medida a região coberta (ver `regiao_paineis`).
+
+    Um quadro do atlas é exibido por blit, sem redesenhar a figura (e o gráfico
+    3D): a cada desenho completo, o fundo da figura é guardado sem os artistas
+    que mudam com os sliders (o quadro, o ponto 3D e os valores dos sliders,
+    marcados como animated); em `desenhar`, o fundo é restaurado e só esses
+    artistas e os eixos dos sliders são desenhados por cima. O quadro já está no
+    tamanho em pixels da região e é copiado sem reamostragem (QuadroPixels). Os
+    sliders deixam de pedir um desenho completo a cada mudança (drawon=False):
+    no caminho ao vivo, quem o pede é `atualizar_graficos`.
+
+    Parâmetros:
+    - fig (Figure): Figura principal
+    - ax_pmf (Axes): Eixo do gráfico de PMFs
+    - ax_mgf (Axes): Eixo do gráfico de MGFs
+    - ponto (Line3D): Ponto do estado atual no gráfico 3D (opcional)
+    - sliders (tuple): Sliders de n e p (opcional)
+    - limite_mb (float): Memória máxima das imagens mantidas em memória, em MB
+    """
+
+    def __init__(self, fig, ax_pmf, ax_mgf, ponto=None, sliders=(), limite_mb: float = ATLAS_CACHE_MB):
+        self.fig = fig
+        self.eixos_ao_vivo = (ax_pmf, ax_mgf)
+        self.limite_bytes = int(limite_mb * 2 ** 20)
+        self.imagens = OrderedDict()
+        self.bytes_imagens = 0
+        self.diretorio = diretorio_atlas(fig)
+        self.regiao = regiao_paineis(fig, ax_mgf)
+        self._tamanho_atlas = tuple(fig.canvas.get_width_height())
+        self._tamanho_canvas = None  # Tamanho em pixels físicos para o qual os quadros em memória foram ajustados
+
+        self.imagem = fig.add_artist(QuadroPixels())
+        self.imagem.set_visible(False)
+
+        # Artistas redesenhados por blit sobre o fundo guardado em cada desenho completo
+        self.eixos_sliders = [slider.ax for slider in sliders]
+        self.dinamicos = ([ponto] if ponto is not None else []) + [slider.valtext for slider in sliders]
+        for artista in [self.imagem, *self.dinamicos]:
+            artista.set_animated(True)
+        for slider in sliders:
+            slider.drawon = False
+        self._fundo = None
+        fig.canvas.mpl_connect('draw_event', self._ao_desenhar)
+
+    def _carregar(self, n: int, p: float):
+        """
+        Lê a imagem do estado do disco (ou da memória), ou retorna None se ela não existe.
+
+        Os quadros ficam em RGBA uint8 (mpimg.imread devolveria float32, com 4x a
+        memória), já no tamanho em pixels físicos da região (maior em telas HiDPI),
+        e os menos usados recentemente são descartados acima de limite_bytes.
+        """
+        largura, altura = int(round(self.fig.bbox.width)), int(round(self.fig.bbox.height))
+        if self._tamanho_canvas != (largura, altura):
+            self._tamanho_canvas = (largura, altura)
+            self.imagens.clear()
+            self.bytes_imagens = 0
+        chave = (n, int(round(p * 100)))
+        if chave in self.imagens:
+            self.imagens.move_to_end(chave)
+            return self.imagens[chave]
+        caminho = caminho_quadro(self.diretorio, n, p)
+        if not os.path.exists(caminho):
+            return None
+        with Image.open(caminho) as arquivo:
+            imagem = np.array(arquivo.convert('RGBA'))  # Gravável: exigido por renderer.draw_image
+        linhas, colunas = pixels_regiao(largura, altura, self.regiao)
+        destino = (linhas.stop - linhas.start, colunas.stop - colunas.start)
+        if imagem.shape[:2] != destino:
+            # Vizinho mais próximo, uma única vez por quadro (telas HiDPI)
+            indices_l = np.arange(destino[0]) * imagem.shape[0] // destino[0]
+            indices_c = np.arange(destino[1]) * imagem.shape[1] // destino[1]
+            imagem = imagem[indices_l[:, None], indices_c]
+        imagem = np.ascontiguousarray(imagem[::-1])  # Linha de baixo primeiro (ver QuadroPixels)
+        self.imagens[chave] = imagem
+        self.bytes_imagens += imagem.nbytes
+        while self.bytes_imagens > self.limite_bytes and len(self.imagens) > 1:
+            _, descartada = self.imagens.popitem(last=False)
+            self.bytes_imagens -= descartada.nbytes
+        return imagem
+
+    def _alternar(self, usar_atlas: bool):
+        """Mostra o quadro do atlas e esconde os painéis ao vivo, ou o contrário."""
+        if usar_atlas and not self.imagem.get_visible():
+            self._fundo = None  # O fundo guardado ainda tem os painéis ao vivo sob a região
+        self.imagem.set_visible(usar_atlas)
+        for ax in self.eixos_ao_vivo:
+            ax.set_visible(not usar_atlas)
+        zoom = getattr(self.eixos_ao_vivo[1], 'ax_zoom', None)
+        if zoom is not None:
+            zoom.set_visible(not usar_atlas)
+
+    def _desenhar_dinamicos(self):
+        """Desenha os artistas animated (o quadro só se o atlas estiver em uso)."""
+        for artista in [self.imagem, *self.dinamicos]:
+            if artista.get_visible():
+                self.fig.draw_artist(artista)
+
+    def _ao_desenhar(self, evento):
+        """Guarda o fundo após cada desenho completo (inclusive ao redimensionar) e completa o quadro."""
+        canvas = self.fig.canvas
+        self._fundo = canvas.copy_from_bbox(self.fig.bbox) if getattr(canvas, 'supports_blit', False) else None
+        self._desenhar_dinamicos()
+
+    def mostrar(self, n: int, p: float) -> bool:
+        """
+        Prepara o quadro do estado (n, p), se ele estiver no atlas (a tela é
+        atualizada por `desenhar`).
+
+        Parâmetros:
+        - n (int): Número de sucessos
+        - p (float): Probabilidade de sucesso
+
+        Retorna:
+        - bool: True se o quadro veio do atlas; False se os painéis devem ser
+          renderizados ao vivo (estado ausente ou figura redimensionada)
+        """
+        imagem = None
+        if tuple(self.fig.canvas.get_width_height()) == self._tamanho_atlas:
+            imagem = self._carregar(n, p)
+        if imagem is None:
+            self._alternar(usar_atlas=False)
+            return False
+        linhas, colunas = pixels_regiao(*self._tamanho_canvas, self.regiao)
+        self.imagem.set_data(imagem, colunas.start, self._tamanho_canvas[1] - linhas.stop)
+        self._alternar(usar_atlas=True)
+        return True
+
+    def desenhar(self):
+        """
+        Atualiza a tela após `mostrar` (e após mover o ponto 3D): por blit, se há
+        um fundo guardado e o quadro veio do atlas; senão, com um desenho completo.
+        """
+        if self._fundo is None or not self.imagem.get_visible():
+            self.fig.canvas.draw_idle()
+            return
+        canvas = self.fig.canvas
+        canvas.restore_region(self._fundo)
+        for ax in self.eixos_sliders:
+            self.fig.draw_artist(ax)
+        self._desenhar_dinamicos()
+        canvas.blit(self.fig.bbox)
+
+
+if __name__ == "__main__":
+    diretorio = pre_renderizar_atlas(
+        progresso=lambda feitos, total: print(f"\rRenderizando atlas: {feitos}/{total} tarefas", end='', flush=True))
+    print(f"\nAtlas gravado em {diretorio}")
@@ -31,6 +31,7 @@ PMF_MARKER_SIZE = 3         # Tamanho do marcador para a Poisson
 # Configurações do gráfico de MGF
 MGF_T_RANGE = (-1, 1)  # Intervalo de t para a MGF
 MGF_T_POINTS = 100  # Número de pontos para a curva da MGF
+MGF_ZOOM_EPSILON = 0.05  # Meia-largura da vizinhança de t=0 exibida no zoom
 
 # Configurações do gráfico 3D
 SURFACE_ALPHA = 0.7  # Transparência da superfície
@@ -62,6 +63,41 @@ SLIDER_P_MAX = 1.0
 SLIDER_P_STEP = 0.01
 SLIDER_P_INIT = 0.5
 
+# ==============================
+# CÁLCULO PARALELO DA SUPERFÍCIE
+# ==============================
+
+# O caminho paralelo só compensa em grades grandes (centenas de valores de n) e com vários núcleos:
+# na grade padrão (49 x 50) o cálculo em série leva ~0,25 s, menos do que iniciar o pool de processos
+SUPERFICIE_NUM_PROCESSOS = 1         # Processos no cálculo da superfície (1 calcula no processo principal; None usa todos os núcleos)
+SUPERFICIE_TAMANHO_BLOCO = (10, 10)  # Tamanho dos blocos (linhas de p, colunas de n) distribuídos entre os processos
+SUPERFICIE_INTERVALO_PROGRESSO = 0.1 # Intervalo mínimo (s) entre redesenhos da superfície parcial (nunca menor que o último redesenho)
+
+# ==============================
+# CÁLCULO EM SEGUNDO PLANO
+# ==============================
+
+CALCULO_SEGUNDO_PLANO = 'thread'  # Onde os sliders calculam as curvas: 'thread', 'processo' ou None (no próprio callback)
+
+# ==============================
+# CONFIGURAÇÕES DO ATLAS DE QUADROS
+# ==============================
+
+ATLAS_ATIVO = False           # Exibe os painéis 2D a partir das imagens pré-renderizadas (python atlas.py)
+ATLAS_DIRETORIO = ".atlas"    # Diretório do cache de imagens (relativo a este arquivo)
+ATLAS_NUM_PROCESSOS = None    # Processos usados na pré-renderização (None usa todos os núcleos)
+ATLAS_CACHE_MB = 256          # Memória máxima das imagens mantidas durante a execução (~1,7 MB por quadro em 1500x500)
+
+# ==============================
+# REGIÃO DE TOLERÂNCIA DA APROXIMAÇÃO
+# ==============================
+
+TOLERANCIA_APROXIMACAO = None     # Erro máximo aceito; desenha a fronteira da região admissível no gráfico 3D (None não desenha)
+METRICA_TOLERANCIA = 'soma'       # Métrica do erro: 'soma' (altura da superfície), 'variacao_total' ou 'maximo'
+TOLERANCIA_XTOL_P = 1e-6          # Largura final do intervalo da bisseção em p
+TOLERANCIA_PONTOS_TABELA = 1025   # Valores de p da tabela usada nas consultas em lote
+COR_FRONTEIRA = 'crimson'         # Cor da fronteira da região admissível
+
 # ==============================
 # CONFIGURAÇÕES DOS MARCADORES
 # ==============================
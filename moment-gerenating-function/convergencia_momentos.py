@@ -0,0 +1,25 @@
+"""
+convergencia_momentos.py
+------------------------
+Extrai os momentos e cumulantes das distribuições Binomial e Poisson a partir
+das MGFs, valida os valores contra os momentos analíticos e plota a convergência
+dos momentos da Binomial(n, lambda/n) para os da Poisson(lambda).
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+from plotting import plot_convergencia_momentos
+from funcoes import gerar_matriz_parametros, erro_momentos_mgf
+from config import NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX, FIGURE_SIZE
+
+LAMBDA_CONVERGENCIA = 3.0  # lambda = n*p mantido fixo enquanto n cresce
+K_MAX_MOMENTOS = 4         # Ordem máxima dos momentos extraídos
+
+# Valida os momentos numéricos em toda a grade de parâmetros do painel 3D
+N, P, _ = gerar_matriz_parametros(NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX)
+print(f"Maior erro relativo dos momentos e cumulantes: {erro_momentos_mgf(N, P, K_MAX_MOMENTOS):.2e}")
+
+fig, ax = plt.subplots(figsize=(FIGURE_SIZE[0] / 2, FIGURE_SIZE[1]))
+n_vals = np.unique(np.geomspace(np.ceil(LAMBDA_CONVERGENCIA), 10_000, 200).astype(int))
+plot_convergencia_momentos(ax, LAMBDA_CONVERGENCIA, n_vals, K_MAX_MOMENTOS)
+plt.show()
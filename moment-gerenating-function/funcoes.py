@@ -3,14 +3,34 @@ funcoes.py
 -----------
 Módulo com funções auxiliares para cálculos estatísticos, incluindo:
 - Geração de grids de parâmetros para distribuições Binomial e Poisson
-- Cálculo das funções geradoras de momentos (MGFs)
+- Cálculo das funções geradoras de momentos (MGFs) e de cumulantes (log-MGFs)
+- Extração de momentos e cumulantes a partir das MGFs por diferenciação numérica
 - Cálculo da diferença entre funções de massa de probabilidade (PMFs)
 """
 
-
+import os
+import sys
 import numpy as np
 import scipy.stats as stats
-from config import PROBABILIDADE_MIN, PROBABILIDADE_MAX
+from scipy.special import comb, factorial
+from config import PROBABILIDADE_MIN, PROBABILIDADE_MAX, MGF_T_RANGE, MGF_T_POINTS, MGF_ZOOM_EPSILON
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Pacote comum do repositório
+from comum.precisao import na_precisao
+
+def eixos_parametros(n_min: int, n_max: int):
+    """
+    Retorna os valores de n e p que formam a malha de parâmetros.
+
+    Parâmetros:
+    - n_min (int): Número mínimo de sucessos
+    - n_max (int): Número máximo de sucessos (exclusivo)
+
+    Retorna:
+    - n_values (np.ndarray): Valores de n
+    - p_values (np.ndarray): Valores de p
+    """
+    return np.arange(n_min, n_max), np.linspace(PROBABILIDADE_MIN, PROBABILIDADE_MAX, 50)
 
 def gerar_matriz_parametros(n_min: int, n_max: int):
     """
@@ -24,12 +44,73 @@ def gerar_matriz_parametros(n_min: int, n_max: int):
     - N (np.ndarray): Matriz de sucessos
     - P (np.ndarray): Matriz de probabilidades
     - Z (np.ndarray): Diferença entre as PMFs Binomial e Poisson
+
+    As PMFs são calculadas em float64; P e Z são guardadas na precisão
+    configurada em comum.precisao (VIZ_PRECISAO), e N continua inteira.
     """
-    n_values = np.arange(n_min, n_max)
-    p_values = np.linspace(PROBABILIDADE_MIN, PROBABILIDADE_MAX, 50)
-    N, P = np.meshgrid(n_values, p_values)
+    N, P = np.meshgrid(*eixos_parametros(n_min, n_max))
     Z = calcular_diferenca_pmfs_matriz(N, P)  # Computa a diferença uma única vez
-    return N, P, Z  
+    P, Z = na_precisao(P, Z)
+    return N, P, Z
+
+def log_mgf_binomial(t: np.ndarray, n, p) -> np.ndarray:
+    """
+    Calcula a função geradora de cumulantes (log da MGF) da distribuição Binomial.
+
+    Usa n * log1p(p * expm1(t)) perto de t=0, onde a forma direta perde precisão,
+    e n * logaddexp(log(1-p), log(p) + t) para |t| grande, onde exp(t) estoura.
+    Os argumentos são combinados por broadcasting, de modo que t, n e p podem ser
+    grades (ex.: t[:, None, None], n[None, :, None], p[None, None, :]).
+
+    Parâmetros:
+    - t (np.ndarray): Valores da variável t
+    - n (int ou np.ndarray): Número de sucessos
+    - p (float ou np.ndarray): Probabilidade de sucesso
+
+    Retorna:
+    - np.ndarray: Valores de log M(t)
+    """
+    n = np.asarray(n, dtype=float)
+    p = np.asarray(p, dtype=float)
+    if np.iscomplexobj(t):
+        # Para t complexo (ver `derivadas_na_origem`) só a forma com log1p/expm1 está definida
+        return n * np.log1p(p * np.expm1(t))
+    t, n, p = np.broadcast_arrays(np.asarray(t, dtype=float), n, p)
+    with np.errstate(divide='ignore', over='ignore', invalid='ignore'):
+        perto_de_zero = n * np.log1p(p * np.expm1(t))
+        longe_de_zero = n * np.logaddexp(np.log1p(-p), np.log(p) + t)
+    return np.where(np.abs(t) < 1, perto_de_zero, longe_de_zero)
+
+def log_mgf_poisson(t: np.ndarray, lambda_poisson) -> np.ndarray:
+    """
+    Calcula a função geradora de cumulantes (log da MGF) da distribuição de Poisson.
+
+    Parâmetros:
+    - t (np.ndarray): Valores da variável t
+    - lambda_poisson (float ou np.ndarray): Parâmetro lambda da distribuição de Poisson
+
+    Retorna:
+    - np.ndarray: Valores de log M(t) = lambda * (e^t - 1)
+    """
+    return np.asarray(lambda_poisson, dtype=float) * np.expm1(t)
+
+def grade_log_mgf(t_vals: np.ndarray, n_vals: np.ndarray, p_vals: np.ndarray):
+    """
+    Calcula as log-MGFs Binomial e Poisson (lambda = n*p) em toda a grade (t, n, p).
+
+    Parâmetros:
+    - t_vals (np.ndarray): Valores da variável t
+    - n_vals (np.ndarray): Valores de n
+    - p_vals (np.ndarray): Valores de p
+
+    Retorna:
+    - log_binom (np.ndarray): log-MGF Binomial, com formato (t, n, p)
+    - log_poisson (np.ndarray): log-MGF Poisson, com formato (t, n, p)
+    """
+    t = np.asarray(t_vals, dtype=float)[:, None, None]
+    n = np.asarray(n_vals, dtype=float)[None, :, None]
+    p = np.asarray(p_vals, dtype=float)[None, None, :]
+    return log_mgf_binomial(t, n, p), log_mgf_poisson(t, n * p)
 
 def mgf_binomial(t: np.ndarray, n: int, p: float) -> np.ndarray:
     """
@@ -43,7 +124,7 @@ def mgf_binomial(t: np.ndarray, n: int, p: float) -> np.ndarray:
     Retorna:
     - np.ndarray: Valores da MGF
     """
-    return (p * np.exp(t) + (1 - p)) ** n
+    return np.exp(log_mgf_binomial(t, n, p))
 
 def mgf_poisson(t: np.ndarray, lambda_poisson: float) -> np.ndarray:
     """
@@ -56,7 +137,161 @@ def mgf_poisson(t: np.ndarray, lambda_poisson: float) -> np.ndarray:
     Retorna:
     - np.ndarray: Valores da MGF
     """
-    return np.exp(lambda_poisson * (np.exp(t) - 1))
+    return np.exp(log_mgf_poisson(t, lambda_poisson))
+
+def derivadas_na_origem(funcao, k_max: int, raio=1.0, num_pontos: int = None) -> np.ndarray:
+    """
+    Calcula as derivadas f^(k)(0), k = 0..k_max, de uma função analítica pela
+    fórmula integral de Cauchy (generalização do passo complexo).
+
+    A função é avaliada uma única vez em num_pontos valores complexos
+    t = raio * exp(2*pi*i*j/num_pontos) e a FFT desses valores fornece os
+    coeficientes de Taylor. Sem subtrações entre valores próximos, o erro de
+    arredondamento não explode como nas diferenças finitas reais.
+
+    Parâmetros:
+    - funcao (callable): Função de t complexo, com formato (num_pontos, *lote) ou broadcast para ele
+    - k_max (int): Ordem máxima da derivada
+    - raio (float ou np.ndarray): Raio do círculo em torno de t=0, por elemento do lote.
+      Deve ficar dentro do raio de convergência e ser da ordem de k_max / escala de X
+    - num_pontos (int): Pontos no círculo. Se None, usa 4*(k_max+1), no mínimo 32
+
+    Retorna:
+    - np.ndarray: Derivadas, com formato (k_max+1, *lote)
+    """
+    if num_pontos is None:
+        num_pontos = max(32, 4 * (k_max + 1))
+    raio = np.asarray(raio, dtype=float)
+    angulos = np.exp(2j * np.pi * np.arange(num_pontos) / num_pontos)
+    t = raio[None, ...] * angulos.reshape((num_pontos,) + (1,) * raio.ndim)
+
+    valores = np.asarray(funcao(t))
+    coeficientes = np.fft.fft(valores, axis=0)[:k_max + 1] / num_pontos
+    ordens = np.arange(k_max + 1).reshape((k_max + 1,) + (1,) * (valores.ndim - 1))
+    return (coeficientes / raio[None, ...] ** ordens).real * factorial(ordens)
+
+def _raio_momentos(k_max: int, media: np.ndarray, desvio: np.ndarray) -> np.ndarray:
+    """Raio do círculo de Cauchy proporcional a 1/escala de X (e no máximo 1, longe das singularidades)."""
+    return np.minimum(1.0, k_max / (media + 3 * desvio + 1))
+
+def momentos_cumulantes_mgf(n, p, k_max: int = 4) -> dict:
+    """
+    Extrai os k_max primeiros momentos e cumulantes das distribuições Binomial(n, p)
+    e Poisson(n*p) a partir das MGFs, num único lote para toda a grade (n, p).
+
+    Os momentos vêm das derivadas de `mgf_binomial`/`mgf_poisson` em t=0 e os
+    cumulantes das derivadas de `log_mgf_binomial`/`log_mgf_poisson`.
+
+    Parâmetros:
+    - n (int ou np.ndarray): Valores de n (ex.: a matriz N de `gerar_matriz_parametros`)
+    - p (float ou np.ndarray): Valores de p, combinados com n por broadcasting
+    - k_max (int): Ordem máxima dos momentos e cumulantes
+
+    Retorna:
+    - dict: {'binomial': (momentos, cumulantes), 'poisson': (momentos, cumulantes)},
+      cada um com formato (k_max+1, *lote); o índice 0 é a ordem zero
+    """
+    n, p = np.broadcast_arrays(np.asarray(n, dtype=float), np.asarray(p, dtype=float))
+    lambda_poisson = n * p
+
+    raio_binom = _raio_momentos(k_max, lambda_poisson, np.sqrt(lambda_poisson * (1 - p)))
+    raio_poisson = _raio_momentos(k_max, lambda_poisson, np.sqrt(lambda_poisson))
+    # Os cumulantes crescem só linearmente em n: raio fixo dentro da faixa analítica do log
+    raio_cumulantes = np.ones_like(n)
+
+    return {
+        'binomial': (derivadas_na_origem(lambda t: mgf_binomial(t, n, p), k_max, raio_binom),
+                     derivadas_na_origem(lambda t: log_mgf_binomial(t, n, p), k_max, raio_cumulantes)),
+        'poisson': (derivadas_na_origem(lambda t: mgf_poisson(t, lambda_poisson), k_max, raio_poisson),
+                    derivadas_na_origem(lambda t: log_mgf_poisson(t, lambda_poisson), k_max, raio_cumulantes)),
+    }
+
+def cumulantes_analiticos_binomial(n, p, k_max: int = 4) -> np.ndarray:
+    """
+    Calcula os cumulantes exatos da Binomial(n, p) pela recorrência
+    kappa_{k+1} = p(1-p) d(kappa_k)/dp, com kappa_1 = n*p.
+
+    Parâmetros:
+    - n (int ou np.ndarray): Número de sucessos
+    - p (float ou np.ndarray): Probabilidade de sucesso
+    - k_max (int): Ordem máxima dos cumulantes
+
+    Retorna:
+    - np.ndarray: Cumulantes, com formato (k_max+1, *lote); o índice 0 vale zero
+    """
+    n, p = np.broadcast_arrays(np.asarray(n, dtype=float), np.asarray(p, dtype=float))
+    cumulantes = np.zeros((k_max + 1,) + n.shape)
+    polinomio = np.polynomial.Polynomial([0, 1])  # kappa_1 / n = p
+    p_vezes_q = np.polynomial.Polynomial([0, 1, -1])
+    for k in range(1, k_max + 1):
+        cumulantes[k] = n * polinomio(p)
+        polinomio = p_vezes_q * polinomio.deriv()
+    return cumulantes
+
+def cumulantes_analiticos_poisson(lambda_poisson, k_max: int = 4) -> np.ndarray:
+    """
+    Calcula os cumulantes exatos da Poisson(lambda), todos iguais a lambda.
+
+    Parâmetros:
+    - lambda_poisson (float ou np.ndarray): Parâmetro lambda da distribuição de Poisson
+    - k_max (int): Ordem máxima dos cumulantes
+
+    Retorna:
+    - np.ndarray: Cumulantes, com formato (k_max+1, *lote); o índice 0 vale zero
+    """
+    lambda_poisson = np.asarray(lambda_poisson, dtype=float)
+    cumulantes = np.broadcast_to(lambda_poisson, (k_max + 1,) + lambda_poisson.shape).copy()
+    cumulantes[0] = 0
+    return cumulantes
+
+def momentos_de_cumulantes(cumulantes: np.ndarray) -> np.ndarray:
+    """
+    Converte cumulantes em momentos brutos: m_k = sum_j C(k-1, j-1) kappa_j m_{k-j}.
+
+    Parâmetros:
+    - cumulantes (np.ndarray): Cumulantes, com formato (k_max+1, *lote)
+
+    Retorna:
+    - np.ndarray: Momentos brutos, com o mesmo formato; o índice 0 vale um
+    """
+    momentos = np.zeros_like(cumulantes)
+    momentos[0] = 1
+    for k in range(1, cumulantes.shape[0]):
+        j = np.arange(1, k + 1)
+        pesos = comb(k - 1, j - 1).reshape((k,) + (1,) * (cumulantes.ndim - 1))
+        momentos[k] = np.sum(pesos * cumulantes[1:k + 1] * momentos[k - 1::-1][:k], axis=0)
+    return momentos
+
+def erro_momentos_mgf(n, p, k_max: int = 4) -> float:
+    """
+    Compara os momentos e cumulantes extraídos das MGFs com os valores analíticos.
+
+    O erro de cada ordem k é relativo ao maior entre |valor exato| e a escala
+    max(sigma, 1)^k, para não dividir por cumulantes nulos (ex.: kappa_3 com p=0.5).
+
+    Parâmetros:
+    - n (int ou np.ndarray): Valores de n
+    - p (float ou np.ndarray): Valores de p
+    - k_max (int): Ordem máxima dos momentos e cumulantes
+
+    Retorna:
+    - float: Maior erro relativo encontrado em toda a grade
+    """
+    n, p = np.broadcast_arrays(np.asarray(n, dtype=float), np.asarray(p, dtype=float))
+    numericos = momentos_cumulantes_mgf(n, p, k_max)
+    exatos = {'binomial': cumulantes_analiticos_binomial(n, p, k_max),
+              'poisson': cumulantes_analiticos_poisson(n * p, k_max)}
+
+    ordens = np.arange(1, k_max + 1).reshape((k_max,) + (1,) * n.ndim)
+    erro = 0.0
+    for distribuicao, cumulantes_exatos in exatos.items():
+        momentos_num, cumulantes_num = numericos[distribuicao]
+        escala = np.maximum(np.sqrt(cumulantes_exatos[2]), 1) ** ordens
+        for numerico, exato in ((momentos_num, momentos_de_cumulantes(cumulantes_exatos)),
+                                (cumulantes_num, cumulantes_exatos)):
+            referencia = np.maximum(np.abs(exato[1:]), escala)
+            erro = max(erro, float(np.max(np.abs(numerico[1:] - exato[1:]) / referencia)))
+    return erro
 
 def pmf_difference(n: int, p: float):
     """
@@ -111,3 +346,31 @@ def calcular_pmfs(n: int, p: float):
     poisson_lambda = n * p
     poisson_pmf = stats.poisson.pmf(sucessos, poisson_lambda)
     return sucessos, binom_pmf, poisson_pmf
+
+def calcular_distribuicoes(n: int, p: float) -> dict:
+    """
+    Calcula todas as curvas exibidas pelos painéis para um estado (n, p) dos sliders,
+    sem tocar em nenhum artista (pode rodar fora da thread da interface).
+
+    Parâmetros:
+    - n (int): Número de sucessos
+    - p (float): Probabilidade de sucesso
+
+    Retorna:
+    - dict: Parâmetros 'n', 'p' e 'lambda'; PMFs 'sucessos', 'pmf_binomial' e
+      'pmf_poisson'; MGFs 't', 'mgf_binomial' e 'mgf_poisson'; zoom em t=0
+      't_zoom', 'mgf_binomial_zoom' e 'mgf_poisson_zoom'; e 'erro', a diferença
+      agregada entre as PMFs (altura do ponto no gráfico 3D)
+    """
+    sucessos, binom_pmf, poisson_pmf = calcular_pmfs(n, p)
+    poisson_lambda = n * p
+    t_vals = np.linspace(MGF_T_RANGE[0], MGF_T_RANGE[1], MGF_T_POINTS)
+    zoom_t_vals = np.linspace(-MGF_ZOOM_EPSILON, MGF_ZOOM_EPSILON, MGF_T_POINTS)
+    return {
+        'n': n, 'p': p, 'lambda': poisson_lambda,
+        'sucessos': sucessos, 'pmf_binomial': binom_pmf, 'pmf_poisson': poisson_pmf,
+        't': t_vals, 'mgf_binomial': mgf_binomial(t_vals, n, p), 'mgf_poisson': mgf_poisson(t_vals, poisson_lambda),
+        't_zoom': zoom_t_vals, 'mgf_binomial_zoom': mgf_binomial(zoom_t_vals, n, p),
+        'mgf_poisson_zoom': mgf_poisson(zoom_t_vals, poisson_lambda),
+        'erro': np.sum(binom_pmf - poisson_pmf),
+    }
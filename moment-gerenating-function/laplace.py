@@ -0,0 +1,160 @@
+"""
+laplace.py
+----------
+Módulo com o cálculo e o desenho dos cortes da transformada de Laplace usados
+no notebook mgf-as-laplace-transformation, incluindo:
+- Matriz (cortes x s) das exponenciais ponderadas pela densidade, numa única operação
+- Transformada de Laplace por quadratura (trapézio ou Simpson) para densidades arbitrárias
+- Desenho de todos os cortes como uma única Line3DCollection (ou LineCollection, em 2D)
+"""
+
+import numpy as np
+import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
+from matplotlib.collections import LineCollection
+from mpl_toolkits.mplot3d.art3d import Line3DCollection
+from scipy.integrate import simpson, trapezoid
+
+MAX_ELEMENTOS_BLOCO = 4_000_000  # Elementos da matriz x-s avaliados de cada vez na quadratura
+
+
+def _avaliar_densidade(densidade, x: np.ndarray) -> np.ndarray:
+    """Avalia a densidade em x se ela for uma função; caso contrário, usa os valores dados."""
+    valores = densidade(x) if callable(densidade) else np.asarray(densidade, dtype=float)
+    if valores.shape != x.shape:
+        raise ValueError(f"A densidade tem formato {valores.shape}, mas x tem formato {x.shape}")
+    return valores
+
+
+def matriz_exponencial_ponderada(cortes: np.ndarray, s: np.ndarray, densidade) -> np.ndarray:
+    """
+    Calcula as exponenciais ponderadas exp(-s*x) * f(x) de todos os cortes de uma vez.
+
+    Parâmetros:
+    - cortes (np.ndarray): Posições x dos cortes
+    - s (np.ndarray): Valores da variável s
+    - densidade (callable ou np.ndarray): Função f(x) ou seus valores em `cortes`
+
+    Retorna:
+    - np.ndarray: Matriz (cortes x s), cuja linha i é exp(-s*cortes[i]) * f(cortes[i])
+    """
+    cortes = np.asarray(cortes, dtype=float)
+    s = np.asarray(s, dtype=float)
+    pesos = _avaliar_densidade(densidade, cortes)
+    return np.exp(-np.multiply.outer(cortes, s)) * pesos[:, None]
+
+
+def transformada_laplace(x: np.ndarray, s: np.ndarray, densidade, metodo: str = 'simpson') -> np.ndarray:
+    """
+    Calcula a transformada de Laplace F(s) = ∫ exp(-s*x) f(x) dx por quadratura.
+
+    A integral em x é feita sobre a matriz de exponenciais ponderadas, em blocos
+    de valores de s para que grades densas de s não estourem a memória.
+    Note que M(t) = F(-t) é a função geradora de momentos.
+
+    Parâmetros:
+    - x (np.ndarray): Pontos de integração (crescentes) cobrindo o suporte da densidade
+    - s (np.ndarray): Valores da variável s
+    - densidade (callable ou np.ndarray): Função f(x) ou seus valores em `x`
+    - metodo (str): 'simpson' ou 'trapezio'
+
+    Retorna:
+    - np.ndarray: Valores de F(s)
+    """
+    regras = {'simpson': simpson, 'trapezio': trapezoid}
+    if metodo not in regras:
+        raise ValueError(f"Método de quadratura desconhecido: {metodo!r} (use {sorted(regras)})")
+    integrar = regras[metodo]
+
+    x = np.asarray(x, dtype=float)
+    s = np.asarray(s, dtype=float)
+    valores_densidade = _avaliar_densidade(densidade, x)
+
+    transformada = np.empty(s.shape)
+    colunas = max(1, MAX_ELEMENTOS_BLOCO // x.size)
+    for inicio in range(0, s.size, colunas):
+        bloco = s[inicio:inicio + colunas]
+        integrando = matriz_exponencial_ponderada(x, bloco, valores_densidade)
+        transformada[inicio:inicio + colunas] = integrar(integrando, x=x, axis=0)
+    return transformada
+
+
+def segmentos_cortes(cortes: np.ndarray, s: np.ndarray, matriz: np.ndarray, projetar: bool = False) -> np.ndarray:
+    """
+    Monta os vértices (cortes x s x 3) de cada curva para uma Line3DCollection.
+
+    Parâmetros:
+    - cortes (np.ndarray): Posições x dos cortes
+    - s (np.ndarray): Valores da variável s
+    - matriz (np.ndarray): Exponenciais ponderadas (ver `matriz_exponencial_ponderada`)
+    - projetar (bool): Se True, todas as curvas são colocadas no plano x=0
+
+    Retorna:
+    - np.ndarray: Vértices (x, s, z) de cada curva
+    """
+    segmentos = np.empty(matriz.shape + (3,))
+    segmentos[..., 0] = 0.0 if projetar else np.asarray(cortes)[:, None]
+    segmentos[..., 1] = s
+    segmentos[..., 2] = matriz
+    return segmentos
+
+
+def _cores_pesos(pesos: np.ndarray, cmap):
+    """Normaliza os pesos e retorna as cores de cada corte e o ScalarMappable da barra de cores."""
+    norm_pesos = mcolors.Normalize(vmin=np.min(pesos), vmax=np.max(pesos))
+    sm = plt.cm.ScalarMappable(cmap=cmap, norm=norm_pesos)
+    sm.set_array([])
+    return cmap(norm_pesos(pesos)), sm
+
+
+def plot_cortes_laplace_3d(ax_3d, cortes: np.ndarray, s: np.ndarray, matriz: np.ndarray, pesos: np.ndarray,
+                           cmap=plt.cm.plasma_r, alpha: float = 0.3, projetar: bool = True):
+    """
+    Desenha todos os cortes exp(-s*x) * f(x) como uma única Line3DCollection.
+
+    Parâmetros:
+    - ax_3d (Axes3D): Eixo do gráfico 3D
+    - cortes (np.ndarray): Posições x dos cortes
+    - s (np.ndarray): Valores da variável s
+    - matriz (np.ndarray): Exponenciais ponderadas (ver `matriz_exponencial_ponderada`)
+    - pesos (np.ndarray): Pesos f(x) de cada corte, usados para colorir as curvas
+    - cmap (Colormap): Mapa de cores dos pesos
+    - alpha (float): Transparência das curvas
+    - projetar (bool): Se True, desenha também a projeção das curvas no plano x=0
+
+    Retorna:
+    - ScalarMappable: Mapeamento de cores dos pesos, para criar a barra de cores
+    """
+    cores, sm = _cores_pesos(pesos, cmap)
+
+    segmentos = segmentos_cortes(cortes, s, matriz)
+    ax_3d.add_collection3d(Line3DCollection(segmentos, colors=cores, alpha=alpha))
+    if projetar:
+        ax_3d.add_collection3d(Line3DCollection(segmentos_cortes(cortes, s, matriz, projetar=True),
+                                                colors=cores, alpha=alpha, linewidths=1))
+    # Coleções não ajustam os limites dos eixos como ax.plot
+    ax_3d.auto_scale_xyz(segmentos[..., 0], segmentos[..., 1], segmentos[..., 2], had_data=ax_3d.has_data())
+    return sm
+
+
+def plot_cortes_laplace_2d(ax, s: np.ndarray, matriz: np.ndarray, pesos: np.ndarray,
+                           cmap=plt.cm.plasma_r, alpha: float = 0.3):
+    """
+    Desenha as curvas exp(-s*x) * f(x) de todos os cortes, em função de s, como uma única LineCollection.
+
+    Parâmetros:
+    - ax (Axes): Eixo do gráfico
+    - s (np.ndarray): Valores da variável s
+    - matriz (np.ndarray): Exponenciais ponderadas (ver `matriz_exponencial_ponderada`)
+    - pesos (np.ndarray): Pesos f(x) de cada corte, usados para colorir as curvas
+    - cmap (Colormap): Mapa de cores dos pesos
+    - alpha (float): Transparência das curvas
+
+    Retorna:
+    - ScalarMappable: Mapeamento de cores dos pesos, para criar a barra de cores
+    """
+    cores, sm = _cores_pesos(pesos, cmap)
+    segmentos = np.stack(np.broadcast_arrays(s, matriz), axis=-1)
+    ax.add_collection(LineCollection(segmentos, colors=cores, alpha=alpha, linewidths=1))
+    ax.autoscale_view()
+    return sm
@@ -5,31 +5,102 @@ Arquivo principal que inicializa o programa, cria a figura e gerencia as atualiz
 dos gráficos conforme os valores dos sliders são alterados.
 """
 
+import os
+import sys
+import time
 import numpy as np
 import matplotlib.pyplot as plt
-from plotting import plot_distribuicoes, plot_diferenca_pmf_surface, configurar_estetica_3d, inicializar_figura_eixos
-from funcoes import gerar_matriz_parametros
-from sliders import criar_sliders_controle, atualizar_graficos
-from config import NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX, NUM_SUCESSOS_INICIAL, PROBABILIDADE_INICIAL, TAM_MARKER
+from plotting import plot_distribuicoes, plot_diferenca_pmf_surface, plot_fronteira_tolerancia_3d, configurar_estetica_3d, inicializar_figura_eixos
+from funcoes import gerar_matriz_parametros, calcular_distribuicoes
+from superficie_paralela import gerar_matriz_parametros_paralelo
+from sliders import criar_sliders_controle, atualizar_graficos, aplicar_distribuicoes
+from atlas import AtlasQuadros
+from regiao_tolerancia import RegiaoTolerancia
+from config import NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX, NUM_SUCESSOS_INICIAL, PROBABILIDADE_INICIAL, TAM_MARKER, ATLAS_ATIVO, SUPERFICIE_NUM_PROCESSOS, SUPERFICIE_INTERVALO_PROGRESSO, CALCULO_SEGUNDO_PLANO, TOLERANCIA_APROXIMACAO, METRICA_TOLERANCIA
 
-# Gera a matriz de sucessos e probabilidades
-N, P, Z = gerar_matriz_parametros(NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Pacote comum do repositório
+from comum.perfil import instrumentar
+from comum.trabalhador import TrabalhadorCalculo
 
-# Cria a figura e os eixos
-fig, ax_pmf, ax_mgf, ax_diff = inicializar_figura_eixos()
 
-# Adiciona a superfície da diferença entre as PMFs
-plot_diferenca_pmf_surface(ax_diff, N, P, Z)
-point, = ax_diff.plot([], [], [], 'ko', ms=TAM_MARKER)
+def criar_interface():
+    """
+    Cria a figura, calcula a superfície de erro e conecta os sliders aos gráficos.
 
-# Plota os gráficos iniciais das distribuições e das MGFs
-configurar_estetica_3d(ax_diff)
-plot_distribuicoes(ax_pmf, ax_mgf, NUM_SUCESSOS_INICIAL, PROBABILIDADE_INICIAL)
+    Retorna:
+    - fig (Figure): Figura principal
+    - slider_n (Slider): Slider do número de sucessos
+    - slider_p (Slider): Slider da probabilidade de sucesso
+    """
+    # Cria a figura e os eixos
+    fig, ax_pmf, ax_mgf, ax_diff = inicializar_figura_eixos()
 
-# Configura os sliders para controle dos parâmetros
-slider_n, slider_p = criar_sliders_controle(fig)
-slider_n.on_changed(lambda val: atualizar_graficos(val, slider_n, slider_p, ax_pmf, ax_mgf, ax_diff, fig, point))
-slider_p.on_changed(lambda val: atualizar_graficos(val, slider_n, slider_p, ax_pmf, ax_mgf, ax_diff, fig, point))
+    # Cada redesenho refaz a superfície inteira: o progresso é exibido no máximo a cada
+    # SUPERFICIE_INTERVALO_PROGRESSO segundos, e nunca antes de passar o tempo do último
+    # redesenho (que ocupa então no máximo metade do cálculo)
+    proximo_desenho = time.perf_counter() + SUPERFICIE_INTERVALO_PROGRESSO
 
-# Exibe a interface gráfica
-plt.show()
\ No newline at end of file
+    def exibir_superficie_parcial(N, P, Z_parcial, concluidos, total):
+        """Redesenha a superfície com os blocos já calculados pelo backend paralelo."""
+        nonlocal proximo_desenho
+        inicio = time.perf_counter()
+        if concluidos == total or inicio < proximo_desenho:
+            return  # A superfície completa é desenhada logo em seguida
+        plot_diferenca_pmf_surface(ax_diff, N, P, Z_parcial)
+        ax_diff.set_title(f"Erro entre as PMFs ({concluidos}/{total} blocos)")
+        plt.pause(0.001)
+        fim = time.perf_counter()
+        proximo_desenho = fim + max(SUPERFICIE_INTERVALO_PROGRESSO, fim - inicio)
+
+    # Gera a matriz de sucessos e probabilidades
+    if SUPERFICIE_NUM_PROCESSOS == 1:
+        N, P, Z = gerar_matriz_parametros(NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX)
+    else:
+        N, P, Z = gerar_matriz_parametros_paralelo(NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX, progresso=exibir_superficie_parcial)
+
+    # Adiciona a superfície da diferença entre as PMFs
+    plot_diferenca_pmf_surface(ax_diff, N, P, Z)
+    point, = ax_diff.plot([], [], [], 'ko', ms=TAM_MARKER)
+
+    # Fronteira da região em que a aproximação de Poisson fica dentro da tolerância
+    if TOLERANCIA_APROXIMACAO is not None:
+        regiao = RegiaoTolerancia(METRICA_TOLERANCIA, N, P)
+        plot_fronteira_tolerancia_3d(ax_diff, regiao.fronteira(TOLERANCIA_APROXIMACAO))
+
+    # Plota os gráficos iniciais das distribuições e das MGFs
+    configurar_estetica_3d(ax_diff)
+    plot_distribuicoes(ax_pmf, ax_mgf, NUM_SUCESSOS_INICIAL, PROBABILIDADE_INICIAL)
+
+    # Cálculo das curvas fora da thread da interface, descartando valores já superados pelos sliders
+    trabalhador = TrabalhadorCalculo(fig, calcular_distribuicoes,
+                                     lambda dados: aplicar_distribuicoes(dados, ax_pmf, ax_mgf, fig, point),
+                                     modo=CALCULO_SEGUNDO_PLANO)
+
+    # Configura os sliders para controle dos parâmetros
+    # (com VIZ_PERFIL=1, o cálculo no trabalhador, a aplicação e os desenhos são medidos e
+    # exibidos num HUD; o callback, que só submete o pedido, aparece apenas no trace)
+    slider_n, slider_p = criar_sliders_controle(fig)
+    atualizar = instrumentar(fig, atualizar_graficos, categoria='callback')
+
+    # Atlas de quadros pré-renderizados dos painéis 2D (gerado com `python atlas.py`);
+    # exibidos por blit, com o ponto 3D e os sliders
+    atlas = AtlasQuadros(fig, ax_pmf, ax_mgf, point, (slider_n, slider_p)) if ATLAS_ATIVO else None
+
+    slider_n.on_changed(lambda val: atualizar(val, slider_n, slider_p, ax_pmf, ax_mgf, ax_diff, fig, point, atlas, trabalhador))
+    slider_p.on_changed(lambda val: atualizar(val, slider_n, slider_p, ax_pmf, ax_mgf, ax_diff, fig, point, atlas, trabalhador))
+
+    return fig, slider_n, slider_p
+
+
+def main():
+    # As referências aos sliders mantêm os seus callbacks vivos enquanto a janela está aberta
+    fig, slider_n, slider_p = criar_interface()
+
+    # Exibe a interface gráfica
+    plt.show()
+
+
+# Com o método de início 'spawn' (Windows, macOS), os processos do cálculo paralelo da
+# superfície reimportam este arquivo como __mp_main__ e não devem recriar a interface
+if __name__ == "__main__":
+    main()
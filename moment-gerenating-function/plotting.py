@@ -2,28 +2,37 @@
 plotting.py
 -----------
 Módulo responsável por gerar os gráficos das distribuições Binomial e Poisson,
-assim como a diferença entre suas PMFs em um gráfico 3D.
+assim como a diferença entre suas PMFs em um gráfico 3D e a convergência dos
+seus momentos.
 """
 
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 import scipy.stats as stats
-from funcoes import mgf_binomial, mgf_poisson
+from funcoes import momentos_cumulantes_mgf, calcular_distribuicoes
+from regiao_tolerancia import erro_aproximacao
 from mpl_toolkits.axes_grid1.inset_locator import inset_axes, mark_inset
 from config import (
     FIGURE_SIZE, SUBPLOT_BOTTOM_ADJUST,
     PMF_Y_LIM, PMF_BAR_ALPHA, PMF_LINESTYLE, PMF_MARKER_SIZE,
-    MGF_T_RANGE, MGF_T_POINTS,
-    SURFACE_ALPHA, GRID_LINEWIDTH, COLORMAP
+    MGF_ZOOM_EPSILON,
+    SURFACE_ALPHA, GRID_LINEWIDTH, COLORMAP,
+    COR_FRONTEIRA
 )
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Pacote comum do repositório
+from comum.estilo import usar_latex
+
 plt.rcParams['font.family'] = 'Latin Modern Math'  # Substitua pelo nome da fonte desejada
-plt.rcParams['text.usetex'] = True  # Ativa suporte ao LaTeX
+plt.rcParams['text.usetex'] = usar_latex()  # Ativa suporte ao LaTeX (VIZ_LATEX=0 desativa)
 
 COR_POISSON  = 'darkviolet'
 COR_BINOMIAL = 'darkturquoise'
+ROTULOS_METRICAS = {'soma': r'\sum_k \Delta_k', 'variacao_total': r'd_{TV}', 'maximo': r'\max_k |\Delta_k|'}
 
-def plot_pmf_distributions(ax_pmf, n: int, p: float):
+def plot_pmf_distributions(ax_pmf, n: int, p: float, dados: dict = None):
     """
     Plota as funções de massa de probabilidade (PMF) para as distribuições Binomial e Poisson.
 
@@ -31,11 +40,11 @@ def plot_pmf_distributions(ax_pmf, n: int, p: float):
     - ax_pmf (Axes): Eixo do gráfico de PMFs
     - n (int): Número de sucessos
     - p (float): Probabilidade de sucesso
+    - dados (dict): Curvas já calculadas por `calcular_distribuicoes` (calculadas aqui se None)
     """
-    x = np.arange(0, n + 1)
-    binom_y = stats.binom.pmf(x, n, p)
-    poisson_lambda = n * p
-    poisson_y = stats.poisson.pmf(x, poisson_lambda)
+    dados = dados if dados is not None else calcular_distribuicoes(n, p)
+    x, binom_y, poisson_y = dados['sucessos'], dados['pmf_binomial'], dados['pmf_poisson']
+    poisson_lambda = dados['lambda']
 
     ax_pmf.clear()
     ax_pmf.bar(x, binom_y, color='None', edgecolor=COR_BINOMIAL,label='Binomial')
@@ -47,7 +56,24 @@ def plot_pmf_distributions(ax_pmf, n: int, p: float):
     ax_pmf.set_yticklabels([])
     ax_pmf.legend(fancybox=False,edgecolor='k',loc='upper left')
 
-def plot_mgf_distributions(ax_mgf, n: int, p: float):
+def obter_eixo_zoom(ax_mgf):
+    """
+    Retorna o eixo do zoom em t=0 do gráfico de MGFs, criando-o na primeira chamada.
+
+    O eixo é reaproveitado entre atualizações: como ax_mgf.clear() não remove os
+    eixos inseridos, criar um novo a cada chamada acumulava eixos na figura.
+
+    Parâmetros:
+    - ax_mgf (Axes): Eixo do gráfico de MGFs
+
+    Retorna:
+    - ax_inset (Axes): Eixo do zoom
+    """
+    if getattr(ax_mgf, 'ax_zoom', None) is None:
+        ax_mgf.ax_zoom = inset_axes(ax_mgf, width="40%", height="40%", loc='upper left',borderpad=1)
+    return ax_mgf.ax_zoom
+
+def plot_mgf_distributions(ax_mgf, n: int, p: float, dados: dict = None):
     """
     Plota as funções geradoras de momentos (MGF) para as distribuições Binomial e Poisson.
 
@@ -55,11 +81,10 @@ def plot_mgf_distributions(ax_mgf, n: int, p: float):
     - ax_mgf (Axes): Eixo do gráfico de MGFs
     - n (int): Número de sucessos
     - p (float): Probabilidade de sucesso
+    - dados (dict): Curvas já calculadas por `calcular_distribuicoes` (calculadas aqui se None)
     """
-    t_vals = np.linspace(MGF_T_RANGE[0], MGF_T_RANGE[1], MGF_T_POINTS)
-    poisson_lambda = n * p
-    mgf_binom_vals = mgf_binomial(t_vals, n, p)
-    mgf_poisson_vals = mgf_poisson(t_vals, poisson_lambda)
+    dados = dados if dados is not None else calcular_distribuicoes(n, p)
+    t_vals, mgf_binom_vals, mgf_poisson_vals = dados['t'], dados['mgf_binomial'], dados['mgf_poisson']
 
     ax_mgf.clear()
     ax_mgf.plot(t_vals, mgf_binom_vals, color=COR_BINOMIAL)
@@ -70,25 +95,53 @@ def plot_mgf_distributions(ax_mgf, n: int, p: float):
     ax_mgf.grid(linestyle='-', alpha=GRID_LINEWIDTH)
     ax_mgf.set_yticklabels([])
 
-    # Criar um eixo auxiliar para o zoom em t=0
-    ax_inset = inset_axes(ax_mgf, width="40%", height="40%", loc='upper left',borderpad=1)
-    zoom_t_vals = np.linspace(-0.05, 0.05, MGF_T_POINTS)
-    zoom_mgf_binom = mgf_binomial(zoom_t_vals, n, p)
-    zoom_mgf_poisson = mgf_poisson(zoom_t_vals, poisson_lambda)
+    # Eixo auxiliar para o zoom em t=0
+    ax_inset = obter_eixo_zoom(ax_mgf)
+    ax_inset.clear()
+    zoom_t_vals, zoom_mgf_binom, zoom_mgf_poisson = dados['t_zoom'], dados['mgf_binomial_zoom'], dados['mgf_poisson_zoom']
     
     ax_inset.plot(zoom_t_vals, zoom_mgf_binom, color=COR_BINOMIAL)
     ax_inset.plot(zoom_t_vals, zoom_mgf_poisson, linestyle='-', color=COR_POISSON)
     ax_inset.axvline(x=0,c='k',alpha=0.5,ls='--')
-    epsilon = 0.05  # Define o valor de ε
+    epsilon = MGF_ZOOM_EPSILON  # Define o valor de ε
     ax_inset.set_xticks([-epsilon, 0, epsilon])
     ax_inset.set_xticklabels([r'$-\varepsilon$', r'$0$', r'$+\varepsilon$'])
     ax_inset.set_yticks([])
-    ax_inset.set_xlim(-0.05, 0.05)
+    ax_inset.set_xlim(-epsilon, epsilon)
     ax_inset.set_ylim(min(zoom_mgf_binom.min(), zoom_mgf_poisson.min()), max(zoom_mgf_binom.max(), zoom_mgf_poisson.max()))
     # ax_inset.set_title("Vizinhança de t=0", fontsize=8)
     
 
-def plot_distribuicoes(ax_pmf, ax_mgf, n: int, p: float):
+def plot_convergencia_momentos(ax_momentos, lambda_poisson: float, n_vals: np.ndarray, k_max: int = 4):
+    """
+    Plota a razão entre os momentos da Binomial(n, lambda/n) e da Poisson(lambda)
+    em função de n, mostrando a convergência dos momentos extraídos das MGFs.
+
+    Parâmetros:
+    - ax_momentos (Axes): Eixo do gráfico de convergência
+    - lambda_poisson (float): Parâmetro lambda, mantido fixo enquanto n cresce
+    - n_vals (np.ndarray): Valores de n (todos maiores ou iguais a lambda)
+    - k_max (int): Ordem máxima dos momentos
+    """
+    n_vals = np.asarray(n_vals, dtype=float)
+    resultado = momentos_cumulantes_mgf(n_vals, lambda_poisson / n_vals, k_max)
+    momentos_binom, cumulantes_binom = resultado['binomial']
+    momentos_poisson, cumulantes_poisson = resultado['poisson']
+    cores = plt.cm.cool(np.linspace(0, 1, k_max))
+
+    ax_momentos.clear()
+    for k, cor in zip(range(1, k_max + 1), cores):
+        ax_momentos.plot(n_vals, momentos_binom[k] / momentos_poisson[k], color=cor, label=f'$m_{k}$')
+        ax_momentos.plot(n_vals, cumulantes_binom[k] / cumulantes_poisson[k], color=cor, linestyle='--')
+    ax_momentos.axhline(y=1, c='k', alpha=0.5, ls='--')
+    ax_momentos.set_xscale('log')
+    ax_momentos.set_xlabel('n')
+    ax_momentos.set_ylabel('Binomial / Poisson')
+    ax_momentos.set_title(f'Momentos (contínuo) e cumulantes (tracejado), $\\lambda$={lambda_poisson:.2f}')
+    ax_momentos.grid(linestyle='-', alpha=GRID_LINEWIDTH)
+    ax_momentos.legend(fancybox=False, edgecolor='k', loc='lower right')
+
+def plot_distribuicoes(ax_pmf, ax_mgf, n: int, p: float, dados: dict = None):
     """
     Plota as distribuições PMF e MGF para as distribuições Binomial e Poisson.
 
@@ -97,9 +150,11 @@ def plot_distribuicoes(ax_pmf, ax_mgf, n: int, p: float):
     - ax_mgf (Axes): Eixo do gráfico de MGFs
     - n (int): Número de sucessos
     - p (float): Probabilidade de sucesso
+    - dados (dict): Curvas já calculadas por `calcular_distribuicoes` (calculadas aqui se None)
     """
-    plot_pmf_distributions(ax_pmf, n, p)
-    plot_mgf_distributions(ax_mgf, n, p)
+    dados = dados if dados is not None else calcular_distribuicoes(n, p)
+    plot_pmf_distributions(ax_pmf, n, p, dados)
+    plot_mgf_distributions(ax_mgf, n, p, dados)
     plt.draw()
 
 def plot_diferenca_pmf_surface(ax_3d, n_grid: np.ndarray, p_grid: np.ndarray, diferenca_pmf_grid: np.ndarray):
@@ -119,6 +174,47 @@ def plot_diferenca_pmf_surface(ax_3d, n_grid: np.ndarray, p_grid: np.ndarray, di
     ax_3d.set_ylabel('p')
     ax_3d.set_title("Erro entre as PMFs")
 
+def rotulo_fronteira(fronteira) -> str:
+    """Legenda da fronteira, com a métrica e a tolerância (ex.: d_TV <= 0.01, em LaTeX)."""
+    return f'${ROTULOS_METRICAS[fronteira.metrica]} \\leq {fronteira.tolerancia:g}$'
+
+def plot_fronteira_tolerancia_3d(ax_3d, fronteira):
+    """
+    Sobrepõe a fronteira da região admissível à superfície do gráfico 3D: a curva
+    p*(n) sobre a superfície e a sua projeção no plano da base.
+
+    Desenhe depois de `plot_diferenca_pmf_surface`, que limpa o eixo.
+
+    Parâmetros:
+    - ax_3d (Axes3D): Eixo do gráfico 3D
+    - fronteira (Fronteira): Resultado de `RegiaoTolerancia.fronteira`
+    """
+    altura = erro_aproximacao(fronteira.n, fronteira.p, 'soma')  # A superfície exibe a métrica 'soma'
+    z_base = ax_3d.get_zlim()[0]
+    ax_3d.plot(fronteira.n, fronteira.p, altura, color=COR_FRONTEIRA, lw=2, label=rotulo_fronteira(fronteira))
+    ax_3d.plot(fronteira.n, fronteira.p, np.full_like(altura, z_base), color=COR_FRONTEIRA, lw=1, ls='--')
+    ax_3d.set_zlim(bottom=z_base)
+    ax_3d.legend(loc='upper left', fontsize=8)
+
+def plot_fronteira_tolerancia_2d(ax, fronteira, preencher: bool = True):
+    """
+    Desenha a fronteira da região admissível no plano (n, p), com a região abaixo dela preenchida.
+
+    Parâmetros:
+    - ax (Axes): Eixo 2D
+    - fronteira (Fronteira): Resultado de `RegiaoTolerancia.fronteira`
+    - preencher (bool): Preenche a região admissível 0 < p <= p*(n)
+    """
+    linha, = ax.plot(fronteira.n, fronteira.p, lw=2, label=rotulo_fronteira(fronteira))
+    if preencher:
+        ax.fill_between(fronteira.n, 0, fronteira.p, color=linha.get_color(), alpha=0.15)
+    ax.set_xlabel('n')
+    ax.set_ylabel('p')
+    ax.set_ylim(0, 1)
+    ax.set_title('Região admissível da aproximação de Poisson')
+    ax.grid(alpha=0.3)
+    ax.legend()
+
 def configurar_estetica_3d(ax):
     """
     Configura a estética do gráfico 3D, removendo cores dos planos e ajustando a grade.
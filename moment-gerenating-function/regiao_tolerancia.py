@@ -0,0 +1,306 @@
+"""
+regiao_tolerancia.py
+--------------------
+Consulta da região de parâmetros (n, p) em que a aproximação de Poisson é boa o suficiente.
+
+Dada uma tolerância e uma métrica de erro entre as PMFs Binomial(n, p) e
+Poisson(np), a região admissível é, para cada n, o intervalo 0 < p <= p*(n) em
+que o erro não passa da tolerância. A fronteira p*(n) é obtida em duas etapas:
+- Extração vetorizada do contorno numa tabela fina do erro, pré-calculada uma
+  única vez para os n da superfície: para cada n, a primeira célula de p em que
+  o máximo acumulado do erro passa da tolerância
+- Refinamento por bisseção em p, para todos os n de uma vez, dentro dessa célula
+
+As fronteiras já consultadas ficam em cache por (métrica, tolerância). Lotes de
+tolerâncias (`fronteiras`) podem dispensar a bisseção e ser interpolados na
+mesma tabela, o que torna milhares de consultas uma busca vetorizada de poucos
+milissegundos.
+
+Métricas (ver `erro_aproximacao`):
+- 'soma': soma de P_Bin(k) - P_Poi(k) em k = 0..n, a altura da superfície do painel 3D
+- 'variacao_total': distância de variação total, 1/2 sum_k |P_Bin(k) - P_Poi(k)|
+- 'maximo': maior diferença pontual, max_k |P_Bin(k) - P_Poi(k)|
+
+Observação: a fronteira é o primeiro cruzamento da tolerância a partir de p = 0;
+nas métricas em que o erro não cresce sempre com p ('maximo', perto de p = 1),
+valores de p acima de p*(n) que voltem a ficar abaixo da tolerância não entram
+na região. Excursões acima da tolerância mais estreitas que o passo da tabela
+(p_max / (pontos_tabela - 1)) não são detectadas.
+
+Execute este arquivo para consultar fronteiras pela linha de comando (com
+--verificar, cada fronteira é comparada ao primeiro cruzamento numa grade densa):
+
+    python regiao_tolerancia.py 0.01 0.05 --metrica variacao_total --verificar
+"""
+
+import argparse
+import time
+from typing import NamedTuple
+
+import numpy as np
+import scipy.stats as stats
+from funcoes import eixos_parametros
+from config import NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX, TOLERANCIA_XTOL_P, TOLERANCIA_PONTOS_TABELA
+
+METRICAS = ('soma', 'variacao_total', 'maximo')
+
+
+def erro_aproximacao(n, p, metrica: str = 'soma') -> np.ndarray:
+    """
+    Calcula o erro da aproximação de Poisson para cada par (n, p), de forma vetorizada.
+
+    Parâmetros:
+    - n (int ou np.ndarray): Número de sucessos
+    - p (float ou np.ndarray): Probabilidade de sucesso, combinada com n por broadcasting
+    - metrica (str): 'soma', 'variacao_total' ou 'maximo'
+
+    Retorna:
+    - np.ndarray: Erro em cada par (n, p)
+    """
+    if metrica not in METRICAS:
+        raise ValueError(f"Métrica desconhecida: {metrica!r} (use {list(METRICAS)})")
+    n, p = np.broadcast_arrays(np.asarray(n, dtype=float), np.asarray(p, dtype=float))
+    lambda_poisson = n * p
+    # Como a Binomial soma 1 em k = 0..n, a soma das diferenças é a cauda P_Poi(K > n)
+    cauda_poisson = stats.poisson.sf(n, lambda_poisson)
+    if metrica == 'soma':
+        return cauda_poisson
+
+    # k = 0..n+1: além de n a Binomial é nula e a PMF de Poisson decresce, pois lambda <= n
+    k = np.arange(int(n.max()) + 2)
+    n_k, p_k, lambda_k = n[..., None], p[..., None], lambda_poisson[..., None]
+    diferenca = np.abs(stats.binom.pmf(k, n_k, p_k) - stats.poisson.pmf(k, lambda_k))
+    if metrica == 'variacao_total':
+        return 0.5 * (np.sum(np.where(k <= n_k, diferenca, 0.0), axis=-1) + cauda_poisson)
+    return np.max(np.where(k <= n_k + 1, diferenca, 0.0), axis=-1)
+
+
+class Fronteira(NamedTuple):
+    """Fronteira da região admissível: para cada n, o maior p com erro dentro da tolerância."""
+    n: np.ndarray
+    p: np.ndarray
+    tolerancia: float
+    metrica: str
+
+
+class RegiaoTolerancia:
+    """
+    Consultas de fronteira sobre a superfície de erro de uma métrica.
+
+    O erro é pré-calculado uma única vez numa tabela fina em p (de 0 ao maior p
+    da superfície, com `pontos_tabela` valores) para cada n da superfície. A
+    consulta isolada (`fronteira`) e a consulta em lote (`fronteiras`) partem da
+    mesma extração vetorizada do primeiro cruzamento nessa tabela, de modo que as
+    duas concordam.
+
+    Parâmetros:
+    - metrica (str): 'soma', 'variacao_total' ou 'maximo'
+    - N (np.ndarray): Matriz de n da superfície (padrão: a grade de `eixos_parametros`)
+    - P (np.ndarray): Matriz de p da superfície, no formato de `np.meshgrid(n, p)`
+    - xtol (float): Largura final do intervalo da bisseção em p
+    - pontos_tabela (int): Valores de p da tabela do erro
+    """
+
+    def __init__(self, metrica: str = 'soma', N: np.ndarray = None, P: np.ndarray = None,
+                 xtol: float = TOLERANCIA_XTOL_P, pontos_tabela: int = TOLERANCIA_PONTOS_TABELA):
+        if metrica not in METRICAS:
+            raise ValueError(f"Métrica desconhecida: {metrica!r} (use {list(METRICAS)})")
+        if N is None or P is None:
+            N, P = np.meshgrid(*eixos_parametros(NUM_SUCESSOS_MIN, NUM_SUCESSOS_MAX))
+        self.metrica = metrica
+        self.xtol = xtol
+        self.pontos_tabela = pontos_tabela
+        self.n_vals = np.asarray(N, dtype=float)[0]
+        self.p_max = float(np.max(P))
+        self._cache = {}
+        self._tabela = None
+
+    def _bissecao(self, n: np.ndarray, p_baixo: np.ndarray, p_alto: np.ndarray, tolerancia) -> np.ndarray:
+        """Bisseção simultânea em p: erro(p_baixo) <= tolerância < erro(p_alto) em todo elemento."""
+        while np.max(p_alto - p_baixo, initial=0.0) > self.xtol:
+            meio = (p_baixo + p_alto) / 2
+            acima = erro_aproximacao(n, meio, self.metrica) > tolerancia
+            p_alto = np.where(acima, meio, p_alto)
+            p_baixo = np.where(acima, p_baixo, meio)
+        return p_baixo
+
+    def _construir_tabela(self):
+        """Tabela fina do máximo acumulado do erro em p, com as linhas deslocadas para uma única busca ordenada."""
+        # p = 0 (erro nulo) abre a tabela, para que a fronteira também possa ficar abaixo do menor p da superfície
+        p_tabela = np.linspace(0.0, self.p_max, self.pontos_tabela)
+        maximo = np.empty((self.n_vals.size, p_tabela.size))
+        for i, n in enumerate(self.n_vals):
+            # Máximo acumulado em p: a primeira célula acima da tolerância é o primeiro cruzamento
+            maximo[i] = np.maximum.accumulate(erro_aproximacao(n, p_tabela, self.metrica))
+        # Os erros ficam em [0, 1]: somar 2*i à linha i mantém a tabela achatada em ordem crescente
+        self._tabela = (p_tabela, maximo, (maximo + 2.0 * np.arange(self.n_vals.size)[:, None]).ravel())
+
+    def _fronteiras_tabela(self, tolerancias: np.ndarray, refinar: bool) -> np.ndarray:
+        """Extração do primeiro cruzamento na tabela, com interpolação linear ou bisseção na célula."""
+        if np.any(tolerancias < 0):
+            raise ValueError("As tolerâncias devem ser não negativas")
+        if self._tabela is None:
+            self._construir_tabela()
+        p_tabela, maximo, chaves = self._tabela
+        num_n, largura = maximo.shape
+        linhas = np.arange(num_n)
+
+        tol = np.minimum(tolerancias, 1.0)[:, None]  # Erros nunca passam de 1: tolerâncias maiores admitem tudo
+        indice = np.searchsorted(chaves, tol + 2.0 * linhas, side='right') - linhas * largura
+        dentro = indice >= largura                   # n cuja faixa inteira de p é admissível
+        alto = np.minimum(indice, largura - 1)       # Primeira célula acima da tolerância (>= 1, pois p=0 tem erro 0)
+        baixo = alto - 1
+        erro_baixo, erro_alto = maximo[linhas, baixo], maximo[linhas, alto]
+        fracao = np.where(erro_alto > erro_baixo, (tol - erro_baixo) / (erro_alto - erro_baixo), 0.0)
+        p_estrela = np.where(dentro, p_tabela[-1], p_tabela[baixo] + fracao * (p_tabela[alto] - p_tabela[baixo]))
+
+        if refinar and not dentro.all():
+            # Na célula, erro(p_baixo) <= máximo acumulado <= tolerância < erro(p_alto) = máximo acumulado
+            cruzam = ~dentro
+            tol_cruzam = np.broadcast_to(tol, p_estrela.shape)[cruzam]
+            n_cruzam = np.broadcast_to(self.n_vals, p_estrela.shape)[cruzam]
+            p_estrela[cruzam] = self._bissecao(n_cruzam, p_tabela[baixo[cruzam]], p_tabela[alto[cruzam]], tol_cruzam)
+        return p_estrela
+
+    def fronteira(self, tolerancia: float) -> Fronteira:
+        """
+        Fronteira da região admissível para uma tolerância (com cache).
+
+        Parâmetros:
+        - tolerancia (float): Erro máximo aceito (>= 0)
+
+        Retorna:
+        - Fronteira: p*(n) para cada n da superfície, com precisão `xtol`
+        """
+        tolerancia = float(tolerancia)
+        if tolerancia not in self._cache:
+            p_estrela = self._fronteiras_tabela(np.array([tolerancia]), refinar=True)[0]
+            self._cache[tolerancia] = Fronteira(self.n_vals, p_estrela, tolerancia, self.metrica)
+        return self._cache[tolerancia]
+
+    def fronteiras(self, tolerancias, refinar: bool = False) -> np.ndarray:
+        """
+        Fronteiras de um lote de tolerâncias, numa única busca vetorizada.
+
+        Sem refinamento, p*(n) é interpolado linearmente na tabela de
+        `pontos_tabela` valores de p; com `refinar`, a célula da tabela é
+        refinada por bisseção, como em `fronteira`.
+
+        Parâmetros:
+        - tolerancias (sequência de float): Erros máximos aceitos (>= 0)
+        - refinar (bool): Refina cada fronteira por bisseção até `xtol`
+
+        Retorna:
+        - np.ndarray: p*(n), com formato (len(tolerancias), número de valores de n)
+        """
+        return self._fronteiras_tabela(np.asarray(tolerancias, dtype=float), refinar)
+
+    def admissivel(self, n, p, tolerancia: float) -> np.ndarray:
+        """
+        Indica se os pares (n, p) estão na região admissível.
+
+        Parâmetros:
+        - n (int ou np.ndarray): Número de sucessos (valores de n da superfície)
+        - p (float ou np.ndarray): Probabilidade de sucesso
+        - tolerancia (float): Erro máximo aceito
+
+        Retorna:
+        - np.ndarray: True para os pares com p <= p*(n)
+        """
+        fronteira = self.fronteira(tolerancia)
+        n = np.asarray(n, dtype=float)
+        indice = np.clip(np.searchsorted(fronteira.n, n), 0, fronteira.n.size - 1)
+        fora = fronteira.n[indice] != n
+        if np.any(fora):
+            raise ValueError(f"Valores de n fora da superfície: {np.unique(n[fora]).tolist()} "
+                             f"(use n inteiro entre {fronteira.n[0]:.0f} e {fronteira.n[-1]:.0f})")
+        return np.asarray(p) <= fronteira.p[indice]
+
+
+def primeiro_cruzamento_denso(n: float, tolerancia: float, metrica: str = 'soma', p_max: float = 1.0,
+                              num_pontos: int = 20_001) -> float:
+    """
+    Primeiro cruzamento da tolerância por força bruta, numa grade densa de p (referência para verificação).
+
+    Retorna:
+    - float: Maior p da grade antes do primeiro erro acima da tolerância (p_max se não houver cruzamento)
+    """
+    p = np.linspace(0.0, p_max, num_pontos)
+    acima = erro_aproximacao(n, p, metrica) > tolerancia
+    return float(p[np.argmax(acima) - 1]) if acima.any() else p_max
+
+
+def verificar_fronteira(regiao: RegiaoTolerancia, tolerancia: float, num_pontos: int = 20_001) -> float:
+    """
+    Compara a fronteira consultada com o primeiro cruzamento denso de cada n.
+
+    Parâmetros:
+    - regiao (RegiaoTolerancia): Objeto de consulta
+    - tolerancia (float): Erro máximo aceito
+    - num_pontos (int): Valores de p da grade densa
+
+    Retorna:
+    - float: Maior diferença em p; deve ficar abaixo de xtol + p_max / (num_pontos - 1)
+    """
+    fronteira = regiao.fronteira(tolerancia)
+    referencia = np.array([primeiro_cruzamento_denso(n, tolerancia, regiao.metrica, regiao.p_max, num_pontos)
+                           for n in fronteira.n])
+    return float(np.max(np.abs(fronteira.p - referencia)))
+
+
+_regioes = {}
+
+
+def regiao_tolerancia(metrica: str = 'soma') -> RegiaoTolerancia:
+    """
+    Região da métrica sobre a grade padrão da superfície, criada uma única vez por métrica.
+
+    Parâmetros:
+    - metrica (str): 'soma', 'variacao_total' ou 'maximo'
+
+    Retorna:
+    - RegiaoTolerancia: Objeto de consulta compartilhado (com o seu cache)
+    """
+    if metrica not in _regioes:
+        _regioes[metrica] = RegiaoTolerancia(metrica)
+    return _regioes[metrica]
+
+
+def consultar_fronteira(tolerancia: float, metrica: str = 'soma') -> Fronteira:
+    """Fronteira da região admissível na grade padrão (com cache por métrica e tolerância)."""
+    return regiao_tolerancia(metrica).fronteira(tolerancia)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fronteira da região em que a aproximação de Poisson é admissível")
+    parser.add_argument('tolerancias', type=float, nargs='+', help="Erros máximos aceitos")
+    parser.add_argument('--metrica', choices=METRICAS, default='soma', help="Métrica do erro (padrão: soma)")
+    parser.add_argument('--grafico', action='store_true', help="Exibe as fronteiras no plano (n, p)")
+    parser.add_argument('--verificar', action='store_true',
+                        help="Compara cada fronteira com o primeiro cruzamento por força bruta")
+    args = parser.parse_args()
+
+    regiao = regiao_tolerancia(args.metrica)
+    for tolerancia in args.tolerancias:
+        inicio = time.perf_counter()
+        fronteira = regiao.fronteira(tolerancia)
+        duracao = (time.perf_counter() - inicio) * 1000
+        print(f"\nTolerância {tolerancia:g} ({args.metrica}, {duracao:.1f} ms):")
+        for n, p in zip(fronteira.n[::6], fronteira.p[::6]):
+            print(f"  n = {n:3.0f}: p <= {p:.4f}")
+        if args.verificar:
+            print(f"  Maior diferença para a força bruta: {verificar_fronteira(regiao, tolerancia):.2e}")
+
+    lote = np.geomspace(1e-6, 0.5, 5000)
+    regiao.fronteiras(lote[:1])  # Constrói a tabela fora da medida
+    inicio = time.perf_counter()
+    regiao.fronteiras(lote)
+    print(f"\nLote de {lote.size} tolerâncias: {(time.perf_counter() - inicio) * 1000:.1f} ms")
+
+    if args.grafico:
+        import matplotlib.pyplot as plt
+        from plotting import plot_fronteira_tolerancia_2d
+        _, ax = plt.subplots(figsize=(7, 5))
+        for tolerancia in args.tolerancias:
+            plot_fronteira_tolerancia_2d(ax, regiao.fronteira(tolerancia))
+        plt.show()
@@ -46,7 +46,26 @@ def atualizar_ponto_3d(n: int, p: float, point):
     point.set_data([n], [p])
     point.set_3d_properties(np.sum(diff))  # Computa apenas uma vez
 
-def atualizar_graficos(valor, slider_sucessos: Slider, slider_probabilidade: Slider, ax_pmf, ax_mgf, ax_diff, figura, point):
+def aplicar_distribuicoes(dados: dict, ax_pmf, ax_mgf, figura, point):
+    """
+    Atualiza os artistas dos painéis 2D e o ponto 3D com curvas já calculadas.
+    Chamada na thread da interface quando o cálculo em segundo plano termina.
+
+    Parâmetros:
+    - dados (dict): Curvas calculadas por `calcular_distribuicoes`
+    - ax_pmf (Axes): Eixo do gráfico de PMFs
+    - ax_mgf (Axes): Eixo do gráfico de MGFs
+    - figura (Figure): Figura do Matplotlib para atualização
+    - point (Line3D): Ponto móvel no gráfico 3D
+    """
+    n, p = dados['n'], dados['p']
+    plot_distribuicoes(ax_pmf, ax_mgf, n, p, dados)
+    point.set_data([n], [p])
+    point.set_3d_properties(dados['erro'])
+    figura.canvas.draw_idle()
+
+def atualizar_graficos(valor, slider_sucessos: Slider, slider_probabilidade: Slider, ax_pmf, ax_mgf, ax_diff, figura, point,
+                       atlas=None, trabalhador=None):
     """
     Atualiza os gráficos de PMF, MGF e a posição do ponto no gráfico 3D
     com base nos valores dos sliders.
@@ -60,11 +79,29 @@ def atualizar_graficos(valor, slider_sucessos: Slider, slider_probabilidade: Sli
     - ax_diff (Axes3D): Eixo do gráfico 3D de diferença das PMFs
     - figura (Figure): Figura do Matplotlib para atualização
     - point (Line3D): Ponto móvel no gráfico 3D
+    - atlas (AtlasQuadros): Atlas de quadros pré-renderizados (opcional)
+    - trabalhador (TrabalhadorCalculo): Calcula as curvas em segundo plano e as entrega
+      a `aplicar_distribuicoes` (opcional; se None, calcula no próprio callback)
     """
     n = int(slider_sucessos.val)
     p = slider_probabilidade.val
-    
-    # Atualiza os gráficos
+
+    # Quadro do atlas, se o estado já estiver renderizado: só o quadro, o ponto 3D e os
+    # sliders são redesenhados (por blit), sem o desenho completo da figura
+    if atlas is not None and atlas.mostrar(n, p):
+        if trabalhador is not None:
+            trabalhador.cancelar()  # Um resultado atrasado não deve cobrir o quadro do atlas
+        atualizar_ponto_3d(n, p, point)
+        atlas.desenhar()
+        return
+
+    # Caminho ao vivo (com o atlas, os sliders não pedem mais o desenho completo: ver AtlasQuadros)
+    if trabalhador is not None:
+        # As curvas e o ponto 3D são atualizados por aplicar_distribuicoes quando o cálculo terminar
+        trabalhador.submeter(n, p)
+        if atlas is not None:
+            figura.canvas.draw_idle()  # Mostra já a nova posição dos sliders
+        return
     plot_distribuicoes(ax_pmf, ax_mgf, n, p)
     
     # Atualiza o ponto 3D
@@ -0,0 +1,108 @@
+"""
+superficie_paralela.py
+----------------------
+Backend paralelo de `gerar_matriz_parametros`.
+
+A malha (p x n) é dividida em blocos, calculados num pool de processos. Cada
+processo escreve o seu bloco diretamente numa matriz Z em memória compartilhada
+(`multiprocessing.shared_memory`), de modo que os resultados não são
+serializados de volta ao processo principal; este recebe apenas a posição de
+cada bloco concluído, o que permite ir preenchendo o gráfico 3D.
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+
+import numpy as np
+from funcoes import eixos_parametros, calcular_diferenca_pmfs_matriz
+from config import SUPERFICIE_NUM_PROCESSOS, SUPERFICIE_TAMANHO_BLOCO
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Pacote comum do repositório
+from comum.precisao import tipo_float, na_precisao
+
+_estado_trabalhador = {}
+
+
+def dividir_em_blocos(formato: tuple, tamanho_bloco: tuple):
+    """
+    Divide uma matriz em blocos retangulares.
+
+    Parâmetros:
+    - formato (tuple): Formato (linhas, colunas) da matriz
+    - tamanho_bloco (tuple): Tamanho máximo (linhas, colunas) de cada bloco
+
+    Retorna:
+    - list: Pares de slices (linhas, colunas) de cada bloco
+    """
+    linhas, colunas = formato
+    passo_l, passo_c = tamanho_bloco
+    return [(slice(i, min(i + passo_l, linhas)), slice(j, min(j + passo_c, colunas)))
+            for i in range(0, linhas, passo_l) for j in range(0, colunas, passo_c)]
+
+
+def _inicializar_trabalhador(nome_memoria: str, tipo: str, n_values: np.ndarray, p_values: np.ndarray):
+    """Anexa a matriz Z compartilhada e guarda os eixos da malha, uma vez por processo."""
+    # Os processos do pool compartilham o resource_tracker do processo principal, que é
+    # quem remove a memória (unlink) ao final de gerar_matriz_parametros_paralelo
+    memoria = shared_memory.SharedMemory(name=nome_memoria)
+    _estado_trabalhador['memoria'] = memoria
+    _estado_trabalhador['Z'] = np.ndarray((p_values.size, n_values.size), dtype=tipo, buffer=memoria.buf)
+    _estado_trabalhador['eixos'] = (n_values, p_values)
+
+
+def _calcular_bloco(linhas: slice, colunas: slice):
+    """Calcula um bloco da superfície e o escreve na matriz compartilhada."""
+    n_values, p_values = _estado_trabalhador['eixos']
+    N_bloco, P_bloco = np.meshgrid(n_values[colunas], p_values[linhas])
+    _estado_trabalhador['Z'][linhas, colunas] = calcular_diferenca_pmfs_matriz(N_bloco, P_bloco)
+    return linhas, colunas
+
+
+def gerar_matriz_parametros_paralelo(n_min: int, n_max: int, num_processos: int = SUPERFICIE_NUM_PROCESSOS,
+                                     tamanho_bloco: tuple = SUPERFICIE_TAMANHO_BLOCO, progresso=None):
+    """
+    Cria a malha de parâmetros (n, p) e calcula a superfície de diferenças em paralelo.
+
+    Parâmetros:
+    - n_min (int): Número mínimo de sucessos
+    - n_max (int): Número máximo de sucessos
+    - num_processos (int): Processos do pool (None usa todos os núcleos)
+    - tamanho_bloco (tuple): Tamanho (linhas de p, colunas de n) de cada bloco
+    - progresso (callable): Chamado como progresso(N, P, Z, concluidos, total) após cada
+      bloco. Z é a matriz parcial, com NaN nos blocos ainda não calculados, e só é
+      válida durante a chamada
+
+    Retorna:
+    - N (np.ndarray): Matriz de sucessos
+    - P (np.ndarray): Matriz de probabilidades
+    - Z (np.ndarray): Diferença entre as PMFs Binomial e Poisson
+
+    P e Z usam a precisão configurada em comum.precisao (VIZ_PRECISAO), e N continua
+    inteira; cada bloco é calculado em float64 e convertido ao ser escrito na matriz
+    compartilhada.
+    """
+    n_values, p_values = eixos_parametros(n_min, n_max)
+    N, P = np.meshgrid(n_values, p_values)
+    blocos = dividir_em_blocos(N.shape, tamanho_bloco)
+    tipo = tipo_float()
+
+    memoria = shared_memory.SharedMemory(create=True, size=N.size * tipo.itemsize)
+    try:
+        Z_compartilhada = np.ndarray(N.shape, dtype=tipo, buffer=memoria.buf)
+        Z_compartilhada.fill(np.nan)
+        with ProcessPoolExecutor(max_workers=num_processos, initializer=_inicializar_trabalhador,
+                                 initargs=(memoria.name, tipo.str, n_values, p_values)) as executor:
+            futuros = [executor.submit(_calcular_bloco, linhas, colunas) for linhas, colunas in blocos]
+            for concluidos, futuro in enumerate(as_completed(futuros), start=1):
+                futuro.result()
+                if progresso is not None:
+                    progresso(N, P, Z_compartilhada, concluidos, len(blocos))
+        Z = Z_compartilhada.copy()
+        del Z_compartilhada  # Libera a referência ao buffer antes de fechar a memória
+    finally:
+        memoria.close()
+        memoria.unlink()
+    P = na_precisao(P)
+    return N, P, Z
@@ -0,0 +1,56 @@
+"""
+convergencia_qmc.py
+-------------------
+Convergência da transformação pela inversa da CDF com valores uniformes
+pseudoaleatórios e de baixa discrepância (Sobol e Halton embaralhados).
+
+À esquerda, os histogramas de X = F^{-1}(U) com o mesmo número de amostras da
+animação; à direita, a distância KS em função do número de amostras sorteadas,
+com o N que cada método precisa para atingir a distância alvo.
+
+    python convergencia_qmc.py
+"""
+
+import os
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.stats import norm
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Pacote comum do repositório
+from comum.quase_aleatorio import METODOS, FonteUniforme, comparar_convergencia, plot_convergencia_ks
+
+NUM_AMOSTRAS_HISTOGRAMA = 200  # Igual ao número de quadros da animação
+TAMANHOS = 2 ** np.arange(3, 15)
+KS_ALVO = 0.01
+SEMENTE = 42
+
+
+def transformar(u):
+    return norm.ppf(u[:, 0])
+
+
+def main():
+    fig, (ax_hist, ax_ks) = plt.subplots(1, 2, figsize=(12, 5))
+
+    x = np.linspace(-4, 4, 400)
+    bordas = np.linspace(-4, 4, 31)
+    for metodo in ('pseudo', 'sobol'):
+        amostras = transformar(FonteUniforme(metodo, semente=SEMENTE).amostrar(NUM_AMOSTRAS_HISTOGRAMA))
+        ax_hist.hist(amostras, bins=bordas, density=True, histtype='step', lw=1.5, label=metodo)
+    ax_hist.plot(x, norm.pdf(x), c='k', ls='--', alpha=0.5, label=r'$\mathcal{N}(0,1)$')
+    ax_hist.set_title(f'Histogramas com N = {NUM_AMOSTRAS_HISTOGRAMA}', loc='left')
+    ax_hist.set_xlabel('X')
+    ax_hist.legend()
+
+    curvas = comparar_convergencia(transformar, norm.cdf, TAMANHOS, METODOS, semente=SEMENTE)
+    plot_convergencia_ks(ax_ks, TAMANHOS, curvas, alvo=KS_ALVO)
+    ax_ks.set_title(f'Amostras para KS $\\leq$ {KS_ALVO}', loc='left')
+
+    fig.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,19 @@
 # Reimportando as bibliotecas necessárias, pois o estado foi resetado
+import os
+import sys
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.stats import norm
 from matplotlib.animation import FuncAnimation
 from matplotlib.gridspec import GridSpec
 
-plt.rcParams['text.usetex'] = True
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Pacote comum do repositório
+from comum.estilo import usar_latex
+from comum.perfil import instrumentar
+from comum.precisao import tipo_float
+from comum.quase_aleatorio import FonteUniforme
+
+plt.rcParams['text.usetex'] = usar_latex()  # VIZ_LATEX=0 desativa
 plt.rcParams['font.family']='latinmodern-math'
 plt.rcParams['text.latex.preamble'] = r'\usepackage{amsmath}'
 
@@ -15,6 +23,10 @@ def transform_to_normal(uniform_value):
 
 # Parâmetros da animação
 num_frames = 200
+# Fonte dos valores uniformes: 'pseudo' (np.random), ou 'sobol'/'halton' (baixa discrepância,
+# com histogramas que se aproximam da distribuição alvo em bem menos quadros)
+metodo_uniforme = 'pseudo'
+fonte_uniforme = FonteUniforme(metodo_uniforme)
 x_uniform = np.linspace(0, 1, 1000)
 x_normal = np.linspace(-4, 4, 1000)
 
@@ -65,8 +77,16 @@ scat_pdf_y = ax_pdf_y.scatter([], [], color='teal', alpha=0.4)
 stem_x = ax_pdf_x.stem([0], [0], linefmt='tab:red', markerfmt='o', basefmt=' ')
 stem_y = ax_pdf_y.stem([0], [0], linefmt='teal', markerfmt='o', basefmt=' ', orientation='horizontal')
 
+# Pontos sorteados: colunas X, Y=F_X(X) e f_X(X), na precisão configurada (VIZ_PRECISAO).
+# O buffer dobra de tamanho quando enche, em vez de ser recriado a cada quadro
+pontos = np.empty((num_frames, 3), dtype=tipo_float())
+num_pontos = 0   # Pontos no gráfico de relação (acumulam entre repetições da animação)
+inicio_pdfs = 0  # Primeiro ponto exibido nos gráficos das PDFs (reiniciado em init)
+
 # Função de inicialização
 def init():
+    global inicio_pdfs
+    inicio_pdfs = num_pontos
     scat_pdf_x.set_offsets(np.empty((0, 2)))
     scat_pdf_y.set_offsets(np.empty((0, 2)))
     stem_x.markerline.set_data([], [])
@@ -79,33 +99,25 @@ def init():
 
 # Função de atualização para a animação
 def update(frame):
-    uniform_value = np.random.rand()
+    global pontos, num_pontos
+    uniform_value = fonte_uniforme.proximo()
     normal_value = transform_to_normal(uniform_value)
+
+    if num_pontos == len(pontos):
+        pontos = np.concatenate((pontos, np.empty_like(pontos)))
+    pontos[num_pontos] = (normal_value, uniform_value, norm.pdf(normal_value))
+    num_pontos += 1
     
     # Atualiza scatter no gráfico relação
-    x_data_rel = scat_relation.get_offsets()[:, 0] if len(scat_relation.get_offsets()) > 0 else []
-    y_data_rel = scat_relation.get_offsets()[:, 1] if len(scat_relation.get_offsets()) > 0 else []
-    x_data_rel = np.append(x_data_rel, normal_value)
-    y_data_rel = np.append(y_data_rel, uniform_value)
-    scat_relation.set_offsets(np.column_stack((x_data_rel, y_data_rel)))
+    scat_relation.set_offsets(pontos[:num_pontos, :2])
     
 
     # Atualiza scatter no gráfico PDF Normal
-    x_data_pdf = scat_pdf_x.get_offsets()[:, 0] if len(scat_pdf_x.get_offsets()) > 0 else []
-    y_data_pdf = scat_pdf_x.get_offsets()[:, 1] if len(scat_pdf_x.get_offsets()) > 0 else []
-    
-    x_data_pdf = np.append(x_data_pdf, normal_value)
-    y_data_pdf = np.append(y_data_pdf, norm.pdf(normal_value))
-    scat_pdf_x.set_offsets(np.column_stack((x_data_pdf, y_data_pdf)))
+    recentes = pontos[inicio_pdfs:num_pontos]
+    scat_pdf_x.set_offsets(recentes[:, [0, 2]])
     
    # Atualiza scatter no gráfico PDF Uniforme
-    x_data_pdf_y = scat_pdf_y.get_offsets()[:,0] if len(scat_pdf_y.get_offsets()) > 0 else []
-    y_data_pdf_y = scat_pdf_y.get_offsets()[:,1] if len(scat_pdf_y.get_offsets()) > 0 else []
-
-    x_data_pdf_y = np.append(x_data_pdf_y, 1)  # Sempre no eixo x=1
-    y_data_pdf_y = np.append(y_data_pdf_y, uniform_value)
-
-    scat_pdf_y.set_offsets(np.column_stack((x_data_pdf_y, y_data_pdf_y)))
+    scat_pdf_y.set_offsets(np.column_stack((np.ones(len(recentes)), recentes[:, 1])))  # Sempre no eixo x=1
 
 
     # Atualiza stem X (normal)
@@ -118,10 +130,11 @@ def update(frame):
     return (scat_relation, scat_pdf_x, scat_pdf_y, stem_x.markerline, stem_x.stemlines,
         stem_y.markerline, stem_y.stemlines)
 
-# Criar a animação mais suave
-ani = FuncAnimation(fig, update, frames=num_frames, init_func=init, blit=True, interval=100)
+# Criar a animação mais suave (com VIZ_PERFIL=1, cada quadro é medido)
+ani = FuncAnimation(fig, instrumentar(fig, update), frames=num_frames, init_func=init, blit=True, interval=100)
 
-# Salvar a animação como GIF
-ani.save('animacao_distribuicao_gridspec_final.gif', writer='pillow', fps=10)
+if __name__ == "__main__":
+    # Salvar a animação como GIF
+    ani.save('animacao_distribuicao_gridspec_final.gif', writer='pillow', fps=10)
 
-plt.show()
+    plt.show()
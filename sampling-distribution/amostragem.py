@@ -0,0 +1,228 @@
+"""
+amostragem.py
+-------------
+Motor da distribuição amostral usado no notebook seeing-the-mean.
+
+Em vez de sortear as amostras uma a uma com `np.random.choice`, as B
+reamostras de tamanho n são geradas como matrizes B x n, em lotes de linhas
+para limitar a memória, e as estatísticas são calculadas ao longo do eixo das
+observações. O módulo inclui:
+- Geração das matrizes de reamostragem (bootstrap) em lotes, com índices
+  pseudoaleatórios ou de baixa discrepância (Sobol/Halton, ver comum.quase_aleatorio)
+- Médias, variâncias e quantis de cada reamostra, opcionalmente num pool de processos
+- Animação da distribuição amostral da média conforme B cresce
+"""
+
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.animation import FuncAnimation
+from scipy.stats import norm
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))  # Pacote comum do repositório
+from comum.quase_aleatorio import FonteUniforme
+
+MAX_ELEMENTOS_LOTE = 4_000_000  # Elementos por matriz de reamostragem (~32 MB em float64)
+
+
+def linhas_por_lote(n: int, max_elementos: int = MAX_ELEMENTOS_LOTE) -> int:
+    """
+    Calcula quantas reamostras de tamanho n cabem num lote.
+
+    Parâmetros:
+    - n (int): Tamanho de cada reamostra
+    - max_elementos (int): Número máximo de elementos da matriz do lote
+
+    Retorna:
+    - int: Número de linhas (reamostras) por lote, no mínimo 1
+    """
+    return max(1, max_elementos // n)
+
+
+def gerar_reamostras(populacao: np.ndarray, n: int, B: int,
+                     max_elementos: int = MAX_ELEMENTOS_LOTE, semente=None,
+                     metodo: str = 'pseudo', deslocamento: int = 0):
+    """
+    Gera B reamostras com reposição de tamanho n, em matrizes por lote.
+
+    Nos métodos 'sobol' e 'halton', cada reamostra é um ponto n-dimensional da
+    sequência de baixa discrepância, convertido em índices por floor(u * N): as B
+    reamostras cobrem o espaço das reamostras possíveis de forma mais uniforme, e
+    a distribuição amostral converge com menos reamostras.
+
+    Parâmetros:
+    - populacao (np.ndarray): Valores dos quais as reamostras são sorteadas
+    - n (int): Tamanho de cada reamostra
+    - B (int): Número total de reamostras
+    - max_elementos (int): Número máximo de elementos de cada matriz gerada
+    - semente: Semente (ou SeedSequence) do gerador aleatório ou do embaralhamento
+    - metodo (str): 'pseudo', 'sobol' ou 'halton'
+    - deslocamento (int): Reamostras iniciais da sequência de baixa discrepância a pular
+
+    Retorna:
+    - gerador de np.ndarray: Matrizes (linhas x n), cujas linhas somam B
+    """
+    populacao = np.asarray(populacao)
+    linhas = linhas_por_lote(n, max_elementos)
+    if metodo == 'pseudo':
+        gerador = np.random.default_rng(semente)
+    else:
+        fonte = FonteUniforme(metodo, dimensao=n, semente=semente, deslocamento=deslocamento)
+    for inicio in range(0, B, linhas):
+        tamanho = min(linhas, B - inicio)
+        if metodo == 'pseudo':
+            indices = gerador.integers(0, populacao.size, size=(tamanho, n))
+        else:
+            indices = np.minimum((fonte.amostrar(tamanho) * populacao.size).astype(np.intp), populacao.size - 1)
+        yield populacao[indices]
+
+
+def _estatisticas_bloco(populacao, n, B, quantis, max_elementos, semente, metodo='pseudo', deslocamento=0):
+    """Calcula médias, variâncias e quantis de um bloco de B reamostras."""
+    medias = np.empty(B)
+    variancias = np.empty(B)
+    valores_quantis = np.empty((len(quantis), B))
+    inicio = 0
+    for matriz in gerar_reamostras(populacao, n, B, max_elementos, semente, metodo, deslocamento):
+        fim = inicio + matriz.shape[0]
+        medias[inicio:fim] = matriz.mean(axis=1)
+        variancias[inicio:fim] = matriz.var(axis=1, ddof=1) if n > 1 else 0.0
+        if len(quantis):
+            valores_quantis[:, inicio:fim] = np.quantile(matriz, quantis, axis=1)
+        inicio = fim
+    return medias, variancias, valores_quantis
+
+
+def _estatisticas_bloco_args(args):
+    """Desempacota os argumentos de `_estatisticas_bloco` para uso com `Executor.map`."""
+    return _estatisticas_bloco(*args)
+
+
+def estatisticas_reamostras(populacao: np.ndarray, n: int, B: int, quantis=(0.25, 0.5, 0.75),
+                            max_elementos: int = MAX_ELEMENTOS_LOTE, semente=None,
+                            num_processos: int = None, metodo: str = 'pseudo') -> dict:
+    """
+    Calcula as estatísticas de B reamostras de tamanho n da população.
+
+    Com `num_processos`, as B reamostras são divididas em blocos com fluxos
+    aleatórios independentes, um por processo do pool. Nos métodos de baixa
+    discrepância, os blocos são trechos consecutivos de uma única sequência (com o
+    mesmo embaralhamento), e o resultado é igual ao do cálculo num só processo.
+
+    Parâmetros:
+    - populacao (np.ndarray): Valores dos quais as reamostras são sorteadas
+    - n (int): Tamanho de cada reamostra
+    - B (int): Número total de reamostras
+    - quantis (sequência): Níveis dos quantis calculados em cada reamostra
+    - max_elementos (int): Número máximo de elementos de cada matriz gerada
+    - semente: Semente do gerador aleatório
+    - num_processos (int): Número de processos do pool. Se None, tudo é
+      calculado no processo atual
+    - metodo (str): 'pseudo', 'sobol' ou 'halton' (ver `gerar_reamostras`)
+
+    Retorna:
+    - dict: 'medias' (B,), 'variancias' (B,) e 'quantis' (len(quantis), B)
+    """
+    populacao = np.asarray(populacao)
+    quantis = tuple(quantis)
+
+    if num_processos is None:
+        medias, variancias, valores_quantis = _estatisticas_bloco(
+            populacao, n, B, quantis, max_elementos, semente, metodo)
+    else:
+        limites = np.linspace(0, B, num_processos + 1).astype(int)
+        if metodo == 'pseudo':
+            sementes = np.random.SeedSequence(semente).spawn(num_processos)
+        else:
+            sementes = [np.random.SeedSequence(semente)] * num_processos
+        argumentos = [(populacao, n, int(fim - inicio), quantis, max_elementos, semente_bloco, metodo, int(inicio))
+                      for inicio, fim, semente_bloco in zip(limites[:-1], limites[1:], sementes)]
+        with ProcessPoolExecutor(max_workers=num_processos) as executor:
+            blocos = list(executor.map(_estatisticas_bloco_args, argumentos))
+        medias = np.concatenate([bloco[0] for bloco in blocos])
+        variancias = np.concatenate([bloco[1] for bloco in blocos])
+        valores_quantis = np.concatenate([bloco[2] for bloco in blocos], axis=1)
+
+    return {'medias': medias, 'variancias': variancias, 'quantis': valores_quantis}
+
+
+def tamanhos_por_quadro(B: int, num_quadros: int) -> np.ndarray:
+    """
+    Define quantas reamostras estão visíveis em cada quadro da animação.
+
+    Os tamanhos crescem geometricamente de 1 até B, para que tanto o começo
+    ruidoso quanto a convergência apareçam na animação.
+
+    Parâmetros:
+    - B (int): Número total de reamostras
+    - num_quadros (int): Número de quadros da animação
+
+    Retorna:
+    - np.ndarray: Número acumulado de reamostras em cada quadro
+    """
+    tamanhos = np.unique(np.geomspace(1, B, num_quadros).astype(int))
+    tamanhos[-1] = B
+    return tamanhos
+
+
+def animar_distribuicao_media(medias: np.ndarray, media_pop: float = None, desvio_pop: float = None,
+                              n: int = None, num_bins: int = 60, num_quadros: int = 120,
+                              intervalo: int = 50, ax=None):
+    """
+    Anima o histograma das médias amostrais conforme o número de reamostras B cresce.
+
+    As contagens de cada quadro são obtidas de um único histograma cumulativo,
+    calculado de uma vez com `np.searchsorted`, de modo que cada quadro apenas
+    troca as alturas dos degraus já desenhados.
+
+    Parâmetros:
+    - medias (np.ndarray): Médias das B reamostras (ver `estatisticas_reamostras`)
+    - media_pop (float): Média da população, para a curva teórica (opcional)
+    - desvio_pop (float): Desvio da população, para a curva teórica (opcional)
+    - n (int): Tamanho das reamostras, para a curva teórica (opcional)
+    - num_bins (int): Número de classes do histograma
+    - num_quadros (int): Número de quadros da animação
+    - intervalo (int): Intervalo entre quadros, em milissegundos
+    - ax (Axes): Eixo onde desenhar. Se None, uma nova figura é criada
+
+    Retorna:
+    - FuncAnimation: Animação criada (mantenha uma referência até exibi-la)
+    """
+    if ax is None:
+        _, ax = plt.subplots(figsize=(8, 5))
+    fig = ax.figure
+
+    bordas = np.histogram_bin_edges(medias, bins=num_bins)
+    larguras = np.diff(bordas)
+    classes = np.clip(np.searchsorted(bordas, medias, side='right') - 1, 0, num_bins - 1)
+    tamanhos = tamanhos_por_quadro(medias.size, num_quadros)
+
+    # contagens[i, k]: médias novas do quadro i (entre tamanhos[i-1] e tamanhos[i]) na classe k
+    contagens = np.zeros((tamanhos.size, num_bins))
+    inicio = 0
+    for i, fim in enumerate(tamanhos):
+        contagens[i] = np.bincount(classes[inicio:fim], minlength=num_bins)
+        inicio = fim
+    densidades = np.cumsum(contagens, axis=0) / (tamanhos[:, None] * larguras)
+
+    degraus = ax.stairs(densidades[0], bordas, color='tab:blue', fill=True, alpha=0.4)
+    if None not in (media_pop, desvio_pop, n):
+        x_vals = np.linspace(bordas[0], bordas[-1], 500)
+        ax.plot(x_vals, norm.pdf(x_vals, loc=media_pop, scale=desvio_pop / np.sqrt(n)),
+                c='k', alpha=0.5, ls='--', label=r'$\mathcal{N}(\mu,\sigma/\sqrt{n})$')
+        ax.legend(loc='upper right')
+    ax.set_xlim(bordas[0], bordas[-1])
+    # Os primeiros quadros (B pequeno) são muito ruidosos: a escala segue o histograma final
+    ax.set_ylim(0, densidades[-1].max() * 1.5)
+    ax.set_xlabel(r'$\bar{x}$')
+    titulo = ax.set_title('')
+
+    def atualizar(quadro):
+        degraus.set_data(densidades[quadro])
+        titulo.set_text(f'Distribuição amostral da média: B = {tamanhos[quadro]:,}')
+        return degraus, titulo
+
+    return FuncAnimation(fig, atualizar, frames=tamanhos.size, interval=intervalo, repeat=False)